@@ -8,5 +8,6 @@ from .auth import router as auth_router
 from .voice_mock import router as voice_mock_router
 from .availabilities import router as availability_router
 from .actors import router as actor_router
+from .metrics import router as metrics_router
 
-__all__ = ["health_router", "groups_router", "auth_router", "voice_mock_router", "availability_router", "actor_router"]
\ No newline at end of file
+__all__ = ["health_router", "groups_router", "auth_router", "voice_mock_router", "availability_router", "actor_router", "metrics_router"]
\ No newline at end of file
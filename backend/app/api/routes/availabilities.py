@@ -4,7 +4,7 @@ from datetime import date, datetime
 from uuid import UUID
 from typing import Literal
 
-from fastapi import APIRouter, Depends, HTTPException, Response, status, Header
+from fastapi import APIRouter, Depends, HTTPException, Query, Response, status, Header
 from pydantic import BaseModel, Field, ConfigDict
 
 from app.api.deps import get_availability_service
@@ -23,6 +23,40 @@ def _parse_uuid(value: str | None) -> UUID | None:
         return None
 
 
+def _etag_matches(if_none_match: str | None, etag: str) -> bool:
+    """Weak comparison of an ``If-None-Match`` header against ``etag`` (RFC 9110)."""
+
+    if not if_none_match:
+        return False
+    candidates = [candidate.strip() for candidate in if_none_match.split(",")]
+    return "*" in candidates or etag in (c.removeprefix("W/") for c in candidates)
+
+
+async def _not_modified(
+    service: AvailabilityService,
+    response: Response,
+    *,
+    kind: str,
+    group_id: UUID,
+    actor_id: str,
+    if_none_match: str | None,
+    from_date: date | None,
+    to_date: date | None,
+) -> Response | None:
+    """Set the read's ETag; return a 304 response when the client already holds it.
+
+    Membership is checked before answering 304 so validators never confirm data to outsiders.
+    """
+
+    etag = service.read_etag(kind, group_id=group_id, from_date=from_date, to_date=to_date)
+    headers = {"ETag": etag, "Cache-Control": "private, no-cache"}
+    if _etag_matches(if_none_match, etag):
+        await service.ensure_member(group_id=group_id, actor_id=actor_id)
+        return Response(status_code=status.HTTP_304_NOT_MODIFIED, headers=headers)
+    response.headers.update(headers)
+    return None
+
+
 class AvailabilityCreate(BaseModel):
     startDate: date = Field(..., description="Startdatum (inklusive)")
     endDate: date = Field(..., description="Enddatum (inklusive)")
@@ -34,6 +68,17 @@ class AvailabilityCreate(BaseModel):
     model_config = ConfigDict(extra="forbid")
 
 
+class AvailabilityBatchCreate(BaseModel):
+    ranges: list[AvailabilityCreate] = Field(..., min_length=1, max_length=100, description="Zeiträume")
+
+    model_config = ConfigDict(extra="forbid")
+
+
+class AvailabilityReplace(BaseModel):
+    ranges: list[AvailabilityCreate] = Field(..., max_length=100, description="Gewünschte Zeiträume (vollständig)")
+
+    model_config = ConfigDict(extra="forbid")
+
 
 class AvailabilityResponse(BaseModel):
     id: UUID
@@ -66,6 +111,41 @@ class AvailabilitySummaryItem(BaseModel):
     model_config = ConfigDict(populate_by_name=True)
 
 
+class BestWindowItem(BaseModel):
+    from_: date = Field(alias="from", description="Startdatum (inklusive)")
+    to: date = Field(description="Enddatum (inklusive)")
+    minAvailable: int = Field(description="Minimale Anzahl verfügbarer Mitglieder an einem Tag des Fensters")
+    averageAvailable: float = Field(description="Durchschnittliche Anzahl verfügbarer Mitglieder pro Tag")
+    totalMembers: int = Field(description="Gesamtanzahl der Gruppenmitglieder")
+
+    model_config = ConfigDict(populate_by_name=True)
+
+
+class QuorumWindowItem(BestWindowItem):
+    days: int = Field(description="Länge des Zeitraums in Tagen")
+
+
+class AvailableMember(BaseModel):
+    memberId: UUID
+    actorId: str
+    userId: UUID | None
+    displayName: str
+    role: str
+
+
+class DateRange(BaseModel):
+    from_: date = Field(alias="from", description="Startdatum (inklusive)")
+    to: date = Field(description="Enddatum (inklusive)")
+
+    model_config = ConfigDict(populate_by_name=True)
+
+
+class MemberIntersection(BaseModel):
+    actorIds: list[str] = Field(description="Betrachtete Mitglieder (Actor-IDs)")
+    commonDays: int = Field(description="Anzahl der Tage, an denen alle betrachteten Mitglieder verfügbar sind")
+    ranges: list[DateRange]
+
+
 class MemberAvailabilities(BaseModel):
     memberId: UUID
     actorId: str
@@ -100,6 +180,54 @@ async def add_availability(
     return AvailabilityResponse.from_model(record)
 
 
+@router.post("/groups/{group_id}/availabilities/batch", response_model=list[AvailabilityResponse])
+async def add_availabilities_batch(
+    group_id: UUID,
+    payload: AvailabilityBatchCreate,
+    actor_id: str | None = Header(default=None, alias="X-Actor-Id"),
+    identity: Identity = Depends(get_identity),
+    service: AvailabilityService = Depends(get_availability_service),
+):
+    """Store several availability ranges in one request and one transaction."""
+
+    user_uuid = _parse_uuid(identity.user_id)
+    resolved_actor = (actor_id or identity.user_id or "").strip() or None
+    if not resolved_actor:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="actorId header required")
+
+    records = await service.add_availabilities(
+        actor_id=resolved_actor,
+        user_id=user_uuid,
+        group_id=group_id,
+        ranges=[(item.startDate, item.endDate) for item in payload.ranges],
+    )
+    return [AvailabilityResponse.from_model(r) for r in records]
+
+
+@router.put("/groups/{group_id}/availabilities/mine", response_model=list[AvailabilityResponse])
+async def replace_my_availabilities(
+    group_id: UUID,
+    payload: AvailabilityReplace,
+    actor_id: str | None = Header(default=None, alias="X-Actor-Id"),
+    identity: Identity = Depends(get_identity),
+    service: AvailabilityService = Depends(get_availability_service),
+):
+    """Replace the caller's availabilities in a group with the given full set."""
+
+    user_uuid = _parse_uuid(identity.user_id)
+    resolved_actor = (actor_id or identity.user_id or "").strip() or None
+    if not resolved_actor:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="actorId header required")
+
+    records = await service.replace_availabilities(
+        actor_id=resolved_actor,
+        user_id=user_uuid,
+        group_id=group_id,
+        ranges=[(item.startDate, item.endDate) for item in payload.ranges],
+    )
+    return [AvailabilityResponse.from_model(r) for r in records]
+
+
 @router.get("/groups/{group_id}/availabilities", response_model=list[AvailabilityResponse])
 async def list_my_availabilities(
     group_id: UUID,
@@ -121,6 +249,10 @@ async def list_my_availabilities(
 @router.get("/groups/{group_id}/availability-summary", response_model=list[AvailabilitySummaryItem])
 async def get_group_availability_summary(
     group_id: UUID,
+    response: Response,
+    from_: date | None = Query(default=None, alias="from", description="Fensterbeginn (inklusive)"),
+    to: date | None = Query(default=None, description="Fensterende (inklusive)"),
+    if_none_match: str | None = Header(default=None, alias="If-None-Match"),
     actor_id: str | None = Header(default=None, alias="X-Actor-Id"),
     identity: Identity = Depends(get_identity),
     service: AvailabilityService = Depends(get_availability_service),
@@ -129,7 +261,25 @@ async def get_group_availability_summary(
     if not resolved_actor:
         raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="actorId header required")
 
-    items = await service.calculate_group_availability(group_id=group_id, actor_id=resolved_actor)
+    not_modified = await _not_modified(
+        service,
+        response,
+        kind="summary",
+        group_id=group_id,
+        actor_id=resolved_actor,
+        if_none_match=if_none_match,
+        from_date=from_,
+        to_date=to,
+    )
+    if not_modified is not None:
+        return not_modified
+
+    items = await service.calculate_group_availability(
+        group_id=group_id,
+        actor_id=resolved_actor,
+        from_date=from_,
+        to_date=to,
+    )
     # Convert dict items to Pydantic-compatible keys
     parsed = [
         AvailabilitySummaryItem(
@@ -143,9 +293,121 @@ async def get_group_availability_summary(
     return parsed
 
 
+@router.get("/groups/{group_id}/best-windows", response_model=list[BestWindowItem])
+async def get_group_best_windows(
+    group_id: UUID,
+    length: int = Query(..., ge=1, le=366, description="Fensterlänge in Tagen"),
+    k: int = Query(default=5, ge=1, le=50, description="Maximale Anzahl Fenster"),
+    from_: date | None = Query(default=None, alias="from", description="Suchbeginn (inklusive, Standard: heute)"),
+    to: date | None = Query(default=None, description="Suchende (inklusive, höchstens best_windows_max_days Tage)"),
+    actor_id: str | None = Header(default=None, alias="X-Actor-Id"),
+    identity: Identity = Depends(get_identity),
+    service: AvailabilityService = Depends(get_availability_service),
+):
+    """Return the best non-overlapping trip windows of a fixed length."""
+
+    resolved_actor = (actor_id or identity.user_id or "").strip() or None
+    if not resolved_actor:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="actorId header required")
+
+    items = await service.find_best_windows(
+        group_id=group_id, actor_id=resolved_actor, length=length, k=k, from_date=from_, to_date=to
+    )
+    return [BestWindowItem(**item) for item in items]
+
+
+@router.get("/groups/{group_id}/quorum-windows", response_model=list[QuorumWindowItem])
+async def get_group_quorum_windows(
+    group_id: UUID,
+    minMembers: int = Query(..., ge=1, description="Mindestanzahl verfügbarer Mitglieder pro Tag"),
+    minDays: int = Query(default=1, ge=1, le=366, description="Mindestlänge des Zeitraums in Tagen"),
+    from_: date | None = Query(default=None, alias="from", description="Fensterbeginn (inklusive)"),
+    to: date | None = Query(default=None, description="Fensterende (inklusive)"),
+    actor_id: str | None = Header(default=None, alias="X-Actor-Id"),
+    identity: Identity = Depends(get_identity),
+    service: AvailabilityService = Depends(get_availability_service),
+):
+    """Return date ranges where at least ``minMembers`` members are free for ``minDays``+ days."""
+
+    resolved_actor = (actor_id or identity.user_id or "").strip() or None
+    if not resolved_actor:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="actorId header required")
+
+    items = await service.find_quorum_windows(
+        group_id=group_id,
+        actor_id=resolved_actor,
+        min_members=minMembers,
+        min_days=minDays,
+        from_date=from_,
+        to_date=to,
+    )
+    return [QuorumWindowItem(**item) for item in items]
+
+
+@router.get("/groups/{group_id}/available-on", response_model=list[AvailableMember])
+async def list_members_available_on(
+    group_id: UUID,
+    day: date = Query(..., description="Tag (inklusive)"),
+    actor_id: str | None = Header(default=None, alias="X-Actor-Id"),
+    identity: Identity = Depends(get_identity),
+    service: AvailabilityService = Depends(get_availability_service),
+):
+    """List the members who are available on a given day."""
+
+    resolved_actor = (actor_id or identity.user_id or "").strip() or None
+    if not resolved_actor:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="actorId header required")
+
+    members = await service.list_members_available_on(group_id=group_id, actor_id=resolved_actor, day=day)
+    return [
+        AvailableMember(
+            memberId=m.id,
+            actorId=m.actor_id,
+            userId=m.user_id,
+            displayName=m.display_name,
+            role=m.role,
+        )
+        for m in members
+    ]
+
+
+@router.get("/groups/{group_id}/intersection", response_model=MemberIntersection)
+async def get_member_intersection(
+    group_id: UUID,
+    actorIds: list[str] | None = Query(default=None, description="Actor-IDs der Mitglieder (Standard: alle)"),
+    from_: date | None = Query(default=None, alias="from", description="Fensterbeginn (inklusive)"),
+    to: date | None = Query(default=None, description="Fensterende (inklusive)"),
+    actor_id: str | None = Header(default=None, alias="X-Actor-Id"),
+    identity: Identity = Depends(get_identity),
+    service: AvailabilityService = Depends(get_availability_service),
+):
+    """Return the days on which every selected member is available."""
+
+    resolved_actor = (actor_id or identity.user_id or "").strip() or None
+    if not resolved_actor:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="actorId header required")
+
+    result = await service.intersect_members(
+        group_id=group_id,
+        actor_id=resolved_actor,
+        member_actor_ids=actorIds,
+        from_date=from_,
+        to_date=to,
+    )
+    return MemberIntersection(
+        actorIds=result["actorIds"],
+        commonDays=result["commonDays"],
+        ranges=[DateRange(from_=start, to=end) for start, end in result["ranges"]],
+    )
+
+
 @router.get("/groups/{group_id}/member-availabilities", response_model=list[MemberAvailabilities])
 async def list_group_member_availabilities(
     group_id: UUID,
+    response: Response,
+    from_: date | None = Query(default=None, alias="from", description="Fensterbeginn (inklusive)"),
+    to: date | None = Query(default=None, description="Fensterende (inklusive)"),
+    if_none_match: str | None = Header(default=None, alias="If-None-Match"),
     actor_id: str | None = Header(default=None, alias="X-Actor-Id"),
     identity: Identity = Depends(get_identity),
     service: AvailabilityService = Depends(get_availability_service),
@@ -154,7 +416,25 @@ async def list_group_member_availabilities(
     if not resolved_actor:
         raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="actorId header required")
 
-    rows = await service.list_group_member_availabilities(group_id=group_id, actor_id=resolved_actor)
+    not_modified = await _not_modified(
+        service,
+        response,
+        kind="member-availabilities",
+        group_id=group_id,
+        actor_id=resolved_actor,
+        if_none_match=if_none_match,
+        from_date=from_,
+        to_date=to,
+    )
+    if not_modified is not None:
+        return not_modified
+
+    rows = await service.list_group_member_availabilities(
+        group_id=group_id,
+        actor_id=resolved_actor,
+        from_date=from_,
+        to_date=to,
+    )
     return [
         MemberAvailabilities(
             memberId=row["memberId"],
@@ -120,18 +120,19 @@ async def get_groups(
     if not actor and not user_uuid:
         raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="actorId header required")
 
-    rows = await service.get_groups_for_identity(actor_id=actor, user_id=user_uuid)
+    rows = await service.list_groups_with_invites(
+        ttl_days=settings.invite_token_ttl_days, actor_id=actor, user_id=user_uuid
+    )
     base_url = _frontend_base_url(request)
     memberships: list[dict] = []
-    for group, member in rows:
-        invite = await service.ensure_invite_for_group(group=group, ttl_days=settings.invite_token_ttl_days)
+    for group, member, invite_expires_at in rows:
         memberships.append(
             {
                 "groupId": group.id,
                 "name": group.name,
                 "role": member.role,
                 "inviteLink": f"{base_url}/invite/{group.id}",
-                "inviteExpiresAt": invite.expires_at,
+                "inviteExpiresAt": invite_expires_at,
             }
         )
 
@@ -155,7 +156,7 @@ async def create_group(
 
     creator_display = group_data.displayName or identity.display_name or "Gast"
 
-    group, member = await service.create_group(
+    group, member, invite = await service.create_group_with_invite(
         group_name=group_data.groupName,
         actor_id=resolved_actor,
         display_name=creator_display,
@@ -163,8 +164,6 @@ async def create_group(
         invite_ttl_days=settings.invite_token_ttl_days,
     )
 
-    invite = await service.ensure_invite_for_group(group=group, ttl_days=settings.invite_token_ttl_days)
-
     invite_link = f"{_frontend_base_url(request)}/invite/{group.id}"
 
     return {
@@ -0,0 +1,30 @@
+"""Internal metrics endpoints for sizing in-process caches and the database pool.
+
+Disabled (404) unless ``METRICS_TOKEN`` is set; requests then need ``Authorization: Bearer <token>``.
+"""
+
+from fastapi import APIRouter, Depends
+
+from app.core import database
+from app.core.security import hs256_secrets, require_metrics_token, verified_tokens
+from app.user_core.services.group_cache import group_read_cache, group_versions, membership_cache
+
+router = APIRouter(prefix="/api/metrics", tags=["metrics"], dependencies=[Depends(require_metrics_token)])
+
+
+@router.get("/caches")
+async def cache_metrics():
+    """Return hit/miss/eviction counters of the in-process caches and JWT verification."""
+    return {
+        "groupReads": group_read_cache.stats(),
+        "groupVersions": group_versions.stats(),
+        "memberships": membership_cache.stats(),
+        "verifiedTokens": verified_tokens.stats(),
+        "hs256Secrets": hs256_secrets.stats(),
+    }
+
+
+@router.get("/pool")
+async def pool_metrics():
+    """Return checked-out connections, checkout wait times and pool exhaustion/timeout counts."""
+    return database.pool_stats()
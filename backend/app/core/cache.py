@@ -0,0 +1,54 @@
+"""Bounded in-process LRU cache shared by the API's read and token caches."""
+
+from collections import OrderedDict
+from typing import Any, Hashable
+
+
+class VersionedLRUCache:
+    """Bounded LRU mapping with hit/miss/eviction counters.
+
+    Cached values are shared between callers and must be treated as read-only.
+    """
+
+    def __init__(self, maxsize: int) -> None:
+        self.maxsize = maxsize
+        self._entries: OrderedDict[Hashable, Any] = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def get(self, key: Hashable) -> tuple[bool, Any]:
+        if key in self._entries:
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return True, self._entries[key]
+        self.misses += 1
+        return False, None
+
+    def peek(self, key: Hashable) -> Any:
+        """Return an entry without touching recency or counters (None when missing)."""
+        return self._entries.get(key)
+
+    def set(self, key: Hashable, value: Any) -> None:
+        if self.maxsize <= 0:
+            return
+        self._entries[key] = value
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.maxsize:
+            self._entries.popitem(last=False)
+            self.evictions += 1
+
+    def clear(self) -> None:
+        self._entries.clear()
+        self.hits = self.misses = self.evictions = 0
+
+    def stats(self) -> dict:
+        lookups = self.hits + self.misses
+        return {
+            "size": len(self._entries),
+            "maxSize": self.maxsize,
+            "hits": self.hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+            "hitRate": round(self.hits / lookups, 4) if lookups else 0.0,
+        }
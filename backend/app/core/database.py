@@ -2,21 +2,107 @@
 Database connection und session management
 """
 
+import time
+
 from sqlmodel import create_engine
+from sqlalchemy import exc
 from sqlalchemy.ext.asyncio import AsyncSession, create_async_engine
 from sqlalchemy.orm import sessionmaker
+from sqlalchemy.pool import AsyncAdaptedQueuePool
 from .config import get_settings
 
 settings = get_settings()
 
-connect_args = {"ssl": "require"} if settings.database_ssl_require else {}
+
+class PoolMetrics:
+    """Counters for connection checkouts: acquire time, exhaustion and timeouts."""
+
+    def __init__(self) -> None:
+        self.checkouts = 0
+        self.wait_seconds_total = 0.0
+        self.wait_seconds_max = 0.0
+        self.exhausted = 0
+        self.timeouts = 0
+
+    def record(self, waited: float, exhausted: bool) -> None:
+        self.checkouts += 1
+        self.wait_seconds_total += waited
+        self.wait_seconds_max = max(self.wait_seconds_max, waited)
+        if exhausted:
+            self.exhausted += 1
+
+    def stats(self) -> dict:
+        return {
+            "checkouts": self.checkouts,
+            "waitSecondsTotal": round(self.wait_seconds_total, 6),
+            "waitSecondsAvg": round(self.wait_seconds_total / self.checkouts, 6) if self.checkouts else 0.0,
+            "waitSecondsMax": round(self.wait_seconds_max, 6),
+            "exhausted": self.exhausted,
+            "timeouts": self.timeouts,
+        }
+
+
+pool_metrics = PoolMetrics()
+
+
+class MeteredQueuePool(AsyncAdaptedQueuePool):
+    """Queue pool that records how long each checkout took and whether the pool was exhausted."""
+
+    metrics = pool_metrics
+
+    def connect(self):
+        # Exhausted: no idle connection and no overflow left, so the caller has to queue.
+        exhausted = self.checkedin() == 0 and -1 < self._max_overflow <= self.overflow()
+        start = time.perf_counter()
+        try:
+            return super().connect()
+        except exc.TimeoutError:
+            self.metrics.timeouts += 1
+            raise
+        finally:
+            self.metrics.record(time.perf_counter() - start, exhausted)
+
+
+def _connect_args() -> dict:
+    args: dict = {"statement_cache_size": settings.database_statement_cache_size}
+    if settings.database_ssl_require:
+        args["ssl"] = "require"
+    if settings.database_statement_timeout_ms:
+        args["server_settings"] = {"statement_timeout": str(settings.database_statement_timeout_ms)}
+    return args
+
+
+connect_args = _connect_args()
 
 # Async engine for database operations
-engine = create_async_engine(settings.database_url, echo=settings.debug, connect_args=connect_args)
+engine = create_async_engine(
+    settings.database_url,
+    echo=settings.database_echo,
+    connect_args=connect_args,
+    poolclass=MeteredQueuePool,
+    pool_size=settings.database_pool_size,
+    max_overflow=settings.database_max_overflow,
+    pool_timeout=settings.database_pool_timeout_seconds,
+    pool_recycle=settings.database_pool_recycle_seconds,
+    pool_pre_ping=settings.database_pool_pre_ping,
+)
 
 # Session factory for dependency injection
 async_session = sessionmaker(engine, class_=AsyncSession, expire_on_commit=False)
 
+
+def pool_stats() -> dict:
+    """Live pool gauges plus the checkout counters of ``pool_metrics``."""
+
+    pool = engine.pool
+    return {
+        "size": pool.size(),
+        "checkedOut": pool.checkedout(),
+        "checkedIn": pool.checkedin(),
+        "overflow": pool.overflow(),
+        **pool_metrics.stats(),
+    }
+
 # Database dependency for FastAPI
 async def get_session() -> AsyncSession:
     async with async_session() as session:
@@ -26,4 +112,4 @@ async def get_session() -> AsyncSession:
 async def create_db_and_tables():
     from sqlmodel import SQLModel
     async with engine.begin() as conn:
-        await conn.run_sync(SQLModel.metadata.create_all)
\ No newline at end of file
+        await conn.run_sync(SQLModel.metadata.create_all)
@@ -0,0 +1,134 @@
+"""Async Supabase JWKS provider with background refresh and single-flight fetches.
+
+Keys are held in a dict by ``kid``. A lookup never waits on the network while usable keys are
+cached: once the keys are older than ``refresh_after`` a background task refreshes them, and
+concurrent refreshes share one in-flight fetch. When a refresh fails (including a response with
+an empty or malformed key set) the previous keys keep being served. Only a cold cache or an
+unknown ``kid`` (key rotation) makes a caller await a fetch. Refetches after a failure or for
+unknown ``kid`` values start at most once per ``min_refetch_interval``.
+"""
+
+import asyncio
+import logging
+import time
+from typing import Callable, Optional
+
+import httpx
+
+logger = logging.getLogger(__name__)
+
+JWKS_ENDPOINTS = ("/auth/v1/keys", "/auth/v1/.well-known/jwks.json")
+
+
+class JWKSFetchError(Exception):
+    """Raised when no JWKS endpoint returned keys and no keys are cached."""
+
+
+class JWKSProvider:
+    """Caches JWKS keys by ``kid`` and refreshes them without blocking requests."""
+
+    def __init__(
+        self,
+        base_url: str,
+        api_key: str,
+        *,
+        refresh_after: float = 240.0,
+        min_refetch_interval: float = 30.0,
+        timeout: float = 5.0,
+        client: Optional[httpx.AsyncClient] = None,
+        clock: Callable[[], float] = time.monotonic,
+    ) -> None:
+        self.base_url = base_url.rstrip("/")
+        self.api_key = api_key
+        self.refresh_after = refresh_after
+        self.min_refetch_interval = min_refetch_interval
+        self._client = client or httpx.AsyncClient(
+            timeout=timeout,
+            limits=httpx.Limits(max_connections=4, max_keepalive_connections=2),
+        )
+        self._owns_client = client is None
+        self._clock = clock
+        self._keys: dict[str, dict] = {}
+        self._fetched_at: float | None = None
+        self._last_attempt: float | None = None
+        self._inflight: asyncio.Task | None = None
+        self.fetches = 0
+        self.failures = 0
+
+    async def get_key(self, kid: str | None) -> dict | None:
+        """Return the key for ``kid``, fetching only when nothing usable is cached."""
+
+        if self._fetched_at is None:
+            await self._refresh()
+        elif self._clock() - self._fetched_at >= self.refresh_after and self._may_refetch():
+            self.refresh_in_background()
+
+        key = self._keys.get(kid)
+        if key is None and self._may_refetch():
+            # Unknown kid: the signing key may have been rotated since the last fetch.
+            await self._refresh()
+            key = self._keys.get(kid)
+        return key
+
+    def refresh_in_background(self) -> None:
+        """Start a refresh unless one is already running; failures are logged, keys kept."""
+
+        self._ensure_inflight()
+
+    async def _refresh(self) -> None:
+        try:
+            await asyncio.shield(self._ensure_inflight())
+        except JWKSFetchError:
+            if not self._keys:
+                raise
+
+    def _may_refetch(self) -> bool:
+        return self._last_attempt is None or self._clock() - self._last_attempt >= self.min_refetch_interval
+
+    def _ensure_inflight(self) -> asyncio.Task:
+        if self._inflight is None or self._inflight.done():
+            self._inflight = asyncio.get_running_loop().create_task(self._fetch())
+            self._inflight.add_done_callback(self._log_failure)
+        return self._inflight
+
+    @staticmethod
+    def _log_failure(task: asyncio.Task) -> None:
+        if not task.cancelled() and task.exception() is not None:
+            logger.warning("Supabase JWKS refresh failed: %s", task.exception())
+
+    async def _fetch(self) -> None:
+        self._last_attempt = self._clock()
+        self.fetches += 1
+        last_exc: Exception | None = None
+        for endpoint in JWKS_ENDPOINTS:
+            url = self.base_url + endpoint
+            try:
+                resp = await self._client.get(url, headers={"apikey": self.api_key})
+                resp.raise_for_status()
+                keys = self._parse_keys(resp.json())
+            except Exception as exc:
+                last_exc = exc
+                logger.warning("Supabase JWKS fetch failed at %s: %s", url, exc)
+                continue
+            self._keys = keys
+            self._fetched_at = self._clock()
+            return
+        self.failures += 1
+        raise JWKSFetchError("Supabase JWKS fetch failed") from last_exc
+
+    @staticmethod
+    def _parse_keys(document: object) -> dict[str, dict]:
+        # An empty or malformed key set counts as a failed fetch, so it never replaces usable keys.
+        keys = document.get("keys") if isinstance(document, dict) else None
+        if not isinstance(keys, list):
+            raise ValueError("JWKS response has no keys list")
+        parsed = {key.get("kid"): key for key in keys if isinstance(key, dict)}
+        if not parsed:
+            raise ValueError("JWKS response has no usable keys")
+        return parsed
+
+    async def aclose(self) -> None:
+        if self._inflight is not None and not self._inflight.done():
+            self._inflight.cancel()
+        if self._owns_client:
+            await self._client.aclose()
@@ -2,16 +2,21 @@
 
 from typing import Optional
 
+import hashlib
+import hmac
 import logging
 import time
+from collections import Counter
 from typing import Optional
 
-import httpx
 from fastapi import Depends, Header, HTTPException, status
-from jose import JWTError, jwt
+from jose import ExpiredSignatureError, JWTError, jwt
+from jose.exceptions import JWTClaimsError
 from pydantic import BaseModel
 
+from .cache import VersionedLRUCache
 from .config import get_settings
+from .jwks import JWKSFetchError, JWKSProvider
 
 
 class Identity(BaseModel):
@@ -25,21 +30,13 @@ class Identity(BaseModel):
 
 logger = logging.getLogger(__name__)
 
-_jwks_cache: dict[str, object] = {"keys": None, "fetched_at": 0.0}
+_jwks_provider: JWKSProvider | None = None
 
 
-def _fetch_jwks(url: str, api_key: str):
-    resp = httpx.get(url, timeout=5.0, headers={"apikey": api_key})
-    resp.raise_for_status()
-    data = resp.json()
-    return data.get("keys") or []
+def _get_jwks_provider(settings) -> JWKSProvider:
+    """Return the process-wide JWKS provider for the configured Supabase project."""
 
-
-def _get_supabase_jwks(settings):
-    now = time.time()
-    cached = _jwks_cache.get("keys")
-    if cached and now - _jwks_cache.get("fetched_at", 0) < 300:
-        return cached
+    global _jwks_provider
 
     if not settings.supabase_url:
         raise HTTPException(status_code=500, detail="Supabase URL not configured")
@@ -53,42 +50,89 @@ def _get_supabase_jwks(settings):
     if not api_key:
         raise HTTPException(status_code=500, detail="Supabase public key not configured for JWKS fetch")
 
-    base = settings.supabase_url.rstrip("/")
-    endpoints = ["/auth/v1/keys", "/auth/v1/.well-known/jwks.json"]
+    base_url = settings.supabase_url.rstrip("/")
+    if _jwks_provider is None or (_jwks_provider.base_url, _jwks_provider.api_key) != (base_url, api_key):
+        _jwks_provider = JWKSProvider(base_url, api_key)
+    return _jwks_provider
+
+
+async def close_jwks_provider() -> None:
+    global _jwks_provider
+
+    if _jwks_provider is not None:
+        await _jwks_provider.aclose()
+        _jwks_provider = None
+
+
+class SecretSelector:
+    """Remembers which configured HS256 secret verified tokens of an issuer/``kid``.
+
+    The remembered secret is tried first, the others follow in configured order: the ordering only
+    saves verifications, every configured secret is still tried before a token is rejected. Only
+    successful verifications are recorded, so unverified claims cannot grow the index.
+    """
+
+    def __init__(self) -> None:
+        self._selected: dict[tuple[str | None, str | None], str] = {}
+        self.attempts: Counter[int] = Counter()
+        self.first_try_hits = 0
+
+    def candidates(self, issuer_key: tuple[str | None, str | None], secrets: list[tuple[str, str]]):
+        """Return the ``(name, secret)`` pairs to try for a token, remembered secret first."""
+
+        remembered = self._selected.get(issuer_key)
+        if remembered is None:
+            return secrets
+        return sorted(secrets, key=lambda item: item[0] != remembered)
+
+    def record(self, issuer_key: tuple[str | None, str | None], name: str | None, attempts: int) -> None:
+        self.attempts[attempts] += 1
+        if name is None:
+            return
+        if attempts == 1 and self._selected.get(issuer_key) == name:
+            self.first_try_hits += 1
+        self._selected[issuer_key] = name
+
+    def stats(self) -> dict:
+        verifications = sum(self.attempts.values())
+        return {
+            "issuers": len(self._selected),
+            "verifications": verifications,
+            "attempts": {str(count): total for count, total in sorted(self.attempts.items())},
+            "firstTryHits": self.first_try_hits,
+            "meanAttempts": (
+                round(sum(count * total for count, total in self.attempts.items()) / verifications, 4)
+                if verifications
+                else 0.0
+            ),
+        }
+
+
+hs256_secrets = SecretSelector()
+
+
+def _hs256_issuer_key(token: str, header: dict) -> tuple[str | None, str | None]:
     try:
-        last_exc = None
-        for endpoint in endpoints:
-            url = base + endpoint
-            try:
-                keys = _fetch_jwks(url, api_key)
-                _jwks_cache["keys"] = keys
-                _jwks_cache["fetched_at"] = now
-                return keys
-            except Exception as exc:
-                last_exc = exc
-                logger.warning("Supabase JWKS fetch failed at %s: %s", url, exc)
-                continue
-        raise last_exc  # type: ignore[misc]
-    except Exception as exc:  # pragma: no cover - network failures
-        logger.warning("Supabase JWKS fetch failed: %s", exc)
-        raise HTTPException(status_code=500, detail="Supabase JWKS fetch failed") from exc
+        issuer = jwt.get_unverified_claims(token).get("iss")
+    except JWTError:
+        issuer = None
+    return (issuer if isinstance(issuer, str) else None, header.get("kid"))
 
 
-def decode_supabase_token(token: str) -> dict:
+async def decode_supabase_token(token: str) -> dict:
     settings = get_settings()
     # Supabase access tokens are HS256-signed using the JWT secret (matches anon/public key in hosted projects).
     candidate_secrets = [
-        settings.supabase_jwt_secret,
-        settings.supabase_public_key,
-        settings.supabase_anon_key,
-        settings.supabase_service_key,
+        ("jwt_secret", settings.supabase_jwt_secret),
+        ("public_key", settings.supabase_public_key),
+        ("anon_key", settings.supabase_anon_key),
+        ("service_key", settings.supabase_service_key),
     ]
-    secrets = [s for s in candidate_secrets if s]
+    secrets = [(name, s) for name, s in candidate_secrets if s]
 
     if not secrets:
         raise HTTPException(status_code=500, detail="Supabase JWT secret not configured")
 
-    last_error: Exception | None = None
     try:
         header = jwt.get_unverified_header(token)
         alg = header.get("alg")
@@ -98,20 +142,32 @@ def decode_supabase_token(token: str) -> dict:
 
     if alg == "HS256":
         last_error: str | None = None
-        for secret in secrets:
+        issuer_key = _hs256_issuer_key(token, header)
+        attempts = 0
+        for name, secret in hs256_secrets.candidates(issuer_key, secrets):
+            attempts += 1
             try:
-                return jwt.decode(token, secret, algorithms=["HS256"], options={"verify_aud": False})
+                claims = jwt.decode(token, secret, algorithms=["HS256"], options={"verify_aud": False})
+            except (ExpiredSignatureError, JWTClaimsError) as exc:
+                # The signature matched this secret; the other secrets cannot make the claims valid.
+                last_error = str(exc)
+                break
             except JWTError as exc:  # try next
                 last_error = str(exc)
                 continue
+            hs256_secrets.record(issuer_key, name, attempts)
+            return claims
 
+        hs256_secrets.record(issuer_key, None, attempts)
         logger.warning("Supabase JWT decode failed: %s", last_error or "unknown error")
         raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail="Invalid Supabase token")
 
     if alg in {"RS256", "ES256"}:
-        keys = _get_supabase_jwks(settings)
         kid = header.get("kid")
-        key = next((k for k in keys if k.get("kid") == kid), None)
+        try:
+            key = await _get_jwks_provider(settings).get_key(kid)
+        except JWKSFetchError as exc:
+            raise HTTPException(status_code=500, detail="Supabase JWKS fetch failed") from exc
         if not key:
             logger.warning("Supabase JWT key not found for kid=%s", kid)
             raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail="Invalid Supabase token")
@@ -126,8 +182,62 @@ def decode_supabase_token(token: str) -> dict:
     raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail="Invalid Supabase token algorithm")
 
 
+class VerifiedTokenCache(VersionedLRUCache):
+    """Bounded LRU of verified JWT claims keyed by a SHA-256 digest of the token.
+
+    Entries expire at the token's ``exp`` (or after ``ttl_seconds`` when that comes first), so a
+    cached token is never accepted past the point where ``jwt.decode`` would reject it. Cached
+    claims are shared between requests and must be treated as read-only.
+    """
+
+    def __init__(self, maxsize: int, ttl_seconds: float) -> None:
+        super().__init__(maxsize)
+        self.ttl_seconds = ttl_seconds
+        self.expirations = 0
+
+    @staticmethod
+    def _digest(token: str) -> bytes:
+        return hashlib.sha256(token.encode()).digest()
+
+    def get(self, token: str) -> tuple[bool, dict | None]:
+        key = self._digest(token)
+        found, entry = super().get(key)
+        if not found:
+            return False, None
+        expires_at, claims = entry
+        if expires_at <= time.time():
+            del self._entries[key]
+            self.hits -= 1
+            self.misses += 1
+            self.expirations += 1
+            return False, None
+        return True, claims
+
+    def set(self, token: str, claims: dict) -> None:
+        if self.ttl_seconds <= 0:
+            return
+        expires_at = time.time() + self.ttl_seconds
+        exp = claims.get("exp")
+        if isinstance(exp, (int, float)):
+            expires_at = min(expires_at, float(exp))
+        super().set(self._digest(token), (expires_at, claims))
+
+    def clear(self) -> None:
+        super().clear()
+        self.expirations = 0
+
+    def stats(self) -> dict:
+        return {**super().stats(), "ttlSeconds": self.ttl_seconds, "expirations": self.expirations}
+
+
+verified_tokens = VerifiedTokenCache(
+    maxsize=get_settings().verified_token_cache_size,
+    ttl_seconds=get_settings().verified_token_cache_ttl_seconds,
+)
+
+
 async def get_identity(authorization: str | None = Header(default=None)) -> Identity:
-    """Extract identity from Bearer token if provided."""
+    """Extract identity from Bearer token if provided (verified claims are cached per token)."""
 
     if not authorization:
         return Identity()
@@ -136,7 +246,10 @@ async def get_identity(authorization: str | None = Header(default=None)) -> Iden
     if scheme.lower() != "bearer" or not token:
         raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail="Invalid authorization header")
 
-    payload = decode_supabase_token(token)
+    found, payload = verified_tokens.get(token)
+    if not found:
+        payload = await decode_supabase_token(token)
+        verified_tokens.set(token, payload)
     user_id = payload.get("sub")
     metadata = payload.get("user_metadata") or {}
     display_name = metadata.get("full_name") or metadata.get("name") or payload.get("email")
@@ -153,3 +266,18 @@ async def require_authenticated_identity(identity: Identity = Depends(get_identi
     if not identity.user_id:
         raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail="Authentication required")
     return identity
+
+
+async def require_metrics_token(authorization: str | None = Header(default=None)) -> None:
+    """Guard internal metrics: hidden unless ``metrics_token`` is set, then bearer-token protected."""
+
+    expected = get_settings().metrics_token
+    if not expected:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Not Found")
+    scheme, _, token = (authorization or "").partition(" ")
+    if scheme.lower() != "bearer" or not hmac.compare_digest(token.encode(), expected.encode()):
+        raise HTTPException(
+            status_code=status.HTTP_401_UNAUTHORIZED,
+            detail="Invalid metrics token",
+            headers={"WWW-Authenticate": "Bearer"},
+        )
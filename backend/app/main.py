@@ -8,7 +8,8 @@ from fastapi.middleware.cors import CORSMiddleware
 
 from .core.config import get_settings
 from .core.database import create_db_and_tables
-from .api.routes import auth_router, groups_router, health_router, voice_mock_router, availability_router, actor_router
+from .core.security import close_jwks_provider
+from .api.routes import auth_router, groups_router, health_router, voice_mock_router, availability_router, actor_router, metrics_router
 
 settings = get_settings()
 
@@ -19,6 +20,7 @@ async def lifespan(app: FastAPI):
     if os.getenv("DATABASE_URL"):
         await create_db_and_tables()
     yield
+    await close_jwks_provider()
 
 
 # FastAPI app instance
@@ -36,6 +38,7 @@ app.add_middleware(
     allow_credentials=True,
     allow_methods=["*"],
     allow_headers=["*"],
+    expose_headers=["ETag"],
 )
 
 # Include routers
@@ -45,6 +48,7 @@ app.include_router(auth_router)
 app.include_router(voice_mock_router)
 app.include_router(availability_router)
 app.include_router(actor_router)
+app.include_router(metrics_router)
 
 # For module execution
 def run_server():
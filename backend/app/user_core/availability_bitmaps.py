@@ -0,0 +1,101 @@
+"""Per-member day bitmaps for intersection and quorum queries.
+
+Each actor's availability is one Python int used as a bitset: bit ``i`` is set when the actor is
+available on day ``origin + i``. Intersections over any member subset are a bitwise AND, and
+"how many days" questions are a popcount, so whole members are combined at once instead of
+re-running the day sweep.
+"""
+
+import re
+from datetime import date
+from typing import Iterable, Mapping
+
+_RUN = re.compile("1+")
+
+
+def _range_mask(start_bit: int, end_bit: int) -> int:
+    """Bits ``start_bit..end_bit`` (inclusive) set."""
+    return ((1 << (end_bit - start_bit + 1)) - 1) << start_bit
+
+
+class GroupBitmaps:
+    """Day bitmaps of all actors with availabilities in one group."""
+
+    def __init__(self, origin: int | None = None) -> None:
+        self.origin = origin
+        self.bitmaps: dict[str, int] = {}
+
+    @classmethod
+    def from_ranges(cls, ranges_by_actor: Mapping[str, Iterable[tuple[date, date]]]) -> "GroupBitmaps":
+        bitmaps = cls()
+        for actor_id, ranges in ranges_by_actor.items():
+            bitmaps.add_ranges(actor_id, ranges)
+        return bitmaps
+
+    def _rebase(self, day_ord: int) -> None:
+        """Move the origin back so ``day_ord`` maps to a non-negative bit."""
+        if self.origin is None:
+            self.origin = day_ord
+        elif day_ord < self.origin:
+            shift = self.origin - day_ord
+            self.bitmaps = {actor_id: bits << shift for actor_id, bits in self.bitmaps.items()}
+            self.origin = day_ord
+
+    def _mask(self, start: date, end: date) -> int:
+        start_ord = start.toordinal()
+        self._rebase(start_ord)
+        return _range_mask(start_ord - self.origin, end.toordinal() - self.origin)
+
+    def add_ranges(self, actor_id: str, ranges: Iterable[tuple[date, date]]) -> None:
+        bits = self.bitmaps.get(actor_id, 0)
+        for start, end in ranges:
+            bits |= self._mask(start, end)
+        self.bitmaps[actor_id] = bits
+
+    def set_ranges(self, actor_id: str, ranges: Iterable[tuple[date, date]]) -> None:
+        self.bitmaps.pop(actor_id, None)
+        self.add_ranges(actor_id, ranges)
+        if not self.bitmaps[actor_id]:
+            del self.bitmaps[actor_id]
+
+    def _window_mask(self, from_date: date | None, to_date: date | None) -> int | None:
+        """Mask for an optional window, or None when no day of the window can be set."""
+
+        if self.origin is None:
+            return None
+        top = max((bits.bit_length() for bits in self.bitmaps.values()), default=0) - 1
+        low = 0 if from_date is None else from_date.toordinal() - self.origin
+        high = top if to_date is None else min(top, to_date.toordinal() - self.origin)
+        low = max(low, 0)
+        if high < low:
+            return None
+        return _range_mask(low, high)
+
+    def intersection(
+        self,
+        actor_ids: Iterable[str],
+        from_date: date | None = None,
+        to_date: date | None = None,
+    ) -> int:
+        """Bitset of days on which every given actor is available (within the optional window)."""
+
+        mask = self._window_mask(from_date, to_date)
+        if mask is None:
+            return 0
+        common = mask
+        for actor_id in actor_ids:
+            common &= self.bitmaps.get(actor_id, 0)
+            if not common:
+                break
+        return common
+
+    def runs(self, bits: int) -> list[tuple[date, date]]:
+        """Contiguous date ranges of set bits, in ascending order."""
+
+        if not bits or self.origin is None:
+            return []
+        # Reverse the binary string so string offsets equal bit positions.
+        return [
+            (date.fromordinal(self.origin + match.start()), date.fromordinal(self.origin + match.end() - 1))
+            for match in _RUN.finditer(format(bits, "b")[::-1])
+        ]
@@ -0,0 +1,250 @@
+"""Day-count engine for group availability summaries.
+
+A group's availability is kept as a sparse difference array: ``(day_ordinal, delta)``
+events where ``delta`` is the change in the number of available members on that day.
+The sweep turns such events into a list of
+``{"from", "to", "availableCount", "totalMembers"}`` dicts.
+
+The SQL repository aggregates in PostgreSQL, so only the in-memory repository uses the sweep.
+"""
+
+import heapq
+from collections import Counter, deque
+from datetime import date
+from typing import Iterable, Mapping
+
+
+def merge_ranges(ranges: Iterable[tuple[date, date]]) -> list[tuple[int, int]]:
+    """Merge overlapping or directly adjacent ranges into sorted ordinal tuples."""
+
+    merged: list[tuple[int, int]] = []
+    for start, end in sorted((s.toordinal(), e.toordinal()) for s, e in ranges):
+        if not merged:
+            merged.append((start, end))
+            continue
+        last_start, last_end = merged[-1]
+        # Merge overlapping or directly adjacent ranges (inclusive dates).
+        if start <= last_end + 1:
+            merged[-1] = (last_start, max(last_end, end))
+        else:
+            merged.append((start, end))
+    return merged
+
+
+def range_events(merged_ranges: Iterable[tuple[int, int]]) -> list[tuple[int, int]]:
+    """Turn merged ordinal ranges into sorted ``(day_ordinal, delta)`` events."""
+
+    events: list[tuple[int, int]] = []
+    for start_ord, end_ord in merged_ranges:
+        events.append((start_ord, 1))
+        events.append((end_ord + 1, -1))
+    events.sort()
+    return events
+
+
+def coverage_delta(
+    before: Iterable[tuple[date, date]],
+    after: Iterable[tuple[date, date]],
+) -> dict[date, int]:
+    """Day deltas that move one actor's contribution from ``before`` to ``after`` ranges.
+
+    Ranges are merged per side, so overlapping ranges of the same actor never count twice.
+    """
+
+    counter: Counter[int] = Counter()
+    for day_ord, delta in range_events(merge_ranges(after)):
+        counter[day_ord] += delta
+    for day_ord, delta in range_events(merge_ranges(before)):
+        counter[day_ord] -= delta
+    return {date.fromordinal(day_ord): delta for day_ord, delta in counter.items() if delta}
+
+
+def window_events(
+    events: list[tuple[int, int]],
+    start_ord: int | None = None,
+    end_ord: int | None = None,
+) -> list[tuple[int, int]]:
+    """Clip sorted events to ``[start_ord, end_ord]`` (inclusive, either bound optional).
+
+    Events before the window collapse into one opening event carrying the count on
+    ``start_ord``; a closing event on ``end_ord + 1`` ends the last interval at the window edge.
+    """
+
+    clipped: Counter[int] = Counter()
+    for day_ord, delta in events:
+        if start_ord is not None and day_ord <= start_ord:
+            clipped[start_ord] += delta
+        elif end_ord is None or day_ord <= end_ord + 1:
+            clipped[day_ord] += delta
+    if start_ord is not None:
+        clipped[start_ord] += 0
+    if end_ord is not None:
+        clipped[end_ord + 1] += 0
+    return sorted(clipped.items())
+
+
+def sweep_summary(events: list[tuple[int, int]], total_members: int) -> list[dict]:
+    """Walk sorted events and emit intervals, merging adjacent intervals with equal counts."""
+
+    active = 0
+    current_start: int | None = None
+    intervals: list[dict] = []
+
+    for day_ord, delta in events:
+        if current_start is not None and day_ord > current_start and active > 0:
+            count = min(active, total_members)  # clamp to group size
+            if (
+                intervals
+                and intervals[-1]["availableCount"] == count
+                and intervals[-1]["to"].toordinal() == current_start - 1
+            ):
+                # Adjacent interval with the same count: extend instead of fragmenting.
+                intervals[-1]["to"] = date.fromordinal(day_ord - 1)
+            else:
+                intervals.append(
+                    {
+                        "from": date.fromordinal(current_start),
+                        "to": date.fromordinal(day_ord - 1),
+                        "availableCount": count,
+                        "totalMembers": total_members,
+                    }
+                )
+
+        active += delta
+        current_start = day_ord
+
+    return intervals
+
+
+def summarize_events(events: list[tuple[int, int]], total_members: int) -> list[dict]:
+    """Summarize sorted day events."""
+
+    if len(events) < 2:
+        return []
+    return sweep_summary(events, total_members)
+
+
+def summarize_ranges(ranges_by_actor: Mapping[str, list[tuple[date, date]]], total_members: int) -> list[dict]:
+    """Summarize raw per-actor ranges (merged per actor before counting)."""
+
+    merged_ranges = [r for ranges in ranges_by_actor.values() for r in merge_ranges(ranges)]
+    return summarize_events(range_events(merged_ranges), total_members)
+
+
+def best_windows(intervals: list[dict], length: int, k: int) -> list[dict]:
+    """Pick up to ``k`` non-overlapping windows of ``length`` days with the best attendance.
+
+    Per-day counts are expanded over the summary horizon once. Prefix sums give each window's
+    member-days in O(1) and a monotonic deque yields each window's weakest day, so scoring every
+    start day is linear in the horizon. Windows rank by weakest day, then total member-days.
+    """
+
+    if not intervals or length < 1 or k < 1:
+        return []
+
+    origin = intervals[0]["from"].toordinal()
+    horizon = intervals[-1]["to"].toordinal() - origin + 1
+    if length > horizon:
+        return []
+
+    counts = [0] * horizon
+    for interval in intervals:
+        first = interval["from"].toordinal() - origin
+        last = interval["to"].toordinal() - origin
+        counts[first : last + 1] = [interval["availableCount"]] * (last - first + 1)
+
+    prefix = [0] * (horizon + 1)
+    for day, count in enumerate(counts):
+        prefix[day + 1] = prefix[day] + count
+
+    candidates: list[tuple[int, int, int]] = []
+    window: deque[int] = deque()  # day indexes with increasing counts; front is the window minimum
+    for day, count in enumerate(counts):
+        while window and counts[window[-1]] >= count:
+            window.pop()
+        window.append(day)
+        start = day - length + 1
+        if window[0] < start:
+            window.popleft()
+        if start < 0:
+            continue
+        weakest = counts[window[0]]
+        if weakest > 0:
+            candidates.append((-weakest, -(prefix[day + 1] - prefix[start]), start))
+
+    # Pop best-first and skip windows overlapping an already chosen one.
+    heapq.heapify(candidates)
+    chosen: list[tuple[int, int, int]] = []
+    while candidates and len(chosen) < k:
+        weakest, member_days, start = heapq.heappop(candidates)
+        if any(abs(start - other) < length for _, _, other in chosen):
+            continue
+        chosen.append((weakest, member_days, start))
+
+    total_members = intervals[0]["totalMembers"]
+    return [
+        {
+            "from": date.fromordinal(origin + start),
+            "to": date.fromordinal(origin + start + length - 1),
+            "minAvailable": -weakest,
+            "averageAvailable": round(-member_days / length, 2),
+            "totalMembers": total_members,
+        }
+        for weakest, member_days, start in chosen
+    ]
+
+
+def quorum_windows(intervals: list[dict], min_members: int, min_days: int) -> list[dict]:
+    """Maximal date ranges on which at least ``min_members`` are available for ``min_days``+ days.
+
+    Works in one pass over the sorted summary: consecutive intervals meeting the quorum are merged
+    while accumulating their weakest count and member-days, so no per-day array is built. Results
+    are ordered longest first, then by weakest day and average attendance.
+    """
+
+    if min_members < 1 or min_days < 1:
+        return []
+
+    windows: list[dict] = []
+    run: dict | None = None
+
+    def close(run: dict | None) -> None:
+        if run is None:
+            return
+        days = run["to"].toordinal() - run["from"].toordinal() + 1
+        if days >= min_days:
+            windows.append(
+                {
+                    "from": run["from"],
+                    "to": run["to"],
+                    "days": days,
+                    "minAvailable": run["minAvailable"],
+                    "averageAvailable": round(run["memberDays"] / days, 2),
+                    "totalMembers": run["totalMembers"],
+                }
+            )
+
+    for interval in intervals:
+        count = interval["availableCount"]
+        if count < min_members:
+            close(run)
+            run = None
+            continue
+        days = interval["to"].toordinal() - interval["from"].toordinal() + 1
+        if run is not None and run["to"].toordinal() + 1 == interval["from"].toordinal():
+            run["to"] = interval["to"]
+            run["minAvailable"] = min(run["minAvailable"], count)
+            run["memberDays"] += count * days
+        else:
+            close(run)
+            run = {
+                "from": interval["from"],
+                "to": interval["to"],
+                "minAvailable": count,
+                "memberDays": count * days,
+                "totalMembers": interval["totalMembers"],
+            }
+    close(run)
+
+    windows.sort(key=lambda w: (-w["days"], -w["minAvailable"], -w["averageAvailable"], w["from"]))
+    return windows
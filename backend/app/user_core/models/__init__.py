@@ -7,5 +7,6 @@ from .group_member import GroupMember
 from .user import User
 from .user_actor import UserActor
 from .availability import Availability
+from .availability_day_delta import AvailabilityDayDelta
 
-__all__ = ["Actor", "Group", "GroupInvite", "GroupMember", "User", "UserActor", "Availability"]
+__all__ = ["Actor", "Group", "GroupInvite", "GroupMember", "User", "UserActor", "Availability", "AvailabilityDayDelta"]
@@ -1,8 +1,11 @@
 """Availability model (per user, per group)."""
 
 from datetime import datetime, date
+from typing import Any
 from uuid import UUID, uuid4
 
+from sqlalchemy import DDL, Column, Computed, Index, event
+from sqlalchemy.dialects.postgresql import DATERANGE
 from sqlmodel import Field, SQLModel
 
 
@@ -10,6 +13,7 @@ class Availability(SQLModel, table=True):
     """Availability window supplied by an authenticated user for a group."""
 
     __tablename__ = "availabilities"
+    __table_args__ = (Index("idx_availabilities_group_span", "group_id", "span", postgresql_using="gist"),)
 
     id: UUID = Field(default_factory=uuid4, primary_key=True, description="Primary identifier")
     group_id: UUID = Field(foreign_key="groups.id", description="Group id")
@@ -23,3 +27,14 @@ class Availability(SQLModel, table=True):
         description="Type of range (MVP: always 'available')",
     )
     created_at: datetime = Field(default_factory=datetime.utcnow, description="Creation timestamp")
+    # Generated by PostgreSQL (see migration 0009); never written, so it is left out of model_dump().
+    span: Any = Field(
+        default=None,
+        exclude=True,
+        sa_column=Column(DATERANGE, Computed("daterange(start_date, end_date, '[]')", persisted=True)),
+        description="Inclusive [start_date, end_date] as daterange",
+    )
+
+
+# The (group_id, span) GiST index needs btree_gist when the table is created via metadata.create_all.
+event.listen(Availability.__table__, "before_create", DDL("CREATE EXTENSION IF NOT EXISTS btree_gist"))
@@ -0,0 +1,16 @@
+"""Per-group availability day deltas (sparse difference array)."""
+
+from datetime import date
+from uuid import UUID
+
+from sqlmodel import Field, SQLModel
+
+
+class AvailabilityDayDelta(SQLModel, table=True):
+    """Change in the number of available members of a group starting on a given day."""
+
+    __tablename__ = "availability_day_deltas"
+
+    group_id: UUID = Field(foreign_key="groups.id", primary_key=True, description="Group id")
+    day: date = Field(primary_key=True, description="Day the change takes effect")
+    delta: int = Field(default=0, description="Change in available member count")
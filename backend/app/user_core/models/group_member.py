@@ -4,6 +4,7 @@ from datetime import datetime
 from typing import Optional
 from uuid import UUID, uuid4
 
+from sqlalchemy import UniqueConstraint
 from sqlmodel import Field, SQLModel
 
 
@@ -11,6 +12,7 @@ class GroupMember(SQLModel, table=True):
     """Membership of an actor in a group."""
 
     __tablename__ = "group_members"
+    __table_args__ = (UniqueConstraint("group_id", "actor_id", name="uq_group_members_group_actor"),)
 
     id: UUID = Field(default_factory=uuid4, primary_key=True, description="Primary identifier")
     group_id: UUID = Field(foreign_key="groups.id", description="Group id")
@@ -3,6 +3,7 @@
 from typing import Optional, Protocol
 from uuid import uuid4
 
+from sqlalchemy.dialects.postgresql import insert
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlmodel import select
 
@@ -28,16 +29,14 @@ class SQLModelActorRepository(ActorRepository):
         return await self.session.get(Actor, actor_id)
 
     async def create(self, actor_id: Optional[str] = None) -> Actor:
-        candidate = actor_id or str(uuid4())
-        existing = await self.get(candidate)
-        if existing:
-            return existing
-
-        actor = Actor(id=candidate)
-        self.session.add(actor)
-        await self.session.commit()
-        await self.session.refresh(actor)
-        return actor
+        """Insert the actor or return the stored row; idempotent and race-free in one statement."""
+
+        stmt = insert(Actor).values(Actor(id=actor_id or str(uuid4())).model_dump())
+        # DO UPDATE (not DO NOTHING) so RETURNING also yields the row when it already exists;
+        # the no-op assignment keeps the original created_at.
+        stmt = stmt.on_conflict_do_update(index_elements=["id"], set_={"id": stmt.excluded.id})
+        result = await self.session.scalars(stmt.returning(Actor))
+        return result.one()
 
     async def commit(self) -> None:
         await self.session.commit()
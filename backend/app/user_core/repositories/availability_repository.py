@@ -1,13 +1,16 @@
 """Availability repository abstractions."""
 
 from datetime import date
-from typing import List, Protocol
+from typing import List, Mapping, Protocol, Sequence
 from uuid import UUID, uuid4
 
+from sqlalchemy import Date, String, and_, cast, delete, func, or_, text
+from sqlalchemy.dialects.postgresql import insert
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlmodel import select
 
-from app.user_core.models import Availability
+from app.user_core.availability_summary import coverage_delta, summarize_events, window_events
+from app.user_core.models import Availability, AvailabilityDayDelta
 
 
 class AvailabilityRepository(Protocol):
@@ -24,22 +27,128 @@ class AvailabilityRepository(Protocol):
     ) -> Availability:
         ...
 
+    async def create_many(
+        self,
+        *,
+        group_id: UUID,
+        actor_id: str,
+        user_id: UUID | None,
+        ranges: Sequence[tuple[date, date]],
+    ) -> List[Availability]:
+        ...
+
+    async def replace_ranges_for_actor(
+        self,
+        *,
+        group_id: UUID,
+        actor_id: str,
+        user_id: UUID | None,
+        current: Sequence[Availability],
+        delete_ids: Sequence[UUID],
+        ranges: Sequence[tuple[date, date]],
+    ) -> List[Availability]:
+        ...
+
+    async def lock_actor(self, *, group_id: UUID, actor_id: str) -> None:
+        """Serialize writes to one actor's ranges in a group until the transaction ends."""
+        ...
+
     async def list_for_actor_in_group(self, *, actor_id: str, group_id: UUID) -> List[Availability]:
         ...
 
-    async def list_for_group(self, *, group_id: UUID) -> List[Availability]:
+    async def list_for_group(
+        self,
+        *,
+        group_id: UUID,
+        from_date: date | None = None,
+        to_date: date | None = None,
+    ) -> List[Availability]:
+        ...
+
+    async def list_available_on(self, *, group_id: UUID, day: date) -> List[Availability]:
         ...
 
     async def get_by_id(self, availability_id: UUID) -> Availability | None:
         ...
 
-    async def delete_for_actor(self, *, availability_id: UUID, actor_id: str) -> bool:
+    async def delete_owned(
+        self, *, availability_id: UUID, actor_id: str, user_id: UUID | None = None
+    ) -> Availability | None:
+        """Delete the record if ``actor_id`` (or ``user_id``) owns it; return it, or None if nothing matched."""
+        ...
+
+    async def list_day_deltas(self, *, group_id: UUID) -> List[tuple[date, int]]:
+        ...
+
+    async def summarize_group(
+        self,
+        *,
+        group_id: UUID,
+        max_count: int,
+        from_date: date | None = None,
+        to_date: date | None = None,
+    ) -> List[tuple[date, date, int]]:
         ...
 
     async def commit(self) -> None:
         ...
 
 
+# Generated daterange column (migration 0009), served by the (group_id, span) GiST index.
+_SPAN = Availability.span
+
+# Running sum over the group's day deltas, clamped to the group size, then gaps-and-islands to
+# merge consecutive boundaries with the same count. Only the final intervals leave the database.
+# An optional [from_date, to_date] window collapses earlier deltas into one opening boundary and
+# adds a closing boundary, so only deltas inside the window go through the window functions. The
+# opening boundary still sums all earlier deltas of the group: an index-only range scan over at most
+# one row per day of history (benchmarks/summary_sql.py: ~1.3 ms vs ~1.0 ms at the start for a
+# 30-day window after 10 years of daily boundaries, against ~32 ms unwindowed).
+_SUMMARY_SQL = text(
+    """
+    WITH windowed AS (
+        SELECT day, delta
+        FROM availability_day_deltas
+        WHERE group_id = :group_id
+          AND delta <> 0
+          AND day > COALESCE(CAST(:from_date AS DATE), '-infinity'::date)
+          AND day <= COALESCE(CAST(:to_date AS DATE) + 1, 'infinity'::date)
+        UNION ALL
+        SELECT CAST(:from_date AS DATE), COALESCE(SUM(delta), 0)
+        FROM availability_day_deltas
+        WHERE group_id = :group_id AND day <= CAST(:from_date AS DATE)
+        HAVING CAST(:from_date AS DATE) IS NOT NULL
+        UNION ALL
+        SELECT CAST(:to_date AS DATE) + 1, 0
+        WHERE CAST(:to_date AS DATE) IS NOT NULL
+    ),
+    running AS (
+        SELECT day,
+               LEAST(SUM(SUM(delta)) OVER (ORDER BY day), :max_count) AS available,
+               LEAD(day) OVER (ORDER BY day) AS next_day
+        FROM windowed
+        GROUP BY day
+    ),
+    runs AS (
+        SELECT day,
+               next_day,
+               available,
+               SUM(CASE WHEN available IS DISTINCT FROM prev_available THEN 1 ELSE 0 END)
+                   OVER (ORDER BY day) AS run_id
+        FROM (
+            SELECT day, next_day, available, LAG(available) OVER (ORDER BY day) AS prev_available
+            FROM running
+        ) boundaries
+    )
+    SELECT MIN(day) AS from_day, MAX(next_day) - 1 AS to_day, available
+    FROM runs
+    WHERE available > 0 AND next_day IS NOT NULL
+    GROUP BY run_id, available
+    ORDER BY from_day
+    """
+)
+
+
 class SQLModelAvailabilityRepository(AvailabilityRepository):
     """SQLModel-backed availability repo."""
 
@@ -55,19 +164,109 @@ class SQLModelAvailabilityRepository(AvailabilityRepository):
         start_date: date,
         end_date: date,
     ) -> Availability:
-        record = Availability(
-                        id=uuid4(),  # stable id even before flush for consistent tests
-                        group_id=group_id,
-                        actor_id=actor_id,
-                        user_id=user_id,
-                        start_date=start_date,
-                        end_date=end_date,
-                        kind="available",
-        )
-        self.session.add(record)
-        await self.session.flush()
-        await self.session.refresh(record)
-        return record
+        # Same INSERT ... RETURNING path as batches: no flush/refresh round trips.
+        records = await self.create_many(
+            group_id=group_id, actor_id=actor_id, user_id=user_id, ranges=[(start_date, end_date)]
+        )
+        return records[0]
+
+    async def create_many(
+        self,
+        *,
+        group_id: UUID,
+        actor_id: str,
+        user_id: UUID | None,
+        ranges: Sequence[tuple[date, date]],
+    ) -> List[Availability]:
+        if not ranges:
+            return []
+
+        await self.lock_actor(group_id=group_id, actor_id=actor_id)
+        # Only the actor's ranges overlapping the new ones can change the coverage delta.
+        existing = await self._list_overlapping(
+            group_id=group_id,
+            actor_id=actor_id,
+            from_date=min(start_date for start_date, _ in ranges),
+            to_date=max(end_date for _, end_date in ranges),
+        )
+        rows = [
+            Availability(
+                group_id=group_id,
+                actor_id=actor_id,
+                user_id=user_id,
+                start_date=start_date,
+                end_date=end_date,
+                kind="available",
+            ).model_dump()
+            for start_date, end_date in ranges
+        ]
+        # One multi-row INSERT ... RETURNING instead of a flush/refresh per record.
+        result = await self.session.scalars(insert(Availability).values(rows).returning(Availability))
+        records = list(result.all())
+
+        before = [(r.start_date, r.end_date) for r in existing]
+        await self._apply_day_deltas(group_id=group_id, deltas=coverage_delta(before, before + list(ranges)))
+        return records
+
+    async def replace_ranges_for_actor(
+        self,
+        *,
+        group_id: UUID,
+        actor_id: str,
+        user_id: UUID | None,
+        current: Sequence[Availability],
+        delete_ids: Sequence[UUID],
+        ranges: Sequence[tuple[date, date]],
+    ) -> List[Availability]:
+        """Apply a precomputed diff: one DELETE, one multi-row INSERT, one day-delta upsert."""
+
+        if delete_ids:
+            await self.session.execute(
+                delete(Availability).where(
+                    Availability.group_id == group_id,
+                    Availability.actor_id == actor_id,
+                    Availability.id.in_(list(delete_ids)),
+                )
+            )
+
+        records: List[Availability] = []
+        if ranges:
+            rows = [
+                Availability(
+                    group_id=group_id,
+                    actor_id=actor_id,
+                    user_id=user_id,
+                    start_date=start_date,
+                    end_date=end_date,
+                    kind="available",
+                ).model_dump()
+                for start_date, end_date in ranges
+            ]
+            result = await self.session.scalars(insert(Availability).values(rows).returning(Availability))
+            records = list(result.all())
+
+        removed = set(delete_ids)
+        before = [(r.start_date, r.end_date) for r in current]
+        after = [(r.start_date, r.end_date) for r in current if r.id not in removed] + list(ranges)
+        await self._apply_day_deltas(group_id=group_id, deltas=coverage_delta(before, after))
+        return records
+
+    async def lock_actor(self, *, group_id: UUID, actor_id: str) -> None:
+        # Transaction-scoped advisory lock: concurrent writers of the same (group, actor) read the
+        # "before" ranges only after the previous writer committed, so day deltas cannot drift.
+        await self.session.execute(
+            select(func.pg_advisory_xact_lock(func.hashtext(str(group_id)), func.hashtext(actor_id)))
+        )
+
+    async def _list_overlapping(
+        self, *, group_id: UUID, actor_id: str, from_date: date, to_date: date
+    ) -> List[Availability]:
+        stmt = select(Availability).where(
+            Availability.group_id == group_id,
+            Availability.actor_id == actor_id,
+            _SPAN.op("&&")(func.daterange(cast(from_date, Date), cast(to_date, Date), "[]")),
+        )
+        return list((await self.session.scalars(stmt)).all())
 
     async def list_for_actor_in_group(self, *, actor_id: str, group_id: UUID) -> List[Availability]:
         stmt = select(Availability).where(
@@ -77,21 +276,118 @@ class SQLModelAvailabilityRepository(AvailabilityRepository):
         result = await self.session.execute(stmt)
         return list(result.scalars().all())
 
-    async def list_for_group(self, *, group_id: UUID) -> List[Availability]:
+    async def list_for_group(
+        self,
+        *,
+        group_id: UUID,
+        from_date: date | None = None,
+        to_date: date | None = None,
+    ) -> List[Availability]:
         stmt = select(Availability).where(Availability.group_id == group_id)
+        if from_date is not None or to_date is not None:
+            # NULL bounds make the range unbounded on that side.
+            window = func.daterange(cast(from_date, Date), cast(to_date, Date), "[]")
+            stmt = stmt.where(_SPAN.op("&&")(window))
+        result = await self.session.execute(stmt)
+        return list(result.scalars().all())
+
+    async def list_available_on(self, *, group_id: UUID, day: date) -> List[Availability]:
+        stmt = select(Availability).where(
+            Availability.group_id == group_id,
+            _SPAN.op("@>")(cast(day, Date)),
+        )
         result = await self.session.execute(stmt)
         return list(result.scalars().all())
 
     async def get_by_id(self, availability_id: UUID) -> Availability | None:
         return await self.session.get(Availability, availability_id)
 
-    async def delete_for_actor(self, *, availability_id: UUID, actor_id: str) -> bool:
-        record = await self.session.get(Availability, availability_id)
-        if not record or record.actor_id != actor_id:
-            return False
-        await self.session.delete(record)
-        await self.session.flush()
-        return True
+    async def delete_owned(
+        self, *, availability_id: UUID, actor_id: str, user_id: UUID | None = None
+    ) -> Availability | None:
+        owner = Availability.actor_id == actor_id
+        if user_id:
+            owner = or_(owner, Availability.user_id == user_id)
+        # Lock the row's (group, actor) first; nothing to lock means nothing the caller may delete.
+        locked = await self.session.execute(
+            select(
+                func.pg_advisory_xact_lock(
+                    func.hashtext(cast(Availability.group_id, String)), func.hashtext(Availability.actor_id)
+                )
+            ).where(Availability.id == availability_id, owner)
+        )
+        if locked.first() is None:
+            return None
+
+        deleted = (
+            delete(Availability)
+            .where(Availability.id == availability_id, owner)
+            .returning(Availability.group_id, Availability.actor_id, Availability.start_date, Availability.end_date)
+            .cte("deleted")
+        )
+        # The outer SELECT reads the pre-delete snapshot: the owner's ranges overlapping the deleted
+        # one (itself included) come back in the same round trip.
+        stmt = select(Availability).join(
+            deleted,
+            and_(
+                Availability.group_id == deleted.c.group_id,
+                Availability.actor_id == deleted.c.actor_id,
+                _SPAN.op("&&")(func.daterange(deleted.c.start_date, deleted.c.end_date, "[]")),
+            ),
+        )
+        siblings = list((await self.session.scalars(stmt)).all())
+        record = next((r for r in siblings if r.id == availability_id), None)
+        if record is None:
+            return None
+
+        before = [(r.start_date, r.end_date) for r in siblings]
+        after = [(r.start_date, r.end_date) for r in siblings if r.id != availability_id]
+        await self._apply_day_deltas(group_id=record.group_id, deltas=coverage_delta(before, after))
+        return record
+
+    async def list_day_deltas(self, *, group_id: UUID) -> List[tuple[date, int]]:
+        stmt = (
+            select(AvailabilityDayDelta.day, AvailabilityDayDelta.delta)
+            .where(AvailabilityDayDelta.group_id == group_id, AvailabilityDayDelta.delta != 0)
+            .order_by(AvailabilityDayDelta.day)
+        )
+        result = await self.session.execute(stmt)
+        return [(row.day, row.delta) for row in result.all()]
+
+    async def summarize_group(
+        self,
+        *,
+        group_id: UUID,
+        max_count: int,
+        from_date: date | None = None,
+        to_date: date | None = None,
+    ) -> List[tuple[date, date, int]]:
+        params = {"group_id": group_id, "max_count": max_count, "from_date": from_date, "to_date": to_date}
+        result = await self.session.execute(_SUMMARY_SQL, params)
+        return [(row.from_day, row.to_day, row.available) for row in result.all()]
+
+    async def _apply_day_deltas(self, *, group_id: UUID, deltas: Mapping[date, int]) -> None:
+        """Upsert the changed boundary days (one PK lookup each) and drop rows that cancel out."""
+
+        if not deltas:
+            return
+
+        # Rows are locked in day order, so writers of different actors cannot deadlock on them.
+        stmt = insert(AvailabilityDayDelta).values(
+            [{"group_id": group_id, "day": day, "delta": delta} for day, delta in sorted(deltas.items())]
+        )
+        stmt = stmt.on_conflict_do_update(
+            index_elements=[AvailabilityDayDelta.group_id, AvailabilityDayDelta.day],
+            set_={"delta": AvailabilityDayDelta.delta + stmt.excluded.delta},
+        )
+        await self.session.execute(stmt)
+        await self.session.execute(
+            delete(AvailabilityDayDelta).where(
+                AvailabilityDayDelta.group_id == group_id,
+                AvailabilityDayDelta.day.in_(list(deltas)),
+                AvailabilityDayDelta.delta == 0,
+            )
+        )
 
     async def commit(self) -> None:
         await self.session.commit()
@@ -101,7 +397,10 @@ class InMemoryAvailabilityRepository(AvailabilityRepository):
     """In-memory repo for tests."""
 
     def __init__(self) -> None:
-        self._rows: list[Availability] = []
+        self._rows: dict[UUID, Availability] = {}
+        # Rows per (group, actor), so writes only look at the writing actor's ranges.
+        self._actor_rows: dict[tuple[UUID, str], dict[UUID, Availability]] = {}
+        self._day_deltas: dict[UUID, dict[date, int]] = {}
 
     async def create_availability(
         self,
@@ -121,22 +420,160 @@ class InMemoryAvailabilityRepository(AvailabilityRepository):
             end_date=end_date,
             kind="available",
         )
-        self._rows.append(record)
+        before = self._overlapping(group_id, actor_id, start_date, end_date)
+        self._add_rows([record])
+        self._apply_day_deltas(group_id, coverage_delta(before, before + [(start_date, end_date)]))
         return record
 
+    async def create_many(
+        self,
+        *,
+        group_id: UUID,
+        actor_id: str,
+        user_id: UUID | None,
+        ranges: Sequence[tuple[date, date]],
+    ) -> List[Availability]:
+        if not ranges:
+            return []
+        before = self._overlapping(
+            group_id, actor_id, min(start for start, _ in ranges), max(end for _, end in ranges)
+        )
+        records = [
+            Availability(
+                id=uuid4(),
+                group_id=group_id,
+                actor_id=actor_id,
+                user_id=user_id,
+                start_date=start_date,
+                end_date=end_date,
+                kind="available",
+            )
+            for start_date, end_date in ranges
+        ]
+        self._add_rows(records)
+        self._apply_day_deltas(group_id, coverage_delta(before, before + list(ranges)))
+        return records
+
+    async def replace_ranges_for_actor(
+        self,
+        *,
+        group_id: UUID,
+        actor_id: str,
+        user_id: UUID | None,
+        current: Sequence[Availability],
+        delete_ids: Sequence[UUID],
+        ranges: Sequence[tuple[date, date]],
+    ) -> List[Availability]:
+        removed = set(delete_ids)
+        actor_rows = self._actor_rows.get((group_id, actor_id), {})
+        for availability_id in removed & actor_rows.keys():
+            del actor_rows[availability_id]
+            del self._rows[availability_id]
+        records = [
+            Availability(
+                id=uuid4(),
+                group_id=group_id,
+                actor_id=actor_id,
+                user_id=user_id,
+                start_date=start_date,
+                end_date=end_date,
+                kind="available",
+            )
+            for start_date, end_date in ranges
+        ]
+        self._add_rows(records)
+
+        before = [(r.start_date, r.end_date) for r in current]
+        after = [(r.start_date, r.end_date) for r in current if r.id not in removed] + list(ranges)
+        self._apply_day_deltas(group_id, coverage_delta(before, after))
+        return records
+
+    async def lock_actor(self, *, group_id: UUID, actor_id: str) -> None:
+        # Reads and writes below never await in between, so they are atomic on the event loop.
+        return None
+
     async def list_for_actor_in_group(self, *, actor_id: str, group_id: UUID) -> List[Availability]:
-        return [r for r in self._rows if r.group_id == group_id and r.actor_id == actor_id]
+        return list(self._actor_rows.get((group_id, actor_id), {}).values())
 
-    async def list_for_group(self, *, group_id: UUID) -> List[Availability]:
-        return [r for r in self._rows if r.group_id == group_id]
+    async def list_for_group(
+        self,
+        *,
+        group_id: UUID,
+        from_date: date | None = None,
+        to_date: date | None = None,
+    ) -> List[Availability]:
+        return [
+            r
+            for r in self._rows.values()
+            if r.group_id == group_id
+            and (to_date is None or r.start_date <= to_date)
+            and (from_date is None or r.end_date >= from_date)
+        ]
+
+    async def list_available_on(self, *, group_id: UUID, day: date) -> List[Availability]:
+        return [r for r in self._rows.values() if r.group_id == group_id and r.start_date <= day <= r.end_date]
 
     async def get_by_id(self, availability_id: UUID) -> Availability | None:
-        return next((r for r in self._rows if r.id == availability_id), None)
+        return self._rows.get(availability_id)
+
+    async def delete_owned(
+        self, *, availability_id: UUID, actor_id: str, user_id: UUID | None = None
+    ) -> Availability | None:
+        record = self._rows.get(availability_id)
+        if not record or not (
+            record.actor_id == actor_id or (user_id and record.user_id and str(record.user_id) == str(user_id))
+        ):
+            return None
+        actor_rows = self._actor_rows[(record.group_id, record.actor_id)]
+        siblings = list(actor_rows.values())
+        del actor_rows[availability_id]
+        del self._rows[availability_id]
+
+        before = [(r.start_date, r.end_date) for r in siblings]
+        after = [(r.start_date, r.end_date) for r in siblings if r.id != availability_id]
+        self._apply_day_deltas(record.group_id, coverage_delta(before, after))
+        return record
+
+    async def list_day_deltas(self, *, group_id: UUID) -> List[tuple[date, int]]:
+        return sorted((day, delta) for day, delta in self._day_deltas.get(group_id, {}).items() if delta)
+
+    async def summarize_group(
+        self,
+        *,
+        group_id: UUID,
+        max_count: int,
+        from_date: date | None = None,
+        to_date: date | None = None,
+    ) -> List[tuple[date, date, int]]:
+        # Python fallback of the SQL aggregation: sweep the stored deltas.
+        deltas = await self.list_day_deltas(group_id=group_id)
+        events = window_events(
+            [(day.toordinal(), delta) for day, delta in deltas],
+            from_date.toordinal() if from_date else None,
+            to_date.toordinal() if to_date else None,
+        )
+        return [
+            (item["from"], item["to"], item["availableCount"]) for item in summarize_events(events, max_count)
+        ]
+
+    def _overlapping(self, group_id: UUID, actor_id: str, from_date: date, to_date: date) -> list[tuple[date, date]]:
+        return [
+            (r.start_date, r.end_date)
+            for r in self._actor_rows.get((group_id, actor_id), {}).values()
+            if r.start_date <= to_date and r.end_date >= from_date
+        ]
+
+    def _add_rows(self, records: Sequence[Availability]) -> None:
+        for record in records:
+            self._rows[record.id] = record
+            self._actor_rows.setdefault((record.group_id, record.actor_id), {})[record.id] = record
 
-    async def delete_for_actor(self, *, availability_id: UUID, actor_id: str) -> bool:
-        before = len(self._rows)
-        self._rows = [r for r in self._rows if not (r.id == availability_id and r.actor_id == actor_id)]
-        return len(self._rows) != before
+    def _apply_day_deltas(self, group_id: UUID, deltas: Mapping[date, int]) -> None:
+        stored = self._day_deltas.setdefault(group_id, {})
+        for day, delta in sorted(deltas.items()):
+            stored[day] = stored.get(day, 0) + delta
+            if not stored[day]:
+                del stored[day]
 
     async def commit(self) -> None:  # pragma: no cover - nothing to do
         return None
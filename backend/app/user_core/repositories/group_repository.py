@@ -1,11 +1,14 @@
 """Group repository abstractions for persistence (user core)."""
 
 from datetime import datetime
-from typing import List, Optional, Protocol, Tuple
+from typing import List, Optional, Protocol, Sequence, Tuple
 from uuid import UUID
 
-from sqlalchemy import or_, update
+from sqlalchemy import String, cast, delete, exists, func, literal, or_, true, union_all, update
+from sqlalchemy.dialects.postgresql import insert
 from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import aliased
+from sqlalchemy.orm.attributes import set_committed_value
 from sqlmodel import select
 
 from app.user_core.models import Group, GroupInvite, GroupMember, User
@@ -23,6 +26,17 @@ class GroupRepository(Protocol):
     ) -> tuple[Group, GroupMember]:
         ...
 
+    async def create_group_with_invite(
+        self,
+        group_name: str,
+        actor_id: Optional[str],
+        display_name: str,
+        invite_expires_at: datetime,
+        user_id: Optional[UUID] = None,
+    ) -> tuple[Group, GroupMember, GroupInvite]:
+        """Create a group, its owner membership and its invite (token = group id) together."""
+        ...
+
     async def get_groups(self) -> List[Group]:
         ...
 
@@ -32,6 +46,9 @@ class GroupRepository(Protocol):
     async def get_group_members(self, group_id: UUID) -> List[GroupMember]:
         ...
 
+    async def count_group_members(self, group_id: UUID) -> int:
+        ...
+
     async def delete_group(self, group_id: UUID) -> bool:
         ...
 
@@ -42,12 +59,30 @@ class GroupRepository(Protocol):
     ) -> List[Tuple[Group, GroupMember]]:
         ...
 
-    async def claim_memberships_for_user(self, actor_id: str, user_id: UUID) -> int:
+    async def list_groups_with_invites(
+        self,
+        actor_id: Optional[str] = None,
+        user_id: Optional[UUID] = None,
+    ) -> List[Tuple[Group, GroupMember, Optional[datetime]]]:
+        """Return the identity's groups with its membership and the group invite's expiry (or None)."""
+        ...
+
+    async def claim_memberships_for_user(self, actor_id: str, user_id: UUID) -> List[UUID]:
+        """Assign ``user_id`` to the actor's memberships; returns the affected group ids."""
         ...
 
     async def get_member_by_actor(self, group_id: UUID, actor_id: str) -> Optional[GroupMember]:
         ...
 
+    async def find_membership(
+        self,
+        group_id: UUID,
+        actor_id: str,
+        user_id: Optional[UUID] = None,
+    ) -> Optional[GroupMember]:
+        """Return one membership of ``actor_id`` (or ``user_id``) in the group, if any."""
+        ...
+
     async def add_member_to_group(
         self,
         group_id: UUID,
@@ -64,9 +99,37 @@ class GroupRepository(Protocol):
     async def get_invite_by_token(self, token: str) -> Optional[GroupInvite]:
         ...
 
+    async def get_invites_by_tokens(self, tokens: Sequence[str]) -> List[GroupInvite]:
+        """Return the invites for all given tokens that exist (one query)."""
+        ...
+
+    async def create_invites(self, invites: Sequence[tuple[UUID, str, datetime]]) -> List[GroupInvite]:
+        """Create ``(group_id, token, expires_at)`` invites in one insert; existing tokens are returned as-is."""
+        ...
+
     async def increment_invite_used_count(self, invite_id: UUID) -> GroupInvite:
         ...
 
+    async def join_via_invite(
+        self,
+        *,
+        group_id: UUID,
+        token: str,
+        actor_id: str,
+        user_id: Optional[UUID],
+        display_name: str,
+        expires_at: datetime,
+        now: datetime,
+    ) -> Optional[Tuple[Group, GroupInvite, Optional[GroupMember], bool]]:
+        """Join a group through its invite in one transaction.
+
+        Creates the invite (expiring at ``expires_at``) when missing, and the membership plus
+        the invite's use count bump when the actor is not a member yet and the invite has not
+        expired at ``now``. Returns ``(group, invite, member, created)`` or None when the group
+        does not exist; ``member`` is None when the invite has expired and the actor is no member.
+        """
+        ...
+
     async def commit(self) -> None:
         ...
 
@@ -77,40 +140,70 @@ class SQLModelGroupRepository(GroupRepository):
     def __init__(self, session: AsyncSession):
         self.session = session
 
-    async def create_group(
+    async def _ensure_user(self, user_id: UUID, display_name: str) -> None:
+        # Satisfy the user FK without a lookup; an existing profile is left untouched.
+        await self.session.execute(
+            insert(User)
+            .values(id=user_id, display_name=display_name, email=None, created_at=datetime.utcnow())
+            .on_conflict_do_nothing(index_elements=["id"])
+        )
+
+    async def _insert_returning(self, model, entity):
+        """INSERT one entity and build it from RETURNING (server defaults included)."""
+
+        result = await self.session.scalars(insert(model).values(entity.model_dump()).returning(model))
+        return result.one()
+
+    async def _insert_group(
         self,
         group_name: str,
         actor_id: Optional[str],
         display_name: str,
-        user_id: Optional[UUID] = None,
+        user_id: Optional[UUID],
     ) -> tuple[Group, GroupMember]:
-        creator_actor_id = actor_id or (str(user_id) if user_id else "")
         member_actor_id = actor_id or (str(user_id) if user_id else "")
-
         if user_id:
-            existing_user = await self.session.get(User, user_id)
-            if not existing_user:
-                # Ensure authenticated creators have a backing user row to satisfy FK constraints.
-                self.session.add(User(id=user_id, display_name=display_name, email=None))
-                await self.session.flush()
-        group = Group(name=group_name, created_by_actor=creator_actor_id)
-        self.session.add(group)
-        await self.session.flush()
-
-        owner = GroupMember(
-            group_id=group.id,
-            actor_id=member_actor_id,
-            user_id=user_id,
-            display_name=display_name,
-            role="owner",
+            # Ensure authenticated creators have a backing user row to satisfy FK constraints.
+            await self._ensure_user(user_id, display_name)
+        group = await self._insert_returning(Group, Group(name=group_name, created_by_actor=member_actor_id))
+        owner = await self._insert_returning(
+            GroupMember,
+            GroupMember(
+                group_id=group.id,
+                actor_id=member_actor_id,
+                user_id=user_id,
+                display_name=display_name,
+                role="owner",
+            ),
         )
-        self.session.add(owner)
+        return group, owner
 
+    async def create_group(
+        self,
+        group_name: str,
+        actor_id: Optional[str],
+        display_name: str,
+        user_id: Optional[UUID] = None,
+    ) -> tuple[Group, GroupMember]:
+        group, owner = await self._insert_group(group_name, actor_id, display_name, user_id)
         await self.session.commit()
-        await self.session.refresh(group)
-        await self.session.refresh(owner)
         return group, owner
 
+    async def create_group_with_invite(
+        self,
+        group_name: str,
+        actor_id: Optional[str],
+        display_name: str,
+        invite_expires_at: datetime,
+        user_id: Optional[UUID] = None,
+    ) -> tuple[Group, GroupMember, GroupInvite]:
+        group, owner = await self._insert_group(group_name, actor_id, display_name, user_id)
+        invite = await self._insert_returning(
+            GroupInvite, GroupInvite(group_id=group.id, token=str(group.id), expires_at=invite_expires_at)
+        )
+        await self.session.commit()
+        return group, owner, invite
+
     async def get_groups(self) -> List[Group]:
         result = await self.session.execute(select(Group))
         return list(result.scalars().all())
@@ -122,14 +215,18 @@ class SQLModelGroupRepository(GroupRepository):
         result = await self.session.execute(select(GroupMember).where(GroupMember.group_id == group_id))
         return list(result.scalars().all())
 
-    async def delete_group(self, group_id: UUID) -> bool:
-        group = await self.session.get(Group, group_id)
-        if not group:
-            return False
+    async def count_group_members(self, group_id: UUID) -> int:
+        result = await self.session.execute(
+            select(func.count()).select_from(GroupMember).where(GroupMember.group_id == group_id)
+        )
+        return result.scalar_one()
 
-        await self.session.delete(group)
+    async def delete_group(self, group_id: UUID) -> bool:
+        # Members, invites, availabilities and day deltas go with it via ON DELETE CASCADE.
+        result = await self.session.execute(delete(Group).where(Group.id == group_id).returning(Group.id))
+        deleted = result.first() is not None
         await self.session.commit()
-        return True
+        return deleted
 
     async def get_groups_for_identity(
         self,
@@ -149,10 +246,44 @@ class SQLModelGroupRepository(GroupRepository):
         result = await self.session.execute(stmt)
         return [(row[0], row[1]) for row in result.all()]
 
-    async def claim_memberships_for_user(self, actor_id: str, user_id: UUID) -> int:
-        stmt = update(GroupMember).where(GroupMember.actor_id == actor_id).values(user_id=user_id)
+    async def list_groups_with_invites(
+        self,
+        actor_id: Optional[str] = None,
+        user_id: Optional[UUID] = None,
+    ) -> List[Tuple[Group, GroupMember, Optional[datetime]]]:
+        # One branch per identity so each is served by its own index; the user branch skips rows
+        # the actor branch already returned instead of relying on UNION's sort/dedup.
+        branches = []
+        if actor_id:
+            branches.append(select(GroupMember.id).where(GroupMember.actor_id == actor_id))
+        if user_id:
+            user_branch = select(GroupMember.id).where(GroupMember.user_id == user_id)
+            if actor_id:
+                user_branch = user_branch.where(GroupMember.actor_id != actor_id)
+            branches.append(user_branch)
+        if not branches:
+            return []
+
+        matched = union_all(*branches).subquery()
+        stmt = (
+            select(Group, GroupMember, GroupInvite.expires_at)
+            .select_from(matched)
+            .join(GroupMember, GroupMember.id == matched.c.id)
+            .join(Group, Group.id == GroupMember.group_id)
+            .outerjoin(GroupInvite, GroupInvite.token == cast(Group.id, String))
+        )
+        result = await self.session.execute(stmt)
+        return [(row[0], row[1], row[2]) for row in result.all()]
+
+    async def claim_memberships_for_user(self, actor_id: str, user_id: UUID) -> List[UUID]:
+        stmt = (
+            update(GroupMember)
+            .where(GroupMember.actor_id == actor_id)
+            .values(user_id=user_id)
+            .returning(GroupMember.group_id)
+        )
         result = await self.session.execute(stmt)
-        return result.rowcount or 0
+        return list(result.scalars().all())
 
     async def get_member_by_actor(self, group_id: UUID, actor_id: str) -> Optional[GroupMember]:
         stmt = select(GroupMember).where(
@@ -162,6 +293,20 @@ class SQLModelGroupRepository(GroupRepository):
         result = await self.session.execute(stmt)
         return result.scalars().first()
 
+    async def find_membership(
+        self,
+        group_id: UUID,
+        actor_id: str,
+        user_id: Optional[UUID] = None,
+    ) -> Optional[GroupMember]:
+        # Served by the (group_id, actor_id) and (group_id, user_id) indexes; stops at the first match.
+        is_actor = GroupMember.actor_id == actor_id
+        match = or_(is_actor, GroupMember.user_id == user_id) if user_id else is_actor
+        # A user may hold several actor rows in a group: prefer the caller's own one, deterministically.
+        stmt = select(GroupMember).where(GroupMember.group_id == group_id, match).order_by(is_actor.desc()).limit(1)
+        result = await self.session.execute(stmt)
+        return result.scalars().first()
+
     async def add_member_to_group(
         self,
         group_id: UUID,
@@ -170,31 +315,26 @@ class SQLModelGroupRepository(GroupRepository):
         display_name: str,
         role: str = "member",
     ) -> GroupMember:
-        # Ensure a user row exists for the FK constraint; reuse display_name if available.
         if user_id:
-            user = await self.session.get(User, user_id)
-            if not user:
-                user = User(id=user_id, display_name=display_name, email=None)
-                self.session.add(user)
-                await self.session.flush()
-
-        member = GroupMember(
-            group_id=group_id,
-            user_id=user_id,
-            actor_id=actor_id,
-            display_name=display_name,
-            role=role,
+            await self._ensure_user(user_id, display_name)
+        member = await self._insert_returning(
+            GroupMember,
+            GroupMember(
+                group_id=group_id,
+                user_id=user_id,
+                actor_id=actor_id,
+                display_name=display_name,
+                role=role,
+            ),
         )
-        self.session.add(member)
         await self.session.commit()
-        await self.session.refresh(member)
         return member
 
     async def create_invite(self, group_id: UUID, token: str, expires_at: datetime) -> GroupInvite:
-        invite = GroupInvite(group_id=group_id, token=token, expires_at=expires_at)
-        self.session.add(invite)
+        invite = await self._insert_returning(
+            GroupInvite, GroupInvite(group_id=group_id, token=token, expires_at=expires_at)
+        )
         await self.session.commit()
-        await self.session.refresh(invite)
         return invite
 
     async def get_invite_by_token(self, token: str) -> Optional[GroupInvite]:
@@ -202,6 +342,27 @@ class SQLModelGroupRepository(GroupRepository):
         result = await self.session.execute(stmt)
         return result.scalars().first()
 
+    async def get_invites_by_tokens(self, tokens: Sequence[str]) -> List[GroupInvite]:
+        if not tokens:
+            return []
+        result = await self.session.execute(select(GroupInvite).where(GroupInvite.token.in_(list(tokens))))
+        return list(result.scalars().all())
+
+    async def create_invites(self, invites: Sequence[tuple[UUID, str, datetime]]) -> List[GroupInvite]:
+        if not invites:
+            return []
+        rows = [
+            GroupInvite(group_id=group_id, token=token, expires_at=expires_at).model_dump()
+            for group_id, token, expires_at in invites
+        ]
+        stmt = insert(GroupInvite).values(rows)
+        # A concurrent request may have created some tokens already; the no-op update returns those rows.
+        stmt = stmt.on_conflict_do_update(index_elements=["token"], set_={"token": stmt.excluded.token})
+        result = await self.session.scalars(stmt.returning(GroupInvite))
+        created = list(result.all())
+        await self.session.commit()
+        return created
+
     async def increment_invite_used_count(self, invite_id: UUID) -> GroupInvite:
         stmt = (
             update(GroupInvite)
@@ -214,6 +375,102 @@ class SQLModelGroupRepository(GroupRepository):
         updated = result.scalar_one()
         return updated
 
+    async def join_via_invite(
+        self,
+        *,
+        group_id: UUID,
+        token: str,
+        actor_id: str,
+        user_id: Optional[UUID],
+        display_name: str,
+        expires_at: datetime,
+        now: datetime,
+    ) -> Optional[Tuple[Group, GroupInvite, Optional[GroupMember], bool]]:
+        invites = GroupInvite.__table__.c
+        invite_row = GroupInvite(group_id=group_id, token=token, expires_at=expires_at)
+        invite_stmt = insert(GroupInvite).from_select(
+            ["id", "group_id", "token", "expires_at", "used_count", "created_at"],
+            select(
+                literal(invite_row.id, invites.id.type),
+                literal(group_id, invites.group_id.type),
+                literal(token, invites.token.type),
+                literal(expires_at, invites.expires_at.type),
+                literal(0, invites.used_count.type),
+                literal(invite_row.created_at, invites.created_at.type),
+            ).where(exists().where(Group.id == group_id)),
+        )
+        new_invite = invite_stmt.on_conflict_do_nothing(index_elements=["token"]).returning(*invites).cte("new_invite")
+        # The new invite, else the existing one; nothing is returned when the group is missing.
+        invite_union = union_all(
+            select(new_invite),
+            select(GroupInvite.__table__).where(invites.token == token, ~exists(select(new_invite.c.id))),
+        )
+        invite = (await self.session.scalars(select(GroupInvite).from_statement(invite_union))).first()
+        if invite is None:
+            # An invite committed concurrently is skipped by DO NOTHING but not in this snapshot yet.
+            invite = (await self.session.scalars(select(GroupInvite).where(GroupInvite.token == token))).first()
+        if invite is None:
+            await self.session.rollback()
+            return None
+
+        if user_id:
+            await self._ensure_user(user_id, display_name)
+
+        members = GroupMember.__table__.c
+        member_row = GroupMember(
+            group_id=group_id, actor_id=actor_id, user_id=user_id, display_name=display_name, role="member"
+        )
+        new_member_cte = (
+            insert(GroupMember)
+            .from_select(
+                ["id", "group_id", "actor_id", "user_id", "display_name", "role", "joined_at"],
+                select(
+                    literal(member_row.id, members.id.type),
+                    literal(group_id, members.group_id.type),
+                    literal(actor_id, members.actor_id.type),
+                    literal(user_id, members.user_id.type),
+                    literal(display_name, members.display_name.type),
+                    literal("member", members.role.type),
+                    literal(member_row.joined_at, members.joined_at.type),
+                ).where(exists().where(GroupInvite.id == invite.id, GroupInvite.expires_at > now)),
+            )
+            .on_conflict_do_nothing(index_elements=["group_id", "actor_id"])
+            .returning(*members)
+            .cte("new_member")
+        )
+        bump_cte = (
+            update(GroupInvite)
+            .where(GroupInvite.id == invite.id, exists(select(new_member_cte.c.id)))
+            .values(used_count=GroupInvite.used_count + 1)
+            .returning(GroupInvite.used_count)
+            .cte("bump")
+        )
+        new_member = aliased(GroupMember, new_member_cte, name="new_member")
+        existing_member = aliased(GroupMember, name="existing_member")
+        # CTEs and the outer query share one snapshot: existing_member never sees new_member.
+        stmt = (
+            select(Group, new_member, existing_member, bump_cte.c.used_count)
+            .select_from(Group)
+            .outerjoin(new_member, true())
+            .outerjoin(bump_cte, true())
+            .outerjoin(
+                existing_member,
+                (existing_member.group_id == Group.id) & (existing_member.actor_id == actor_id),
+            )
+            .where(Group.id == group_id)
+        )
+        group, created_member, member, used_count = (await self.session.execute(stmt)).one()
+        await self.session.commit()
+
+        if used_count is not None:
+            set_committed_value(invite, "used_count", used_count)
+        if created_member is not None:
+            return group, invite, created_member, True
+        if member is None:
+            # A concurrent join of the same actor won the insert after this statement's snapshot.
+            member = await self.get_member_by_actor(group_id, actor_id)
+        return group, invite, member, False
+
     async def commit(self) -> None:
         await self.session.commit()
 
@@ -250,6 +507,18 @@ class InMemoryGroupRepository(GroupRepository):
         self.members[owner.id] = owner
         return group, owner
 
+    async def create_group_with_invite(
+        self,
+        group_name: str,
+        actor_id: Optional[str],
+        display_name: str,
+        invite_expires_at: datetime,
+        user_id: Optional[UUID] = None,
+    ) -> tuple[Group, GroupMember, GroupInvite]:
+        group, owner = await self.create_group(group_name, actor_id, display_name, user_id=user_id)
+        invite = await self.create_invite(group.id, str(group.id), invite_expires_at)
+        return group, owner, invite
+
     async def get_groups(self) -> List[Group]:
         return list(self.groups.values())
 
@@ -259,6 +528,9 @@ class InMemoryGroupRepository(GroupRepository):
     async def get_group_members(self, group_id: UUID) -> List[GroupMember]:
         return [m for m in self.members.values() if m.group_id == group_id]
 
+    async def count_group_members(self, group_id: UUID) -> int:
+        return sum(1 for m in self.members.values() if m.group_id == group_id)
+
     async def delete_group(self, group_id: UUID) -> bool:
         if group_id not in self.groups:
             return False
@@ -285,13 +557,24 @@ class InMemoryGroupRepository(GroupRepository):
                     rows.append((group, member))
         return rows
 
-    async def claim_memberships_for_user(self, actor_id: str, user_id: UUID) -> int:
-        updated = 0
+    async def list_groups_with_invites(
+        self,
+        actor_id: Optional[str] = None,
+        user_id: Optional[UUID] = None,
+    ) -> List[Tuple[Group, GroupMember, Optional[datetime]]]:
+        if actor_id is None and user_id is None:
+            return []
+        rows = await self.get_groups_for_identity(actor_id=actor_id, user_id=user_id)
+        expiries = {token: invite.expires_at for token, invite in self.invites.items()}
+        return [(group, member, expiries.get(str(group.id))) for group, member in rows]
+
+    async def claim_memberships_for_user(self, actor_id: str, user_id: UUID) -> List[UUID]:
+        group_ids = []
         for member in self.members.values():
             if member.actor_id == actor_id:
                 member.user_id = user_id
-                updated += 1
-        return updated
+                group_ids.append(member.group_id)
+        return group_ids
 
     async def get_member_by_actor(self, group_id: UUID, actor_id: str) -> Optional[GroupMember]:
         for member in self.members.values():
@@ -299,6 +582,22 @@ class InMemoryGroupRepository(GroupRepository):
                 return member
         return None
 
+    async def find_membership(
+        self,
+        group_id: UUID,
+        actor_id: str,
+        user_id: Optional[UUID] = None,
+    ) -> Optional[GroupMember]:
+        by_user = None
+        for member in self.members.values():
+            if member.group_id != group_id:
+                continue
+            if member.actor_id == actor_id:
+                return member
+            if by_user is None and user_id and member.user_id == user_id:
+                by_user = member
+        return by_user
+
     async def add_member_to_group(
         self,
         group_id: UUID,
@@ -330,6 +629,19 @@ class InMemoryGroupRepository(GroupRepository):
     async def get_invite_by_token(self, token: str) -> Optional[GroupInvite]:
         return self.invites.get(token)
 
+    async def get_invites_by_tokens(self, tokens: Sequence[str]) -> List[GroupInvite]:
+        return [self.invites[token] for token in tokens if token in self.invites]
+
+    async def create_invites(self, invites: Sequence[tuple[UUID, str, datetime]]) -> List[GroupInvite]:
+        from uuid import uuid4
+
+        for group_id, token, expires_at in invites:
+            if token not in self.invites:
+                self.invites[token] = GroupInvite(
+                    id=uuid4(), group_id=group_id, token=token, expires_at=expires_at, used_count=0
+                )
+        return [self.invites[token] for _, token, _ in invites]
+
     async def increment_invite_used_count(self, invite_id: UUID) -> GroupInvite:
         for invite in self.invites.values():
             if invite.id == invite_id:
@@ -337,5 +649,27 @@ class InMemoryGroupRepository(GroupRepository):
                 return invite
         raise ValueError(f"Invite {invite_id} not found")
 
+    async def join_via_invite(
+        self,
+        *,
+        group_id: UUID,
+        token: str,
+        actor_id: str,
+        user_id: Optional[UUID],
+        display_name: str,
+        expires_at: datetime,
+        now: datetime,
+    ) -> Optional[Tuple[Group, GroupInvite, Optional[GroupMember], bool]]:
+        group = self.groups.get(group_id)
+        if not group:
+            return None
+        invite = self.invites.get(token) or await self.create_invite(group_id, token, expires_at)
+        existing = await self.get_member_by_actor(group_id, actor_id)
+        if existing or invite.expires_at.replace(tzinfo=None) <= now.replace(tzinfo=None):
+            return group, invite, existing, False
+        member = await self.add_member_to_group(group_id, actor_id, user_id, display_name)
+        invite.used_count += 1
+        return group, invite, member, True
+
     async def commit(self) -> None:  # pragma: no cover - no-op for in-memory
         return None
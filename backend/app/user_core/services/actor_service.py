@@ -12,12 +12,8 @@ class ActorService:
         self.repo = repo
 
     async def ensure_actor(self, actor_id: Optional[str] = None):
-        """Return an existing actor or create a new one."""
+        """Return an existing actor or create a new one (single upsert, then commit)."""
 
-        if actor_id:
-            existing = await self.repo.get(actor_id)
-            if existing:
-                return existing
         actor = await self.repo.create(actor_id)
         await self.repo.commit()
         return actor
@@ -4,14 +4,28 @@ from typing import Optional
 from uuid import UUID
 
 from app.user_core.repositories import GroupRepository, IdentityRepository
+from app.user_core.services.group_cache import (
+    GroupVersions,
+    MembershipCache,
+    group_versions,
+    membership_cache,
+)
 
 
 class AuthService:
     """Service functions for linking Supabase users with local actors."""
 
-    def __init__(self, identity_repo: IdentityRepository, group_repo: GroupRepository):
+    def __init__(
+        self,
+        identity_repo: IdentityRepository,
+        group_repo: GroupRepository,
+        versions: GroupVersions | None = None,
+        memberships: MembershipCache | None = None,
+    ):
         self.identity_repo = identity_repo
         self.group_repo = group_repo
+        self.versions = versions if versions is not None else group_versions
+        self.memberships = memberships if memberships is not None else membership_cache
 
     async def claim_actor(
         self,
@@ -24,14 +38,16 @@ class AuthService:
 
         await self.identity_repo.upsert_user(user_id=user_id, display_name=display_name, email=email)
         mapping = await self.identity_repo.record_claim(actor_id=actor_id, user_id=user_id)
-        updated = await self.group_repo.claim_memberships_for_user(actor_id=actor_id, user_id=user_id)
+        group_ids = await self.group_repo.claim_memberships_for_user(actor_id=actor_id, user_id=user_id)
 
         await self.identity_repo.commit()
         await self.group_repo.commit()
+        self.versions.bump_many(group_ids)
+        self.memberships.invalidate_groups(group_ids)
 
         return {
             "actorId": actor_id,
             "userId": str(user_id),
             "claimedAt": mapping.claimed_at,
-            "updatedMemberships": updated,
+            "updatedMemberships": len(group_ids),
         }
@@ -1,19 +1,105 @@
 """Availability service with membership checks."""
 
+from collections import Counter
 from datetime import date, timedelta
 from uuid import UUID
 
 from fastapi import HTTPException, status
 
+from app.core.config import get_settings
 from app.user_core.repositories import AvailabilityRepository, GroupRepository
+from app.user_core.availability_bitmaps import GroupBitmaps
+from app.user_core.availability_summary import best_windows, quorum_windows
+from app.user_core.services.group_cache import (
+    GroupVersions,
+    MembershipCache,
+    VersionedLRUCache,
+    group_read_cache,
+    group_versions,
+    membership_cache,
+)
+
+
+def _as_uuid(value: str) -> UUID | None:
+    try:
+        return UUID(value)
+    except ValueError:
+        return None
 
 
 class AvailabilityService:
     """Business logic for storing availabilities per user per group."""
 
-    def __init__(self, availability_repo: AvailabilityRepository, group_repo: GroupRepository):
+    def __init__(
+        self,
+        availability_repo: AvailabilityRepository,
+        group_repo: GroupRepository,
+        cache: VersionedLRUCache | None = None,
+        versions: GroupVersions | None = None,
+        memberships: MembershipCache | None = None,
+    ):
         self.availability_repo = availability_repo
         self.group_repo = group_repo
+        self.cache = cache if cache is not None else group_read_cache
+        self.versions = versions if versions is not None else group_versions
+        self.memberships = memberships if memberships is not None else membership_cache
+
+    async def _find_membership(self, group_id: UUID, actor_id: str, user_id: UUID | None):
+        return await self.memberships.get_or_load(
+            group_id, actor_id, user_id, lambda: self.group_repo.find_membership(group_id, actor_id, user_id)
+        )
+
+    async def _resolve_member(self, *, group_id: UUID, actor_id: str, user_id: UUID | None):
+        """Return the caller's membership in an existing group or raise 404/403."""
+
+        matched_member = await self._find_membership(group_id, actor_id, user_id)
+        if matched_member:
+            return matched_member
+
+        # Only a failed check has to tell a missing group (404) from a non-member (403).
+        group = await self.group_repo.get_group(group_id)
+        if not group:
+            raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Group not found")
+        raise HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail="Not a member of this group")
+
+    async def _group_bitmaps(self, group_id: UUID) -> GroupBitmaps:
+        """Per-actor day bitmaps for the group's current version, built once per version."""
+
+        cache_key = ("bitmaps", group_id, self.versions.get(group_id))
+        found, cached = self.cache.get(cache_key)
+        if found:
+            return cached[1]
+
+        built_at = self.versions.now()
+        ranges_by_actor: dict[str, list[tuple[date, date]]] = {}
+        for record in await self.availability_repo.list_for_group(group_id=group_id):
+            ranges_by_actor.setdefault(record.actor_id, []).append((record.start_date, record.end_date))
+        bitmaps = GroupBitmaps.from_ranges(ranges_by_actor)
+        # Stamped with the time the rows were read, so carried-over copies still expire.
+        self.cache.set(cache_key, (built_at, bitmaps))
+        return bitmaps
+
+    def _bump_version(self, group_id: UUID, previous: int, update_bitmaps=None) -> None:
+        """Bump the group version and carry already built bitmaps over to it when possible.
+
+        ``update_bitmaps`` applies the write to the bitmaps of ``previous``. Writes that cannot
+        express their effect (or raced with another write) leave the bitmaps to be rebuilt.
+        Bitmaps older than the version TTL are not carried either: they cannot contain writes
+        handled by other workers, so they are rebuilt from the database instead.
+        """
+
+        version = self.versions.bump(group_id)
+        if update_bitmaps is None or version != previous + 1:
+            return
+        entry = self.cache.peek(("bitmaps", group_id, previous))
+        if entry is None:
+            return
+        built_at, bitmaps = entry
+        ttl_seconds = self.versions.ttl_seconds
+        if ttl_seconds > 0 and self.versions.now() - built_at >= ttl_seconds:
+            return
+        update_bitmaps(bitmaps)
+        self.cache.set(("bitmaps", group_id, version), (built_at, bitmaps))
 
     async def add_availability(
         self,
@@ -24,60 +110,170 @@ class AvailabilityService:
         start_date: date,
         end_date: date,
     ):
-        if start_date > end_date:
-            raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="startDate must be before endDate")
+        self._check_ranges([(start_date, end_date)])
 
-        group = await self.group_repo.get_group(group_id)
-        if not group:
-            raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Group not found")
-
-        members = await self.group_repo.get_group_members(group_id)
-        matched_member = next(
-            (
-                m
-                for m in members
-                if m.actor_id == actor_id or (user_id and m.user_id and str(m.user_id) == str(user_id))
-            ),
-            None,
-        )
-
-        if not matched_member:
-            raise HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail="Not a member of this group")
-
-        actor_for_record = matched_member.actor_id
+        matched_member = await self._resolve_member(group_id=group_id, actor_id=actor_id, user_id=user_id)
+        previous = self.versions.get(group_id)
 
         record = await self.availability_repo.create_availability(
             group_id=group_id,
-            actor_id=actor_for_record,
+            actor_id=matched_member.actor_id,
             user_id=user_id,
             start_date=start_date,
             end_date=end_date,
         )
         await self.availability_repo.commit()
+        self._bump_version(
+            group_id,
+            previous,
+            lambda bitmaps: bitmaps.add_ranges(matched_member.actor_id, [(start_date, end_date)]),
+        )
         return record
 
-    async def list_for_user(self, *, actor_id: str, group_id: UUID):
-        members = await self.group_repo.get_group_members(group_id)
-        matched_member = next(
-            (m for m in members if m.actor_id == actor_id or (m.user_id and str(m.user_id) == actor_id)),
-            None,
+    async def add_availabilities(
+        self,
+        *,
+        actor_id: str,
+        user_id: UUID | None,
+        group_id: UUID,
+        ranges: list[tuple[date, date]],
+    ):
+        """Store several ranges at once: one membership check, one insert, one commit."""
+
+        self._check_ranges(ranges)
+
+        matched_member = await self._resolve_member(group_id=group_id, actor_id=actor_id, user_id=user_id)
+        previous = self.versions.get(group_id)
+
+        records = await self.availability_repo.create_many(
+            group_id=group_id,
+            actor_id=matched_member.actor_id,
+            user_id=user_id,
+            ranges=ranges,
         )
-        if not matched_member:
-            raise HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail="Not a member of this group")
-        return await self.availability_repo.list_for_actor_in_group(actor_id=matched_member.actor_id, group_id=group_id)
+        await self.availability_repo.commit()
+        self._bump_version(group_id, previous, lambda bitmaps: bitmaps.add_ranges(matched_member.actor_id, ranges))
+        return records
 
-    async def list_group_member_availabilities(self, *, group_id: UUID, actor_id: str):
-        """Return all members with their availabilities (may be empty per member)."""
+    async def replace_availabilities(
+        self,
+        *,
+        actor_id: str,
+        user_id: UUID | None,
+        group_id: UUID,
+        ranges: list[tuple[date, date]],
+    ):
+        """Make the caller's ranges in a group equal ``ranges`` with a minimal insert/delete diff."""
 
-        members = await self.group_repo.get_group_members(group_id)
-        is_member = any(
-            m.actor_id == actor_id or (m.user_id and str(m.user_id) == actor_id)
-            for m in members
+        self._check_ranges(ranges)
+
+        matched_member = await self._resolve_member(group_id=group_id, actor_id=actor_id, user_id=user_id)
+        previous = self.versions.get(group_id)
+        # Read the current ranges under the actor lock so concurrent replacements diff in turn.
+        await self.availability_repo.lock_actor(group_id=group_id, actor_id=matched_member.actor_id)
+        current = await self.availability_repo.list_for_actor_in_group(
+            actor_id=matched_member.actor_id, group_id=group_id
         )
-        if not is_member:
+
+        # Multiset diff on (start, end): unchanged rows keep their id and created_at.
+        wanted = Counter(ranges)
+        kept = []
+        delete_ids = []
+        for record in current:
+            key = (record.start_date, record.end_date)
+            if wanted[key] > 0:
+                wanted[key] -= 1
+                kept.append(record)
+            else:
+                delete_ids.append(record.id)
+        to_insert = list(wanted.elements())
+
+        if not delete_ids and not to_insert:
+            return sorted(kept, key=lambda a: a.start_date)
+
+        created = await self.availability_repo.replace_ranges_for_actor(
+            group_id=group_id,
+            actor_id=matched_member.actor_id,
+            user_id=user_id,
+            current=current,
+            delete_ids=delete_ids,
+            ranges=to_insert,
+        )
+        await self.availability_repo.commit()
+        self._bump_version(group_id, previous, lambda bitmaps: bitmaps.set_ranges(matched_member.actor_id, ranges))
+        return sorted(kept + created, key=lambda a: a.start_date)
+
+    async def list_for_user(self, *, actor_id: str, group_id: UUID):
+        matched_member = await self.ensure_member(group_id=group_id, actor_id=actor_id)
+        return await self.availability_repo.list_for_actor_in_group(actor_id=matched_member.actor_id, group_id=group_id)
+
+    @staticmethod
+    def _check_window(from_date: date | None, to_date: date | None) -> None:
+        if from_date and to_date and from_date > to_date:
+            raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="from must be before to")
+
+    @staticmethod
+    def _check_ranges(ranges: list[tuple[date, date]]) -> None:
+        if any(start_date > end_date for start_date, end_date in ranges):
+            raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="startDate must be before endDate")
+        # Bounded dates keep the per-day work of summaries, bitmaps and window searches bounded.
+        horizon = timedelta(days=get_settings().availability_horizon_days)
+        today = date.today()
+        if any(start_date < today - horizon or end_date > today + horizon for start_date, end_date in ranges):
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail=f"dates must lie within {horizon.days} days of today",
+            )
+
+    async def ensure_member(self, *, group_id: UUID, actor_id: str):
+        """Return the caller's membership, or raise 403 when ``actor_id`` is not a member.
+
+        ``actor_id`` may also carry a user id, which then matches claimed memberships.
+        """
+
+        member = await self._find_membership(group_id, actor_id, _as_uuid(actor_id))
+        if not member:
             raise HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail="Not a member of this group")
+        return member
 
-        avails = await self.availability_repo.list_for_group(group_id=group_id)
+    def read_etag(
+        self,
+        kind: str,
+        *,
+        group_id: UUID,
+        from_date: date | None = None,
+        to_date: date | None = None,
+    ) -> str:
+        """ETag of a group read; it changes whenever a write bumps the group's version."""
+
+        self._check_window(from_date, to_date)
+        return self.versions.etag(group_id, kind, from_date, to_date)
+
+    async def list_group_member_availabilities(
+        self,
+        *,
+        group_id: UUID,
+        actor_id: str,
+        from_date: date | None = None,
+        to_date: date | None = None,
+    ):
+        """Return all members with their availabilities (may be empty per member).
+
+        With ``from_date``/``to_date`` only ranges overlapping that window are returned.
+        """
+
+        self._check_window(from_date, to_date)
+
+        await self.ensure_member(group_id=group_id, actor_id=actor_id)
+
+        cache_key = ("member-availabilities", group_id, self.versions.get(group_id), from_date, to_date)
+        found, cached = self.cache.get(cache_key)
+        if found:
+            return cached
+
+        members = await self.group_repo.get_group_members(group_id)
+
+        avails = await self.availability_repo.list_for_group(group_id=group_id, from_date=from_date, to_date=to_date)
         grouped: dict[UUID | None, list] = {}
         for a in avails:
             grouped.setdefault(a.user_id, []).append(a)
@@ -97,98 +293,143 @@ class AvailabilityService:
                 }
             )
 
+        self.cache.set(cache_key, results)
         return results
 
-    async def calculate_group_availability(self, *, group_id: UUID, actor_id: str | None = None):
+    async def calculate_group_availability(
+        self,
+        *,
+        group_id: UUID,
+        actor_id: str | None = None,
+        from_date: date | None = None,
+        to_date: date | None = None,
+    ):
         """Compute overlapping availability intervals for a group (inclusive dates).
 
-        Uses a simple sweep-line to emit contiguous ranges where at least one member is available,
-        along with the number of members available in each interval.
+        Emits contiguous ranges where at least one member is available, along with the number of
+        members available in each interval. An optional window clips the intervals to
+        ``[from_date, to_date]``.
         """
 
-        members = await self.group_repo.get_group_members(group_id)
+        self._check_window(from_date, to_date)
+
         if actor_id:
-            is_member = any(m.actor_id == actor_id or (m.user_id and str(m.user_id) == actor_id) for m in members)
-            if not is_member:
-                raise HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail="Not a member of this group")
-
-        total_members = len(members)
-
-        records = await self.availability_repo.list_for_group(group_id=group_id)
-        if not records:
-            return []
-
-        # Merge per-user ranges first to avoid double-counting a member with overlapping intervals.
-        by_user: dict[str, list[tuple[date, date]]] = {}
-        for record in records:
-            by_user.setdefault(record.actor_id, []).append((record.start_date, record.end_date))
-
-        def merge_ranges(ranges: list[tuple[date, date]]) -> list[tuple[int, int]]:
-            merged: list[tuple[int, int]] = []
-            for start, end in sorted(((s.toordinal(), e.toordinal()) for s, e in ranges)):
-                if not merged:
-                    merged.append((start, end))
-                    continue
-                last_start, last_end = merged[-1]
-                # Merge overlapping or directly adjacent ranges (inclusive dates).
-                if start <= last_end + 1:
-                    merged[-1] = (last_start, max(last_end, end))
-                else:
-                    merged.append((start, end))
-            return merged
-
-        events: list[tuple[int, int]] = []
-        for user_ranges in by_user.values():
-            for start_ord, end_ord in merge_ranges(user_ranges):
-                events.append((start_ord, 1))
-                events.append((end_ord + 1, -1))
-
-        events.sort()
-
-        active = 0
-        current_start: int | None = None
-        intervals: list[dict] = []
-
-        for day_ord, delta in events:
-            if current_start is not None and day_ord > current_start and active > 0:
-                count = min(active, total_members)  # clamp to group size
-                interval = {
-                    "from": date.fromordinal(current_start),
-                    "to": date.fromordinal(day_ord - 1),
-                    "availableCount": count,
-                    "totalMembers": total_members,
-                }
-                intervals.append(interval)
-
-            active += delta
-            current_start = day_ord
-
-        # Merge adjacent intervals with the same availability count to reduce fragmentation.
-        merged: list[dict] = []
-        for interval in intervals:
-            if merged:
-                prev = merged[-1]
-                if (
-                    prev["availableCount"] == interval["availableCount"]
-                    and prev["to"] == interval["from"] - timedelta(days=1)
-                ):
-                    prev["to"] = interval["to"]
-                    continue
-            merged.append(interval)
-
-        return merged
+            await self.ensure_member(group_id=group_id, actor_id=actor_id)
 
-    async def delete_availability(self, *, availability_id: UUID, actor_id: str, user_id: UUID | None = None) -> None:
-        record = await self.availability_repo.get_by_id(availability_id)
-        if not record:
-            raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Availability not found")
-        if record.actor_id != actor_id and not (user_id and record.user_id and str(record.user_id) == str(user_id)):
-            raise HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail="Not allowed")
+        cache_key = ("summary", group_id, self.versions.get(group_id), from_date, to_date)
+        found, cached = self.cache.get(cache_key)
+        if found:
+            return cached
 
-        target_actor = actor_id if record.actor_id == actor_id else record.actor_id
-        deleted = await self.availability_repo.delete_for_actor(
-            availability_id=availability_id, actor_id=target_actor
+        total_members = await self.group_repo.count_group_members(group_id)
+
+        # Aggregated from the stored day deltas (in SQL for Postgres), so raw rows are never rescanned.
+        rows = await self.availability_repo.summarize_group(
+            group_id=group_id,
+            max_count=total_members,
+            from_date=from_date,
+            to_date=to_date,
         )
-        if not deleted:
-            raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Availability not found")
+        summary = [
+            {"from": start, "to": end, "availableCount": count, "totalMembers": total_members}
+            for start, end, count in rows
+        ]
+        self.cache.set(cache_key, summary)
+        return summary
+
+    async def list_members_available_on(self, *, group_id: UUID, actor_id: str, day: date):
+        """Return the group members with a range containing ``day``."""
+
+        await self.ensure_member(group_id=group_id, actor_id=actor_id)
+        members = await self.group_repo.get_group_members(group_id)
+
+        records = await self.availability_repo.list_available_on(group_id=group_id, day=day)
+        available_actors = {r.actor_id for r in records}
+        return [m for m in members if m.actor_id in available_actors]
+
+    async def intersect_members(
+        self,
+        *,
+        group_id: UUID,
+        actor_id: str,
+        member_actor_ids: list[str] | None = None,
+        from_date: date | None = None,
+        to_date: date | None = None,
+    ):
+        """Return the days on which all given members (default: everyone) are available."""
+
+        self._check_window(from_date, to_date)
+        await self.ensure_member(group_id=group_id, actor_id=actor_id)
+        members = await self.group_repo.get_group_members(group_id)
+
+        member_actors = {m.actor_id for m in members}
+        selected = list(dict.fromkeys(member_actor_ids)) if member_actor_ids else sorted(member_actors)
+        unknown = [a for a in selected if a not in member_actors]
+        if unknown:
+            raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Unknown group member")
+
+        bitmaps = await self._group_bitmaps(group_id)
+        common = bitmaps.intersection(selected, from_date=from_date, to_date=to_date)
+        return {
+            "actorIds": selected,
+            "commonDays": common.bit_count(),
+            "ranges": bitmaps.runs(common),
+        }
+
+    async def find_best_windows(
+        self,
+        *,
+        group_id: UUID,
+        actor_id: str,
+        length: int,
+        k: int,
+        from_date: date | None = None,
+        to_date: date | None = None,
+    ):
+        """Return up to ``k`` non-overlapping trip windows of ``length`` days inside ``[from_date, to_date]``.
+
+        The search starts today unless ``from_date`` is given and spans at most ``best_windows_max_days``.
+        """
+
+        max_days = get_settings().best_windows_max_days
+        from_date = from_date or date.today()
+        to_date = to_date or from_date + timedelta(days=max_days - 1)
+        self._check_window(from_date, to_date)
+        if (to_date - from_date).days + 1 > max_days:
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST, detail=f"window must not exceed {max_days} days"
+            )
+
+        intervals = await self.calculate_group_availability(
+            group_id=group_id, actor_id=actor_id, from_date=from_date, to_date=to_date
+        )
+        return best_windows(intervals, length=length, k=k)
+
+    async def find_quorum_windows(
+        self,
+        *,
+        group_id: UUID,
+        actor_id: str,
+        min_members: int,
+        min_days: int,
+        from_date: date | None = None,
+        to_date: date | None = None,
+    ):
+        """Return ranges of ``min_days``+ days on which at least ``min_members`` members are available."""
+
+        intervals = await self.calculate_group_availability(
+            group_id=group_id, actor_id=actor_id, from_date=from_date, to_date=to_date
+        )
+        return quorum_windows(intervals, min_members=min_members, min_days=min_days)
+
+    async def delete_availability(self, *, availability_id: UUID, actor_id: str, user_id: UUID | None = None) -> None:
+        record = await self.availability_repo.delete_owned(
+            availability_id=availability_id, actor_id=actor_id, user_id=user_id
+        )
+        if record is None:
+            # Nothing deleted: only now look the row up to tell a missing record from a foreign one.
+            if await self.availability_repo.get_by_id(availability_id) is None:
+                raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Availability not found")
+            raise HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail="Not allowed")
         await self.availability_repo.commit()
+        self.versions.bump(record.group_id)
@@ -0,0 +1,157 @@
+"""In-process group versions and a bounded LRU cache for group read models.
+
+Every write that changes what a group's read endpoints return bumps that group's version.
+Cached values are keyed by ``(kind, group_id, version, ...)``, so a bump makes older entries
+unreachable and they age out of the LRU instead of being invalidated one by one.
+
+Versions live in process memory, so a write is only seen at once by the worker that handled it.
+To bound staleness when several workers run, a group's version also advances on its own once it
+is ``group_version_ttl_seconds`` old: other workers then rebuild their entries and ETags from the
+database. ``BOOT_NONCE`` differs per process, so ETags of one worker (or of an earlier process)
+never validate against another.
+"""
+
+import hashlib
+import time
+from typing import Any, Awaitable, Callable, Hashable, Iterable, Optional
+from uuid import UUID, uuid4
+
+from app.core.cache import VersionedLRUCache
+from app.core.config import get_settings
+from app.user_core.models import GroupMember
+
+
+BOOT_NONCE = uuid4().hex
+
+
+class GroupVersions:
+    """Monotonic per-group change counters that also advance after ``ttl_seconds`` (0 = never).
+
+    Only groups written by this process get an entry. Any other group reads the number of whole
+    TTL periods since the process started, so reads of unknown group ids store nothing and still
+    expire once per period.
+    """
+
+    def __init__(self, ttl_seconds: float = 0.0, clock: Callable[[], float] = time.monotonic) -> None:
+        self.ttl_seconds = ttl_seconds
+        self.expirations = 0
+        self._clock = clock
+        self._started = clock()
+        # group_id -> (version, time the version was set)
+        self._versions: dict[UUID, tuple[int, float]] = {}
+
+    def now(self) -> float:
+        """Current time on the clock the version TTL is measured with."""
+
+        return self._clock()
+
+    def _epoch(self, now: float) -> int:
+        return int((now - self._started) // self.ttl_seconds) if self.ttl_seconds > 0 else 0
+
+    def get(self, group_id: UUID) -> int:
+        entry = self._versions.get(group_id)
+        if self.ttl_seconds <= 0:
+            return entry[0] if entry else 0
+        now = self._clock()
+        epoch = self._epoch(now)
+        if entry is None:
+            return epoch
+        version, since = entry
+        if now - since < self.ttl_seconds:
+            return version
+        # Writes handled by other workers are invisible here; expire whatever was cached.
+        self.expirations += 1
+        if epoch > version:
+            # The shared period counter has moved past this group: the entry is no longer needed.
+            del self._versions[group_id]
+            return epoch
+        self._versions[group_id] = (version + 1, now)
+        return version + 1
+
+    def bump(self, group_id: UUID) -> int:
+        # Never reset a counter (e.g. on delete): stale keys must not become reachable again.
+        version = self.get(group_id) + 1
+        self._versions[group_id] = (version, self._clock())
+        return version
+
+    def bump_many(self, group_ids: Iterable[UUID]) -> None:
+        for group_id in set(group_ids):
+            self.bump(group_id)
+
+    def stats(self) -> dict:
+        return {"groups": len(self._versions), "ttlSeconds": self.ttl_seconds, "expirations": self.expirations}
+
+    def etag(self, group_id: UUID, *parts: Hashable) -> str:
+        """Strong ETag for a group read at its current version (``parts`` distinguish the read)."""
+
+        raw = ":".join(str(part) for part in (BOOT_NONCE, group_id, self.get(group_id), *parts))
+        return '"' + hashlib.blake2b(raw.encode(), digest_size=16).hexdigest() + '"'
+
+
+class MembershipCache(VersionedLRUCache):
+    """Short-TTL LRU of membership decisions keyed by ``(group_id, actor_id, user_id)``.
+
+    Only matched members are cached: a denial is looked up again on every request, so a join
+    handled by another worker is seen at once. Writes that change memberships call
+    :meth:`invalidate_group`, which bumps a generation that is part of every key.
+    """
+
+    def __init__(self, maxsize: int, ttl_seconds: float, clock: Callable[[], float] = time.monotonic) -> None:
+        super().__init__(maxsize)
+        self.ttl_seconds = ttl_seconds
+        self.expirations = 0
+        self._clock = clock
+        self._generations: dict[UUID, int] = {}
+
+    def get(self, key: Hashable) -> tuple[bool, Any]:
+        found, entry = super().get(key)
+        if not found:
+            return False, None
+        expires_at, value = entry
+        if expires_at <= self._clock():
+            del self._entries[key]
+            self.hits -= 1
+            self.misses += 1
+            self.expirations += 1
+            return False, None
+        return True, value
+
+    async def get_or_load(
+        self,
+        group_id: UUID,
+        actor_id: str,
+        user_id: Optional[UUID],
+        load: Callable[[], Awaitable[Optional[GroupMember]]],
+    ) -> Optional[GroupMember]:
+        """Return the cached member or await ``load`` and cache a match."""
+
+        key = (group_id, self._generations.get(group_id, 0), actor_id, user_id)
+        found, member = self.get(key)
+        if found:
+            return member
+        member = await load()
+        if member is not None and self.ttl_seconds > 0:
+            self.set(key, (self._clock() + self.ttl_seconds, member))
+        return member
+
+    def invalidate_group(self, group_id: UUID) -> None:
+        self._generations[group_id] = self._generations.get(group_id, 0) + 1
+
+    def invalidate_groups(self, group_ids: Iterable[UUID]) -> None:
+        for group_id in set(group_ids):
+            self.invalidate_group(group_id)
+
+    def clear(self) -> None:
+        super().clear()
+        self.expirations = 0
+
+    def stats(self) -> dict:
+        return {**super().stats(), "ttlSeconds": self.ttl_seconds, "expirations": self.expirations}
+
+
+group_versions = GroupVersions(ttl_seconds=get_settings().group_version_ttl_seconds)
+group_read_cache = VersionedLRUCache(maxsize=get_settings().group_read_cache_size)
+membership_cache = MembershipCache(
+    maxsize=get_settings().membership_cache_size,
+    ttl_seconds=get_settings().membership_cache_ttl_seconds,
+)
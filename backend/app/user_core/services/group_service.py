@@ -1,11 +1,17 @@
 """Group service - core business logic (user core)."""
 
 from datetime import datetime, timedelta
-from typing import List, Optional, Tuple
+from typing import Dict, List, Optional, Sequence, Tuple
 from uuid import UUID
 
 from app.user_core.models import Group, GroupInvite, GroupMember
 from app.user_core.repositories import GroupRepository
+from app.user_core.services.group_cache import (
+    GroupVersions,
+    MembershipCache,
+    group_versions,
+    membership_cache,
+)
 
 
 class InviteExpiredError(Exception):
@@ -19,8 +25,15 @@ class InviteNotFoundError(Exception):
 class GroupService:
     """Service für Gruppen-Operationen über ein Repository."""
 
-    def __init__(self, repo: GroupRepository):
+    def __init__(
+        self,
+        repo: GroupRepository,
+        versions: GroupVersions | None = None,
+        memberships: MembershipCache | None = None,
+    ):
         self.repo = repo
+        self.versions = versions if versions is not None else group_versions
+        self.memberships = memberships if memberships is not None else membership_cache
 
     @staticmethod
     def _normalize_dt(value: datetime) -> datetime:
@@ -49,28 +62,52 @@ class GroupService:
     ) -> Tuple[Group, GroupMember]:
         """Create a group and optionally seed a default invite."""
 
-        group, owner = await self.repo.create_group(
+        if invite_ttl_days is not None:
+            group, owner, _ = await self.create_group_with_invite(
+                group_name=group_name,
+                actor_id=actor_id,
+                display_name=display_name,
+                user_id=user_id,
+                invite_ttl_days=invite_ttl_days,
+            )
+            return group, owner
+
+        return await self.repo.create_group(
             group_name=group_name,
             actor_id=actor_id,
             display_name=display_name,
             user_id=user_id,
         )
 
-        if invite_ttl_days is not None:
-            await self.ensure_invite_for_group(group=group, ttl_days=invite_ttl_days)
-
-        return group, owner
+    async def create_group_with_invite(
+        self,
+        group_name: str,
+        actor_id: Optional[str],
+        display_name: str,
+        invite_ttl_days: int,
+        user_id: Optional[UUID] = None,
+    ) -> Tuple[Group, GroupMember, GroupInvite]:
+        """Create a group with its owner and default invite in one transaction."""
 
-    async def ensure_invite_for_group(self, group: Group, ttl_days: int) -> GroupInvite:
-        """Return existing invite for a group or create one with the configured TTL."""
+        return await self.repo.create_group_with_invite(
+            group_name=group_name,
+            actor_id=actor_id,
+            display_name=display_name,
+            invite_expires_at=self._calculate_expiry(invite_ttl_days),
+            user_id=user_id,
+        )
 
-        token = str(group.id)
-        existing = await self.repo.get_invite_by_token(token)
-        if existing:
-            return existing
+    async def ensure_invites_for_groups(self, groups: Sequence[Group], ttl_days: int) -> Dict[UUID, GroupInvite]:
+        """Return each group's invite, creating missing ones with the configured TTL (one lookup, one insert)."""
 
-        expires_at = self._calculate_expiry(ttl_days)
-        return await self.repo.create_invite(group_id=group.id, token=token, expires_at=expires_at)
+        tokens = {str(group.id): group.id for group in groups}
+        invites = {invite.group_id: invite for invite in await self.repo.get_invites_by_tokens(list(tokens))}
+        missing = [token for token, group_id in tokens.items() if group_id not in invites]
+        if missing:
+            expires_at = self._calculate_expiry(ttl_days)
+            created = await self.repo.create_invites([(tokens[token], token, expires_at) for token in missing])
+            invites.update((invite.group_id, invite) for invite in created)
+        return invites
 
     async def get_groups(self) -> List[Group]:
         """Fetch all groups."""
@@ -86,7 +123,11 @@ class GroupService:
 
     async def delete_group(self, group_id: UUID) -> bool:
         """Delete a group (and cascading members) if it exists."""
-        return await self.repo.delete_group(group_id)
+        deleted = await self.repo.delete_group(group_id)
+        if deleted:
+            self.versions.bump(group_id)
+            self.memberships.invalidate_group(group_id)
+        return deleted
 
     async def get_groups_for_identity(
         self,
@@ -96,9 +137,35 @@ class GroupService:
         """Fetch groups for either a local actor or authenticated user."""
         return await self.repo.get_groups_for_identity(actor_id=actor_id, user_id=user_id)
 
+    async def list_groups_with_invites(
+        self,
+        ttl_days: int,
+        actor_id: Optional[str] = None,
+        user_id: Optional[UUID] = None,
+    ) -> List[Tuple[Group, GroupMember, datetime]]:
+        """Fetch the identity's groups with invite expiries in one query.
+
+        Invites are only created (in one batch) for groups that do not have one yet.
+        """
+
+        rows = await self.repo.list_groups_with_invites(actor_id=actor_id, user_id=user_id)
+        missing = [group for group, _, expires_at in rows if expires_at is None]
+        if not missing:
+            return rows
+        invites = await self.ensure_invites_for_groups(missing, ttl_days=ttl_days)
+        return [
+            (group, member, expires_at if expires_at is not None else invites[group.id].expires_at)
+            for group, member, expires_at in rows
+        ]
+
     async def claim_memberships_for_user(self, actor_id: str, user_id: UUID) -> int:
         """Assign a Supabase user to all memberships created by an actor."""
-        return await self.repo.claim_memberships_for_user(actor_id=actor_id, user_id=user_id)
+        group_ids = await self.repo.claim_memberships_for_user(actor_id=actor_id, user_id=user_id)
+        await self.repo.commit()
+        # Only after the commit, so no request re-caches the pre-claim memberships under the new version.
+        self.versions.bump_many(group_ids)
+        self.memberships.invalidate_groups(group_ids)
+        return len(group_ids)
 
     async def get_invite_preview(self, token: str, ttl_days: int) -> Tuple[Group, GroupInvite]:
         """Resolve an invite token to its group, validating expiration."""
@@ -139,23 +206,28 @@ class GroupService:
         user_id: UUID | None = None,
         invite_ttl_days: int = 7,
     ) -> Tuple[Group, GroupMember, bool, GroupInvite]:
-        """Join a group by creating a membership when missing.
+        """Join a group by creating a membership when missing (one repository transaction).
 
         Returns a tuple of (group, member, created_flag, invite).
         """
 
-        group, invite = await self.get_invite_preview(token=str(group_id), ttl_days=invite_ttl_days)
-
-        existing = await self.repo.get_member_by_actor(group_id=group.id, actor_id=actor_id)
-        if existing:
-            return group, existing, False, invite
-
-        member = await self.repo.add_member_to_group(
-            group_id=group.id,
+        result = await self.repo.join_via_invite(
+            group_id=group_id,
+            token=str(group_id),
             actor_id=actor_id,
             user_id=user_id,
             display_name=display_name,
-            role="member",
+            expires_at=self._calculate_expiry(invite_ttl_days),
+            now=self._normalize_dt(datetime.utcnow()),
         )
-        await self.repo.increment_invite_used_count(invite.id)
-        return group, member, True, invite
+        if result is None:
+            raise InviteNotFoundError("Einladung nicht gefunden")
+
+        group, invite, member, created = result
+        if not created and self.is_invite_expired(invite):
+            raise InviteExpiredError("Einladung abgelaufen")
+
+        if created:
+            self.versions.bump(group.id)
+            self.memberships.invalidate_group(group.id)
+        return group, member, created, invite
@@ -0,0 +1,234 @@
+"""Availability benchmarks against the in-memory repositories.
+
+Generates synthetic groups through the repository API, then times the service reads and the
+full ASGI routes for the availability summary and the member-availabilities list, plus the
+single-range add and delete write path. Results are written as a JSON report
+and compared with a committed baseline::
+
+    cd backend
+    python -m benchmarks.availability                      # full profile, compare with baseline
+    python -m benchmarks.availability --profile quick --output /tmp/report.json
+    python -m benchmarks.availability --write-baseline     # refresh benchmarks/baseline.json
+
+Timings are wall-clock medians in milliseconds and depend on the machine; refresh the baseline
+on the machine the comparison runs on.
+"""
+
+import argparse
+import asyncio
+import json
+import platform
+import random
+import statistics
+import sys
+import time
+from dataclasses import asdict, dataclass
+from datetime import date, datetime, timedelta, timezone
+from pathlib import Path
+from typing import Awaitable, Callable
+from uuid import uuid4
+
+from httpx import ASGITransport, AsyncClient
+
+from app.api.deps import get_availability_service
+from app.core.security import Identity, get_identity
+from app.main import app
+from app.user_core.repositories import InMemoryAvailabilityRepository, InMemoryGroupRepository
+from app.user_core.services import AvailabilityService
+from app.user_core.services.group_cache import GroupVersions, VersionedLRUCache
+
+BASELINE_PATH = Path(__file__).with_name("baseline.json")
+ORIGIN = date(2025, 1, 1)
+MAX_RANGE_DAYS = 21
+
+
+@dataclass(frozen=True)
+class Scenario:
+    name: str
+    members: int
+    max_ranges: int  # ranges per member are drawn from 1..max_ranges
+    horizon_days: int
+
+
+PROFILES: dict[str, list[Scenario]] = {
+    "quick": [
+        Scenario("10m-5r-1y", members=10, max_ranges=5, horizon_days=365),
+        Scenario("100m-20r-2y", members=100, max_ranges=20, horizon_days=730),
+    ],
+    "full": [
+        Scenario("10m-5r-1y", members=10, max_ranges=5, horizon_days=365),
+        Scenario("100m-20r-2y", members=100, max_ranges=20, horizon_days=730),
+        Scenario("1000m-50r-5y", members=1000, max_ranges=50, horizon_days=1826),
+        Scenario("5000m-50r-5y", members=5000, max_ranges=50, horizon_days=1826),
+    ],
+}
+
+
+async def seed_group(scenario: Scenario, seed: int = 0):
+    """Build in-memory repositories holding one synthetic group; returns ``(repos, group, owner_actor)``."""
+
+    rng = random.Random(seed)
+    group_repo = InMemoryGroupRepository()
+    availability_repo = InMemoryAvailabilityRepository()
+    group, owner = await group_repo.create_group(
+        group_name=scenario.name, actor_id="member-0", user_id=uuid4(), display_name="Member 0"
+    )
+    members = [owner]
+    for index in range(1, scenario.members):
+        members.append(
+            await group_repo.add_member_to_group(
+                group.id, actor_id=f"member-{index}", user_id=uuid4(), display_name=f"Member {index}"
+            )
+        )
+
+    for member in members:
+        ranges = []
+        for _ in range(rng.randint(1, scenario.max_ranges)):
+            start = rng.randrange(scenario.horizon_days)
+            end = min(start + rng.randint(0, MAX_RANGE_DAYS - 1), scenario.horizon_days - 1)
+            ranges.append((ORIGIN + timedelta(days=start), ORIGIN + timedelta(days=end)))
+        await availability_repo.create_many(
+            group_id=group.id, actor_id=member.actor_id, user_id=member.user_id, ranges=ranges
+        )
+
+    return group_repo, availability_repo, group, owner.actor_id
+
+
+async def _time(call: Callable[[], Awaitable[object]], repeat: int) -> dict:
+    timings = []
+    for _ in range(repeat):
+        started = time.perf_counter()
+        await call()
+        timings.append((time.perf_counter() - started) * 1000)
+    return {
+        "medianMs": round(statistics.median(timings), 3),
+        "minMs": round(min(timings), 3),
+        "maxMs": round(max(timings), 3),
+        "runs": repeat,
+    }
+
+
+async def bench_scenario(scenario: Scenario, repeat: int, seed: int = 0) -> dict:
+    group_repo, availability_repo, group, actor_id = await seed_group(scenario, seed=seed)
+    rows = len(await availability_repo.list_for_group(group_id=group.id))
+
+    def service() -> AvailabilityService:
+        # A zero-sized cache keeps every call on the uncached path that is being measured.
+        return AvailabilityService(
+            availability_repo, group_repo, cache=VersionedLRUCache(maxsize=0), versions=GroupVersions()
+        )
+
+    results = {
+        "rows": rows,
+        "service.calculate_group_availability": await _time(
+            lambda: service().calculate_group_availability(group_id=group.id, actor_id=actor_id), repeat
+        ),
+        "service.list_group_member_availabilities": await _time(
+            lambda: service().list_group_member_availabilities(group_id=group.id, actor_id=actor_id), repeat
+        ),
+    }
+
+    # Write path: each run adds one range for the owner, the delete runs then remove them again.
+    rng = random.Random(seed)
+    added: list = []
+
+    async def add() -> None:
+        start = ORIGIN + timedelta(days=rng.randrange(scenario.horizon_days))
+        added.append(
+            await service().add_availability(
+                actor_id=actor_id, user_id=None, group_id=group.id, start_date=start, end_date=start + timedelta(days=6)
+            )
+        )
+
+    async def delete() -> None:
+        await service().delete_availability(availability_id=added.pop().id, actor_id=actor_id)
+
+    results["service.add_availability"] = await _time(add, repeat)
+    results["service.delete_availability"] = await _time(delete, repeat)
+
+    app.dependency_overrides[get_availability_service] = service
+    app.dependency_overrides[get_identity] = lambda: Identity(user_id=None)
+    try:
+        transport = ASGITransport(app=app)
+        async with AsyncClient(transport=transport, base_url="http://bench") as client:
+            for path in ("availability-summary", "member-availabilities"):
+                url = f"/api/groups/{group.id}/{path}"
+
+                async def get(url: str = url) -> None:
+                    res = await client.get(url, headers={"X-Actor-Id": actor_id})
+                    res.raise_for_status()
+
+                results[f"GET {path}"] = await _time(get, repeat)
+    finally:
+        app.dependency_overrides.clear()
+
+    return results
+
+
+async def run_benchmarks(scenarios: list[Scenario], repeat: int, seed: int = 0) -> dict:
+    report = {
+        "meta": {
+            "createdAt": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+            "python": platform.python_version(),
+            "machine": platform.machine(),
+            "repeat": repeat,
+            "seed": seed,
+        },
+        "scenarios": {},
+    }
+    for scenario in scenarios:
+        report["scenarios"][scenario.name] = {
+            "params": asdict(scenario),
+            "results": await bench_scenario(scenario, repeat=repeat, seed=seed),
+        }
+    return report
+
+
+def compare(report: dict, baseline: dict, tolerance: float) -> list[str]:
+    """Return one message per benchmark whose median exceeds ``tolerance`` x the baseline median."""
+
+    regressions = []
+    for name, scenario in report["scenarios"].items():
+        base_results = baseline.get("scenarios", {}).get(name, {}).get("results", {})
+        for target, timing in scenario["results"].items():
+            base = base_results.get(target)
+            if not isinstance(timing, dict) or not base:
+                continue
+            if timing["medianMs"] > base["medianMs"] * tolerance:
+                regressions.append(
+                    f"{name} {target}: {timing['medianMs']:.1f} ms vs baseline {base['medianMs']:.1f} ms"
+                )
+    return regressions
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--profile", choices=sorted(PROFILES), default="full")
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--output", type=Path, help="write the JSON report to this file")
+    parser.add_argument("--baseline", type=Path, default=BASELINE_PATH)
+    parser.add_argument("--tolerance", type=float, default=1.5, help="allowed median slowdown factor")
+    parser.add_argument("--write-baseline", action="store_true", help="store the report as the new baseline")
+    args = parser.parse_args(argv)
+
+    report = asyncio.run(run_benchmarks(PROFILES[args.profile], repeat=args.repeat, seed=args.seed))
+    rendered = json.dumps(report, indent=2)
+    if args.output:
+        args.output.write_text(rendered + "\n")
+    if args.write_baseline:
+        args.baseline.write_text(rendered + "\n")
+        return 0
+    if not args.output:
+        print(rendered)
+
+    if not args.baseline.exists():
+        return 0
+    regressions = compare(report, json.loads(args.baseline.read_text()), args.tolerance)
+    for message in regressions:
+        print(f"REGRESSION {message}", file=sys.stderr)
+    return 1 if regressions else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
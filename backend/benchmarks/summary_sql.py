@@ -0,0 +1,93 @@
+"""Summary query benchmark against PostgreSQL on a long day-delta history.
+
+Seeds one group whose ``availability_day_deltas`` hold a boundary on every day of ``--years``
+years (the worst case: the table never has more than one row per group and day), then times
+``summarize_group`` unwindowed, for a 30-day window at the end of the history (whose opening
+boundary sums every earlier delta) and for a 30-day window at its start. Everything runs in one
+transaction that is rolled back. The database needs the migrations applied::
+
+    cd backend
+    python -m benchmarks.summary_sql --database-url postgresql+asyncpg://user:pw@localhost/db
+"""
+
+import argparse
+import asyncio
+import json
+import statistics
+import time
+from datetime import date, timedelta
+from uuid import uuid4
+
+from sqlalchemy import text
+from sqlalchemy.ext.asyncio import AsyncSession, create_async_engine
+
+from app.user_core.repositories import SQLModelAvailabilityRepository
+
+ORIGIN = date(2015, 1, 1)
+WINDOW_DAYS = 30
+
+
+async def _time(call, repeat: int) -> dict:
+    timings = []
+    for _ in range(repeat):
+        started = time.perf_counter()
+        await call()
+        timings.append((time.perf_counter() - started) * 1000)
+    return {"medianMs": round(statistics.median(timings), 3), "minMs": round(min(timings), 3), "runs": repeat}
+
+
+async def run(database_url: str, years: int, repeat: int) -> dict:
+    engine = create_async_engine(database_url)
+    group_id = uuid4()
+    days = years * 365
+    end = ORIGIN + timedelta(days=days - 1)
+    try:
+        async with AsyncSession(engine) as session:
+            await session.execute(
+                text("INSERT INTO groups (id, name, created_by_actor) VALUES (:id, 'bench', 'bench')"),
+                {"id": group_id},
+            )
+            # Alternating +1/-1 keeps the running sum between 0 and 1 with a boundary every day.
+            await session.execute(
+                text(
+                    """
+                    INSERT INTO availability_day_deltas (group_id, day, delta)
+                    SELECT :id, CAST(:origin AS DATE) + n, CASE WHEN n % 2 = 0 THEN 1 ELSE -1 END
+                    FROM generate_series(0, :days - 1) AS n
+                    """
+                ),
+                {"id": group_id, "origin": ORIGIN, "days": days},
+            )
+            await session.execute(text("ANALYZE availability_day_deltas"))
+            repo = SQLModelAvailabilityRepository(session)
+
+            def summary(from_date=None, to_date=None):
+                return lambda: repo.summarize_group(
+                    group_id=group_id, max_count=1, from_date=from_date, to_date=to_date
+                )
+
+            results = {
+                "deltaRows": days,
+                "full": await _time(summary(), repeat),
+                "window@end": await _time(summary(end - timedelta(days=WINDOW_DAYS - 1), end), repeat),
+                "window@start": await _time(summary(ORIGIN, ORIGIN + timedelta(days=WINDOW_DAYS - 1)), repeat),
+            }
+            await session.rollback()
+    finally:
+        await engine.dispose()
+    return results
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--database-url", required=True)
+    parser.add_argument("--years", type=int, default=10)
+    parser.add_argument("--repeat", type=int, default=20)
+    args = parser.parse_args(argv)
+
+    print(json.dumps(asyncio.run(run(args.database_url, args.years, args.repeat)), indent=2))
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
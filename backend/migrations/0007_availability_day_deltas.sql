@@ -0,0 +1,48 @@
+-- Persisted per-group availability summary as a sparse difference array.
+-- Each row is the change in available members starting on `day`, the summary is the running sum.
+CREATE TABLE IF NOT EXISTS availability_day_deltas (
+    group_id UUID NOT NULL REFERENCES groups(id) ON DELETE CASCADE,
+    day DATE NOT NULL,
+    delta INT NOT NULL DEFAULT 0,
+    PRIMARY KEY (group_id, day)
+);
+
+-- Backfill from existing rows: merge each actor's ranges first so overlaps are counted once.
+INSERT INTO availability_day_deltas (group_id, day, delta)
+SELECT group_id, day, SUM(delta)::INT
+FROM (
+    WITH ordered AS (
+        SELECT group_id,
+               actor_id,
+               start_date,
+               end_date,
+               MAX(end_date) OVER (
+                   PARTITION BY group_id, actor_id
+                   ORDER BY start_date, end_date
+                   ROWS BETWEEN UNBOUNDED PRECEDING AND 1 PRECEDING
+               ) AS prev_end
+        FROM availabilities
+    ),
+    islands AS (
+        SELECT group_id,
+               actor_id,
+               start_date,
+               end_date,
+               SUM(CASE WHEN prev_end IS NULL OR start_date > prev_end + 1 THEN 1 ELSE 0 END) OVER (
+                   PARTITION BY group_id, actor_id
+                   ORDER BY start_date, end_date
+               ) AS island
+        FROM ordered
+    ),
+    merged AS (
+        SELECT group_id, MIN(start_date) AS start_date, MAX(end_date) AS end_date
+        FROM islands
+        GROUP BY group_id, actor_id, island
+    )
+    SELECT group_id, start_date AS day, 1 AS delta FROM merged
+    UNION ALL
+    SELECT group_id, end_date + 1 AS day, -1 AS delta FROM merged
+) events
+WHERE NOT EXISTS (SELECT 1 FROM availability_day_deltas)
+GROUP BY group_id, day
+HAVING SUM(delta) <> 0;
@@ -0,0 +1,2 @@
+-- Support date-window bounded availability reads (start_date <= :to AND end_date >= :from)
+CREATE INDEX IF NOT EXISTS idx_availabilities_group_dates ON availabilities(group_id, start_date, end_date);
@@ -0,0 +1,12 @@
+-- Range-typed availability span with a GiST index for overlap (&&) and containment (@>) lookups
+-- btree_gist lets the uuid group_id share one GiST index with the daterange
+CREATE EXTENSION IF NOT EXISTS btree_gist;
+
+ALTER TABLE availabilities
+    ADD COLUMN IF NOT EXISTS span DATERANGE
+        GENERATED ALWAYS AS (daterange(start_date, end_date, '[]')) STORED;
+
+CREATE INDEX IF NOT EXISTS idx_availabilities_group_span ON availabilities USING GIST (group_id, span);
+
+-- Superseded by the GiST index for date-window reads
+DROP INDEX IF EXISTS idx_availabilities_group_dates;
@@ -0,0 +1,6 @@
+-- Indexed membership checks: (group_id, actor_id) and (group_id, user_id) lookups with LIMIT 1
+CREATE INDEX IF NOT EXISTS idx_group_members_group_actor ON group_members(group_id, actor_id);
+CREATE INDEX IF NOT EXISTS idx_group_members_group_user ON group_members(group_id, user_id);
+
+-- Superseded by the composite index with the same leading column
+DROP INDEX IF EXISTS idx_group_members_group_id;
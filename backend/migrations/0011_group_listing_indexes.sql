@@ -0,0 +1,6 @@
+-- Group listing: one index-driven UNION ALL branch per identity (actor_id, user_id)
+CREATE INDEX IF NOT EXISTS idx_group_members_actor_group ON group_members(actor_id, group_id);
+CREATE INDEX IF NOT EXISTS idx_group_members_user_group ON group_members(user_id, group_id) WHERE user_id IS NOT NULL;
+
+-- Superseded by the composite index with the same leading column
+DROP INDEX IF EXISTS idx_group_members_actor_id;
@@ -0,0 +1,12 @@
+-- One membership per actor and group, so joins can INSERT ... ON CONFLICT DO NOTHING
+-- Remove duplicates left by racing joins (keep the earliest membership)
+DELETE FROM group_members gm
+USING group_members older
+WHERE gm.group_id = older.group_id
+  AND gm.actor_id = older.actor_id
+  AND (gm.joined_at, gm.id) > (older.joined_at, older.id);
+
+CREATE UNIQUE INDEX IF NOT EXISTS uq_group_members_group_actor ON group_members(group_id, actor_id);
+
+-- Superseded by the unique index on the same columns
+DROP INDEX IF EXISTS idx_group_members_group_actor;
@@ -103,20 +103,30 @@ def _reload_app():
     from sqlalchemy.orm import sessionmaker
     from app.core.config import get_settings
     settings = get_settings()
-    database.engine = create_async_engine(settings.database_url, echo=settings.debug, connect_args={"ssl": False})
+    database.engine = create_async_engine(
+        settings.database_url,
+        echo=settings.database_echo,
+        connect_args={**database.connect_args, "ssl": False},
+        poolclass=database.MeteredQueuePool,
+    )
     database.async_session = sessionmaker(database.engine, class_=database.AsyncSession, expire_on_commit=False)
     return app_main.app
 
 
 @pytest.fixture(scope="session")
-def postgres_container() -> Iterator[PostgresContainer]:
+def postgres_container() -> Iterator[PostgresContainer | None]:
     """
     Start a PostgreSQL test container once for the entire test session.
 
     We fail fast with a clear error instead of skipping so that missing Docker
-    or broken local setup is visible in CI/local runs.
+    or broken local setup is visible in CI/local runs. With ``SYSTEM_TEST_DATABASE_URL``
+    set, no container is started and that (empty, disposable) database is used instead.
     """
 
+    if os.environ.get("SYSTEM_TEST_DATABASE_URL"):
+        yield None
+        return
+
     container: PostgresContainer | None = None
     try:
         container = PostgresContainer(
@@ -140,8 +150,9 @@ def postgres_container() -> Iterator[PostgresContainer]:
 
 
 @pytest_asyncio.fixture(scope="session")
-async def database_url(postgres_container: PostgresContainer) -> AsyncIterator[str]:
-    async_url = _to_asyncpg_url(postgres_container.get_connection_url())
+async def database_url(postgres_container: PostgresContainer | None) -> AsyncIterator[str]:
+    sync_url = os.environ.get("SYSTEM_TEST_DATABASE_URL") or postgres_container.get_connection_url()
+    async_url = _to_asyncpg_url(sync_url)
     engine: AsyncEngine = create_async_engine(async_url, future=True, connect_args={"ssl": False})
 
     async with engine.begin() as conn:
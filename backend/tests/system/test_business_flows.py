@@ -144,3 +144,40 @@ async def test_invalid_kind_validation(client, user_identity):
         json={"startDate": "2025-08-01", "endDate": "2025-08-02", "kind": "not-valid"},
     )
     assert res.status_code == 422
+
+
+async def test_claim_moves_guest_memberships_to_the_user(client, token_factory):
+    actor_id = f"guest-{uuid4()}"
+    guest_headers = {"X-Actor-Id": actor_id}
+    assert (await client.post("/api/actors", json={"actorId": actor_id})).status_code == 200
+    create_res = await client.post(
+        "/api/groups", headers=guest_headers, json={"groupName": "Claimed Trip", "displayName": "Guest"}
+    )
+    assert create_res.status_code == 200
+    group_id = create_res.json()["groupId"]
+
+    user_headers = {"Authorization": f"Bearer {token_factory(str(uuid4()))}"}
+    claim_res = await client.post("/api/auth/claim", headers=user_headers, json={"actorId": actor_id})
+    assert claim_res.status_code == 200
+    assert claim_res.json()["updatedMemberships"] == 1
+
+    groups_res = await client.get("/api/groups", headers=user_headers)
+    assert groups_res.status_code == 200
+    assert [group["groupId"] for group in groups_res.json()] == [group_id]
+
+
+async def test_find_membership_prefers_the_callers_own_row(client):
+    import app.core.database as database
+    from app.user_core.repositories import SQLModelGroupRepository
+
+    user_id = uuid4()
+    async with database.async_session() as session:
+        repo = SQLModelGroupRepository(session)
+        group, _ = await repo.create_group(group_name="Two Actors", actor_id=f"owner-{uuid4()}", display_name="Owner")
+        # The user's row and the caller's (unclaimed) actor row both match the lookup.
+        by_user = await repo.add_member_to_group(group.id, actor_id="actor-user", user_id=user_id, display_name="A")
+        by_actor = await repo.add_member_to_group(group.id, actor_id="actor-guest", user_id=None, display_name="B")
+        await session.commit()
+
+        assert (await repo.find_membership(group.id, "actor-guest", user_id)).id == by_actor.id
+        assert (await repo.find_membership(group.id, "actor-user", user_id)).id == by_user.id
@@ -0,0 +1,121 @@
+"""Persisted day deltas must match the availability rows, also under concurrent writes."""
+
+import asyncio
+from collections import Counter, defaultdict
+from datetime import date
+from uuid import UUID, uuid4
+
+import pytest
+from sqlalchemy import event, text
+
+from app.user_core.availability_summary import merge_ranges, range_events
+
+pytestmark = pytest.mark.asyncio
+
+
+async def _reconcile(group_id: str) -> None:
+    import app.core.database as database
+
+    async with database.engine.connect() as conn:
+        rows = (
+            await conn.execute(
+                text("SELECT actor_id, start_date, end_date FROM availabilities WHERE group_id = :g"),
+                {"g": UUID(group_id)},
+            )
+        ).all()
+        stored = (
+            await conn.execute(
+                text("SELECT day, delta FROM availability_day_deltas WHERE group_id = :g AND delta <> 0"),
+                {"g": UUID(group_id)},
+            )
+        ).all()
+
+    ranges_by_actor: dict[str, list[tuple[date, date]]] = defaultdict(list)
+    for actor_id, start_date, end_date in rows:
+        ranges_by_actor[actor_id].append((start_date, end_date))
+    expected: Counter[date] = Counter()
+    for ranges in ranges_by_actor.values():
+        for day_ord, delta in range_events(merge_ranges(ranges)):
+            expected[date.fromordinal(day_ord)] += delta
+
+    assert {day: delta for day, delta in stored} == {day: delta for day, delta in expected.items() if delta}
+
+
+def _range(start: str, end: str) -> dict:
+    return {"startDate": start, "endDate": end}
+
+
+async def test_concurrent_overlapping_writes_keep_day_deltas_exact(client, token_factory):
+    owner_headers = {"Authorization": f"Bearer {token_factory(str(uuid4()))}"}
+    create_res = await client.post(
+        "/api/groups", headers=owner_headers, json={"groupName": "Race Trip", "displayName": "Owner"}
+    )
+    assert create_res.status_code == 200
+    group_id = create_res.json()["groupId"]
+    base = f"/api/groups/{group_id}/availabilities"
+
+    # Same actor, overlapping ranges, all in flight at once.
+    results = await asyncio.gather(
+        *(
+            client.post(base, headers=owner_headers, json=_range(f"2025-07-{day:02d}", f"2025-07-{day + 5:02d}"))
+            for day in range(1, 11)
+        ),
+        client.post(
+            f"{base}/batch",
+            headers=owner_headers,
+            json={"ranges": [_range("2025-07-03", "2025-07-20"), _range("2025-08-01", "2025-08-02")]},
+        ),
+    )
+    assert all(res.status_code == 200 for res in results)
+    await _reconcile(group_id)
+
+    # Concurrent full replacements interleaved with deletes of the same actor's rows.
+    ids = [res.json()["id"] for res in results[:4]]
+    results = await asyncio.gather(
+        client.put(f"{base}/mine", headers=owner_headers, json={"ranges": [_range("2025-07-05", "2025-07-09")]}),
+        client.put(f"{base}/mine", headers=owner_headers, json={"ranges": [_range("2025-07-07", "2025-07-15")]}),
+        *(client.delete(f"/api/availabilities/{availability_id}", headers=owner_headers) for availability_id in ids),
+    )
+    assert all(res.status_code in (200, 204, 404) for res in results)
+    await _reconcile(group_id)
+
+
+async def test_day_delta_rows_are_upserted_in_day_order(client, token_factory):
+    import app.core.database as database
+
+    owner_headers = {"Authorization": f"Bearer {token_factory(str(uuid4()))}"}
+    create_res = await client.post(
+        "/api/groups", headers=owner_headers, json={"groupName": "Lock Order", "displayName": "Owner"}
+    )
+    assert create_res.status_code == 200
+    group_id = create_res.json()["groupId"]
+    base = f"/api/groups/{group_id}/availabilities"
+    batch_res = await client.post(
+        f"{base}/batch",
+        headers=owner_headers,
+        json={"ranges": [_range("2025-09-01", "2025-09-20"), _range("2025-09-15", "2025-09-25")]},
+    )
+    assert batch_res.status_code == 200
+
+    upserted_days: list[list[date]] = []
+
+    def _record(conn, cursor, statement, parameters, context, executemany):
+        if statement.startswith("INSERT INTO availability_day_deltas"):
+            upserted_days.append([value for value in parameters if isinstance(value, date)])
+
+    # Deleting [09-01, 09-20] next to the kept [09-15, 09-25] changes 09-15 and 09-01. Writers of
+    # other actors lock the same rows, so every writer has to lock them in ascending day order.
+    event.listen(database.engine.sync_engine, "before_cursor_execute", _record)
+    try:
+        first_id = batch_res.json()[0]["id"]
+        assert (await client.delete(f"/api/availabilities/{first_id}", headers=owner_headers)).status_code == 204
+        add_res = await client.post(base, headers=owner_headers, json=_range("2025-08-20", "2025-09-30"))
+        assert add_res.status_code == 200
+    finally:
+        event.remove(database.engine.sync_engine, "before_cursor_execute", _record)
+
+    assert upserted_days == [
+        [date(2025, 9, 1), date(2025, 9, 15)],
+        [date(2025, 8, 20), date(2025, 9, 15), date(2025, 9, 26), date(2025, 10, 1)],
+    ]
+    await _reconcile(group_id)
@@ -1,6 +1,8 @@
 """End-to-end happy path using the real database container."""
 
 from datetime import date
+from uuid import uuid4
+
 import pytest
 
 pytestmark = pytest.mark.asyncio
@@ -52,3 +54,77 @@ async def test_group_user_availability_flow(client, user_identity):
     assert groups_res.status_code == 200
     groups = groups_res.json()
     assert any(g["groupId"] == group_id for g in groups)
+
+
+async def test_group_availability_summary_is_aggregated_in_postgres(client, user_identity, token_factory):
+    create_group_res = await client.post(
+        "/api/groups",
+        headers=user_identity["headers"],
+        json={"groupName": "Summary Trip", "displayName": "Owner"},
+    )
+    assert create_group_res.status_code == 200
+    group_id = create_group_res.json()["groupId"]
+
+    other_headers = {"Authorization": f"Bearer {token_factory(str(uuid4()))}"}
+    join_res = await client.post(f"/api/groups/{group_id}/join", headers=other_headers)
+    assert join_res.status_code == 200
+
+    # Overlapping ranges of the same member must only be counted once.
+    owner_batch = {
+        "ranges": [
+            {"startDate": "2025-01-01", "endDate": "2025-01-05"},
+            {"startDate": "2025-01-04", "endDate": "2025-01-06"},
+        ]
+    }
+    batch_res = await client.post(
+        f"/api/groups/{group_id}/availabilities/batch", headers=user_identity["headers"], json=owner_batch
+    )
+    assert batch_res.status_code == 200
+
+    member_res = await client.post(
+        f"/api/groups/{group_id}/availabilities",
+        headers=other_headers,
+        json={"startDate": "2025-01-03", "endDate": "2025-01-10"},
+    )
+    assert member_res.status_code == 200
+
+    summary_res = await client.get(f"/api/groups/{group_id}/availability-summary", headers=user_identity["headers"])
+    assert summary_res.status_code == 200
+    assert summary_res.json() == [
+        {"from": "2025-01-01", "to": "2025-01-02", "availableCount": 1, "totalMembers": 2},
+        {"from": "2025-01-03", "to": "2025-01-06", "availableCount": 2, "totalMembers": 2},
+        {"from": "2025-01-07", "to": "2025-01-10", "availableCount": 1, "totalMembers": 2},
+    ]
+
+    windowed_res = await client.get(
+        f"/api/groups/{group_id}/availability-summary",
+        headers=user_identity["headers"],
+        params={"from": "2025-01-02", "to": "2025-01-08"},
+    )
+    assert windowed_res.json() == [
+        {"from": "2025-01-02", "to": "2025-01-02", "availableCount": 1, "totalMembers": 2},
+        {"from": "2025-01-03", "to": "2025-01-06", "availableCount": 2, "totalMembers": 2},
+        {"from": "2025-01-07", "to": "2025-01-08", "availableCount": 1, "totalMembers": 2},
+    ]
+
+    on_day_res = await client.get(
+        f"/api/groups/{group_id}/available-on", headers=user_identity["headers"], params={"day": "2025-01-08"}
+    )
+    assert on_day_res.status_code == 200
+    assert [m["role"] for m in on_day_res.json()] == ["member"]
+
+    members_res = await client.get(
+        f"/api/groups/{group_id}/member-availabilities",
+        headers=user_identity["headers"],
+        params={"from": "2025-01-07"},
+    )
+    assert members_res.status_code == 200
+    assert {m["role"]: len(m["availabilities"]) for m in members_res.json()} == {"owner": 0, "member": 1}
+
+    delete_res = await client.delete(f"/api/availabilities/{member_res.json()['id']}", headers=other_headers)
+    assert delete_res.status_code == 204
+
+    after_res = await client.get(f"/api/groups/{group_id}/availability-summary", headers=user_identity["headers"])
+    assert after_res.json() == [
+        {"from": "2025-01-01", "to": "2025-01-06", "availableCount": 1, "totalMembers": 2},
+    ]
@@ -1,8 +1,10 @@
 """System test for invite-based join flow using real Postgres container."""
 
-from uuid import uuid4
+import asyncio
+from uuid import UUID, uuid4
 
 import pytest
+from sqlalchemy import text
 
 pytestmark = pytest.mark.asyncio
 
@@ -47,3 +49,50 @@ async def test_invite_full_flow(client, token_factory):
     repeat = await client.post(f"/api/groups/{group_id}/join", headers=guest_headers)
     assert repeat.status_code == 200
     assert repeat.json()["alreadyMember"] is True
+
+
+async def test_concurrent_joins_of_the_same_actor_all_succeed(client, token_factory):
+    import app.core.database as database
+
+    owner_headers = {"Authorization": f"Bearer {token_factory(str(uuid4()))}"}
+    create_res = await client.post(
+        "/api/groups", headers=owner_headers, json={"groupName": "Race Join", "displayName": "Owner"}
+    )
+    assert create_res.status_code == 200
+    group_id = create_res.json()["groupId"]
+    join_url = f"/api/groups/{group_id}/join"
+
+    # Open the pool's connections first, otherwise connecting staggers the joins too far to overlap.
+    async def hold_connection():
+        async with database.engine.connect() as conn:
+            await conn.execute(text("SELECT pg_sleep(0.05)"))
+
+    await asyncio.gather(*(hold_connection() for _ in range(6)))
+
+    # Anonymous actors: a signed-in user's joins would queue behind each other on the users upsert.
+    guest_headers = {"X-Actor-Id": f"guest-{uuid4()}"}
+    results = await asyncio.gather(*(client.post(join_url, headers=guest_headers) for _ in range(6)))
+    assert [res.status_code for res in results] == [200] * 6
+    assert all(res.json()["role"] == "member" for res in results)
+    assert [res.json()["alreadyMember"] for res in results].count(False) == 1
+
+    # Without an invite row the joins also race on creating the invite.
+    async with database.engine.begin() as conn:
+        await conn.execute(text("DELETE FROM group_invites WHERE group_id = :g"), {"g": UUID(group_id)})
+    results = await asyncio.gather(
+        *(client.post(join_url, headers={"X-Actor-Id": f"guest-{uuid4()}"}) for _ in range(3))
+    )
+    assert [res.status_code for res in results] == [200] * 3
+
+    async with database.engine.connect() as conn:
+        members, invites, used = (
+            await conn.execute(
+                text(
+                    "SELECT (SELECT count(*) FROM group_members WHERE group_id = :g),"
+                    " (SELECT count(*) FROM group_invites WHERE group_id = :g),"
+                    " (SELECT max(used_count) FROM group_invites WHERE group_id = :g)"
+                ),
+                {"g": UUID(group_id)},
+            )
+        ).one()
+    assert (members, invites, used) == (5, 1, 3)
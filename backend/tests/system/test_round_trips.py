@@ -0,0 +1,139 @@
+"""Statement budgets for the hot write endpoints against real Postgres."""
+
+import asyncio
+from contextlib import contextmanager
+from uuid import uuid4
+
+import pytest
+from sqlalchemy import event
+
+pytestmark = pytest.mark.asyncio
+
+
+@contextmanager
+def count_statements():
+    import app.core.database as database
+
+    statements: list[str] = []
+
+    def _record(conn, cursor, statement, parameters, context, executemany):
+        statements.append(statement)
+
+    sync_engine = database.engine.sync_engine
+    event.listen(sync_engine, "before_cursor_execute", _record)
+    try:
+        yield statements
+    finally:
+        event.remove(sync_engine, "before_cursor_execute", _record)
+
+
+async def test_write_paths_stay_within_statement_budget(client, token_factory):
+    owner_id = str(uuid4())
+    owner_headers = {"Authorization": f"Bearer {token_factory(owner_id)}"}
+
+    # Warm up the pool so dialect initialisation queries are not counted.
+    warmup = await client.get("/api/groups", headers=owner_headers)
+    assert warmup.status_code == 200
+
+    with count_statements() as statements:
+        create_res = await client.post(
+            "/api/groups",
+            headers=owner_headers,
+            json={"groupName": "Budget Trip", "displayName": "Owner"},
+        )
+    assert create_res.status_code == 200
+    # users upsert, groups, group_members and group_invites inserts
+    assert len(statements) <= 4, statements
+    group_id = create_res.json()["groupId"]
+
+    guest_id = str(uuid4())
+    guest_headers = {"Authorization": f"Bearer {token_factory(guest_id)}"}
+    with count_statements() as statements:
+        join_res = await client.post(f"/api/groups/{group_id}/join", headers=guest_headers)
+    assert join_res.status_code == 200
+    assert join_res.json()["alreadyMember"] is False
+    # invite insert-or-select, users upsert, member insert + used_count bump + group select
+    assert len(statements) <= 3, statements
+
+    with count_statements() as statements:
+        add_res = await client.post(
+            f"/api/groups/{group_id}/availabilities",
+            headers=guest_headers,
+            json={"startDate": "2025-06-01", "endDate": "2025-06-03"},
+        )
+    assert add_res.status_code == 200
+    # membership lookup, actor lock, overlapping ranges, insert, day-count upsert and cleanup
+    assert len(statements) <= 6, statements
+    availability_id = add_res.json()["id"]
+
+    with count_statements() as statements:
+        del_res = await client.delete(f"/api/availabilities/{availability_id}", headers=guest_headers)
+    assert del_res.status_code == 204
+    # owner-filtered actor lock, DELETE ... RETURNING with the overlapping ranges, day-count upsert and cleanup
+    assert len(statements) <= 4, statements
+
+    with count_statements() as statements:
+        batch_res = await client.post(
+            f"/api/groups/{group_id}/availabilities/batch",
+            headers=guest_headers,
+            json={
+                "ranges": [
+                    {"startDate": "2025-07-01", "endDate": "2025-07-03"},
+                    {"startDate": "2025-07-10", "endDate": "2025-07-12"},
+                ]
+            },
+        )
+    assert batch_res.status_code == 200
+    # actor lock, overlapping ranges, one multi-row insert, day-count upsert and cleanup (membership is cached)
+    assert len(statements) <= 5, statements
+
+    with count_statements() as statements:
+        put_res = await client.put(
+            f"/api/groups/{group_id}/availabilities/mine",
+            headers=guest_headers,
+            json={"ranges": [{"startDate": "2025-07-02", "endDate": "2025-07-12"}]},
+        )
+    assert put_res.status_code == 200
+    # actor lock, the actor's ranges, one delete, one multi-row insert, day-count upsert and cleanup
+    assert len(statements) <= 6, statements
+
+    with count_statements() as statements:
+        del_group = await client.delete(f"/api/groups/{group_id}", headers=owner_headers)
+    assert del_group.status_code == 204
+    # one DELETE; members, invites and day counts follow via ON DELETE CASCADE
+    assert len(statements) == 1, statements
+
+
+async def test_actor_bootstrap_is_one_idempotent_statement(client):
+    actor_id = f"guest-{uuid4()}"
+    warmup = await client.post("/api/actors", json={})
+    assert warmup.status_code == 200
+
+    with count_statements() as statements:
+        first = await client.post("/api/actors", json={"actorId": actor_id})
+    assert first.status_code == 200
+    assert len(statements) == 1, statements
+
+    # Concurrent bootstraps of the same id must not race into an integrity error.
+    results = await asyncio.gather(*(client.post("/api/actors", json={"actorId": actor_id}) for _ in range(5)))
+    assert all(res.status_code == 200 for res in results)
+    assert {res.json()["createdAt"] for res in results} == {first.json()["createdAt"]}
+
+
+async def test_claim_stays_within_statement_budget(client, token_factory):
+    actor_id = f"guest-{uuid4()}"
+    guest_headers = {"X-Actor-Id": actor_id}
+    assert (await client.post("/api/actors", json={"actorId": actor_id})).status_code == 200
+    for name in ("Claim One", "Claim Two"):
+        create_res = await client.post(
+            "/api/groups", headers=guest_headers, json={"groupName": name, "displayName": "Guest"}
+        )
+        assert create_res.status_code == 200
+
+    user_headers = {"Authorization": f"Bearer {token_factory(str(uuid4()))}"}
+    with count_statements() as statements:
+        claim_res = await client.post("/api/auth/claim", headers=user_headers, json={"actorId": actor_id})
+    assert claim_res.status_code == 200
+    assert claim_res.json()["updatedMemberships"] == 2
+    # user select + insert, actor-claim select + insert, one UPDATE ... RETURNING for every membership
+    assert len(statements) <= 5, statements
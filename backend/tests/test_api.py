@@ -1,7 +1,7 @@
 """API tests with mocked persistence (no real database)."""
 
 from datetime import datetime, timedelta
-from uuid import uuid4
+from uuid import UUID, uuid4
 
 import pytest
 import pytest_asyncio
@@ -88,6 +88,41 @@ async def test_guest_can_create_and_list_group_with_actor_header():
         assert any(g["groupId"] == group_id for g in list_res.json())
 
 
+@pytest.mark.asyncio
+async def test_group_list_batches_invite_lookup_and_creation(fake_group_repo):
+    service = GroupService(fake_group_repo)
+    actor_id = "guest-actor-batch"
+    with_invite, _ = await service.create_group("A", actor_id=actor_id, display_name="Guest", invite_ttl_days=7)
+    without_invites = [
+        (await service.create_group(name, actor_id=actor_id, display_name="Guest"))[0] for name in ("B", "C")
+    ]
+
+    calls = []
+    for name in ("get_invite_by_token", "get_invites_by_tokens", "create_invite", "create_invites"):
+        original = getattr(fake_group_repo, name)
+
+        async def recorded(*args, _name=name, _original=original, **kwargs):
+            calls.append(_name)
+            return await _original(*args, **kwargs)
+
+        setattr(fake_group_repo, name, recorded)
+
+    transport = ASGITransport(app=app)
+    async with AsyncClient(transport=transport, base_url="http://test") as client:
+        list_res = await client.get("/api/groups", headers={"X-Actor-Id": actor_id})
+
+    assert list_res.status_code == 200
+    assert {g["groupId"] for g in list_res.json()} == {str(g.id) for g in [with_invite, *without_invites]}
+    assert calls == ["get_invites_by_tokens", "create_invites"]
+    assert all(str(g.id) in fake_group_repo.invites for g in without_invites)
+
+    calls.clear()
+    async with AsyncClient(transport=transport, base_url="http://test") as client:
+        again = await client.get("/api/groups", headers={"X-Actor-Id": actor_id})
+    assert again.json() == list_res.json()
+    assert calls == []  # invite expiries come with the group listing once every invite exists
+
+
 @pytest.mark.asyncio
 async def test_create_group():
     transport = ASGITransport(app=app)
@@ -222,6 +257,9 @@ async def test_join_rejects_expired_invite(fake_group_repo):
         assert join_res.status_code == 410
         assert join_res.json()["detail"] == "Einladung abgelaufen"
 
+    assert len(await fake_group_repo.get_group_members(UUID(group_id))) == 1
+    assert invite.used_count == 0
+
 
 @pytest.mark.asyncio
 async def test_invite_used_count_increments(fake_group_repo):
@@ -249,4 +287,14 @@ async def test_invite_used_count_increments(fake_group_repo):
 
         invite_again = await fake_group_repo.get_invite_by_token(str(group_id))
         assert invite_again is not None
-        assert invite_again.used_count == 1
\ No newline at end of file
+        assert invite_again.used_count == 1
+
+@pytest.mark.asyncio
+async def test_join_of_unknown_group_returns_404_without_creating_an_invite(fake_group_repo):
+    transport = ASGITransport(app=app)
+    async with AsyncClient(transport=transport, base_url="http://test") as client:
+        guest_headers, _ = _auth_headers(display_name="Guest")
+        join_res = await client.post(f"/api/groups/{uuid4()}/join", headers=guest_headers)
+
+    assert join_res.status_code == 404
+    assert fake_group_repo.invites == {}
@@ -4,10 +4,12 @@ from uuid import uuid4
 
 import pytest
 import pytest_asyncio
+from fastapi import HTTPException
 from httpx import ASGITransport, AsyncClient
 from jose import jwt
 
 from app.api.deps import get_actor_service, get_auth_service, get_group_service
+from app.core import security
 from app.core.config import get_settings
 from app.main import app
 from app.user_core.repositories import (
@@ -114,3 +116,64 @@ async def test_create_actor_endpoint_generates_and_reuses_id(fake_actor_repo):
 		assert reuse_res.json()["actorId"] == actor_id
 
 	assert len(fake_actor_repo._actors) == 1
+
+
+@pytest.mark.asyncio
+async def test_get_identity_reuses_verified_claims_until_exp(monkeypatch):
+	cache = security.VerifiedTokenCache(maxsize=8, ttl_seconds=300)
+	monkeypatch.setattr(security, "verified_tokens", cache)
+	decoded = []
+	decode = security.decode_supabase_token
+
+	async def counting_decode(token):
+		decoded.append(token)
+		return await decode(token)
+
+	monkeypatch.setattr(security, "decode_supabase_token", counting_decode)
+
+	headers, user_id = _auth_headers()
+	first = await security.get_identity(headers["Authorization"])
+	second = await security.get_identity(headers["Authorization"])
+	assert first.user_id == second.user_id == user_id
+	assert len(decoded) == 1
+	assert (cache.hits, cache.misses) == (1, 1)
+
+	expired = jwt.encode({"sub": user_id, "exp": 1}, settings.supabase_jwt_secret, algorithm="HS256")
+	cache.set(expired, {"sub": user_id, "exp": 1})
+	with pytest.raises(HTTPException) as rejected:
+		await security.get_identity(f"Bearer {expired}")
+	assert rejected.value.status_code == 401
+	assert cache.stats()["expirations"] == 1
+
+
+@pytest.mark.asyncio
+async def test_hs256_verification_tries_the_remembered_secret_first(monkeypatch):
+	selector = security.SecretSelector()
+	monkeypatch.setattr(security, "hs256_secrets", selector)
+	monkeypatch.setattr(get_settings(), "supabase_public_key", "public-key")
+	monkeypatch.setattr(get_settings(), "supabase_anon_key", "anon-key")
+	claims = {"sub": str(uuid4()), "iss": "https://example.supabase.co/auth/v1"}
+	token = jwt.encode(claims, "anon-key", algorithm="HS256")
+
+	assert (await security.decode_supabase_token(token))["sub"] == claims["sub"]
+	assert (await security.decode_supabase_token(token))["sub"] == claims["sub"]
+	assert selector.attempts == {3: 1, 1: 1}
+	assert selector.first_try_hits == 1
+
+	forged = jwt.encode(claims, "wrong-secret", algorithm="HS256")
+	with pytest.raises(HTTPException):
+		await security.decode_supabase_token(forged)
+	assert selector.attempts[3] == 2  # a remembered secret never stops the others being tried
+
+	# Same issuer, signed with the last configured secret: still verified, then remembered.
+	monkeypatch.setattr(get_settings(), "supabase_service_key", "service-key")
+	rotated = jwt.encode(claims, "service-key", algorithm="HS256")
+	assert (await security.decode_supabase_token(rotated))["sub"] == claims["sub"]
+	assert selector.attempts[4] == 1
+	monkeypatch.setattr(get_settings(), "supabase_service_key", None)
+	assert (await security.decode_supabase_token(token))["sub"] == claims["sub"]
+
+	expired = jwt.encode({**claims, "exp": 1}, "anon-key", algorithm="HS256")
+	with pytest.raises(HTTPException):
+		await security.decode_supabase_token(expired)
+	assert selector.attempts[1] == 2
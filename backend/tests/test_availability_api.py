@@ -21,6 +21,7 @@ from app.user_core.services import AvailabilityService, GroupService
 
 
 USER_ID = "11111111-2222-3333-4444-555555555555"
+OTHER_USER = UUID("33333333-4444-5555-6666-777777777777")
 
 
 @pytest_asyncio.fixture()
@@ -44,6 +45,45 @@ async def overrides(fake_group_repo, fake_availability_repo):
     app.dependency_overrides.clear()
 
 
+async def _create_two_member_group(group_repo, availability_repo, *, name, owner_range, member_range):
+    """Group owned by ``USER_ID`` with ``OTHER_USER`` as member, each with one availability range."""
+
+    group, _ = await GroupService(group_repo).create_group(
+        group_name=name,
+        actor_id=None,
+        display_name="Owner",
+        user_id=UUID(USER_ID),
+    )
+    await group_repo.add_member_to_group(
+        group.id,
+        actor_id=str(OTHER_USER),
+        user_id=OTHER_USER,
+        display_name="Member",
+    )
+    for user, (start_date, end_date) in ((UUID(USER_ID), owner_range), (OTHER_USER, member_range)):
+        await availability_repo.create_availability(
+            group_id=group.id,
+            actor_id=str(user),
+            user_id=user,
+            start_date=start_date,
+            end_date=end_date,
+        )
+    return group
+
+
+@pytest_asyncio.fixture()
+async def two_member_group(fake_group_repo, fake_availability_repo):
+    """Owner free 2025-01-01..20, the second member 2025-01-10..14."""
+
+    return await _create_two_member_group(
+        fake_group_repo,
+        fake_availability_repo,
+        name="Window Trip",
+        owner_range=(date(2025, 1, 1), date(2025, 1, 20)),
+        member_range=(date(2025, 1, 10), date(2025, 1, 14)),
+    )
+
+
 @pytest.mark.asyncio
 async def test_add_and_list_availability(fake_group_repo):
     service = GroupService(fake_group_repo)
@@ -89,35 +129,12 @@ async def test_availability_requires_membership(fake_group_repo):
 
 @pytest.mark.asyncio
 async def test_availability_summary_endpoint(fake_group_repo, fake_availability_repo):
-    group_service = GroupService(fake_group_repo)
-    group, owner = await group_service.create_group(
-        group_name="Summary Trip",
-        actor_id=None,
-        display_name="Owner",
-        user_id=UUID(USER_ID),
-    )
-
-    other_user = UUID("33333333-4444-5555-6666-777777777777")
-    await fake_group_repo.add_member_to_group(
-        group.id,
-        actor_id=str(other_user),
-        user_id=other_user,
-        display_name="Member",
-    )
-    await fake_availability_repo.create_availability(
-        group_id=group.id,
-        actor_id=str(other_user),
-        user_id=other_user,
-        start_date=date(2025, 1, 2),
-        end_date=date(2025, 1, 4),
-    )
-
-    await fake_availability_repo.create_availability(
-        group_id=group.id,
-        actor_id=str(USER_ID),
-        user_id=UUID(USER_ID),
-        start_date=date(2025, 1, 1),
-        end_date=date(2025, 1, 3),
+    group = await _create_two_member_group(
+        fake_group_repo,
+        fake_availability_repo,
+        name="Summary Trip",
+        owner_range=(date(2025, 1, 1), date(2025, 1, 3)),
+        member_range=(date(2025, 1, 2), date(2025, 1, 4)),
     )
 
     transport = ASGITransport(app=app)
@@ -130,3 +147,145 @@ async def test_availability_summary_endpoint(fake_group_repo, fake_availability_
             {"from": "2025-01-02", "to": "2025-01-03", "availableCount": 2, "totalMembers": 2},
             {"from": "2025-01-04", "to": "2025-01-04", "availableCount": 1, "totalMembers": 2},
         ]
+
+        windowed = await client.get(
+            f"/api/groups/{group.id}/availability-summary", params={"from": "2025-01-02", "to": "2025-01-02"}
+        )
+        assert windowed.status_code == 200
+        assert windowed.json() == [
+            {"from": "2025-01-02", "to": "2025-01-02", "availableCount": 2, "totalMembers": 2},
+        ]
+
+        members = await client.get(f"/api/groups/{group.id}/member-availabilities", params={"from": "2025-01-04"})
+        assert members.status_code == 200
+        assert {m["userId"]: len(m["availabilities"]) for m in members.json()} == {USER_ID: 0, str(OTHER_USER): 1}
+
+        on_day = await client.get(f"/api/groups/{group.id}/available-on", params={"day": "2025-01-04"})
+        assert on_day.status_code == 200
+        assert [m["userId"] for m in on_day.json()] == [str(OTHER_USER)]
+
+        inverted = await client.get(
+            f"/api/groups/{group.id}/availability-summary", params={"from": "2025-01-05", "to": "2025-01-01"}
+        )
+        assert inverted.status_code == 400
+
+
+@pytest.mark.asyncio
+async def test_best_windows_endpoint(two_member_group):
+    group = two_member_group
+
+    transport = ASGITransport(app=app)
+    async with AsyncClient(transport=transport, base_url="http://test") as client:
+        res = await client.get(
+            f"/api/groups/{group.id}/best-windows", params={"length": 3, "k": 2, "from": "2025-01-01"}
+        )
+        assert res.status_code == 200
+        items = res.json()
+        assert items == [
+            {"from": "2025-01-10", "to": "2025-01-12", "minAvailable": 2, "averageAvailable": 2.0, "totalMembers": 2},
+            {"from": "2025-01-13", "to": "2025-01-15", "minAvailable": 1, "averageAvailable": 1.67, "totalMembers": 2},
+        ]
+
+        bad = await client.get(f"/api/groups/{group.id}/best-windows", params={"length": 0})
+        assert bad.status_code == 422
+
+        # The search window is clipped and capped, so it no longer depends on the stored history.
+        clipped = await client.get(
+            f"/api/groups/{group.id}/best-windows",
+            params={"length": 3, "from": "2025-01-12", "to": "2025-01-20"},
+        )
+        assert [item["from"] for item in clipped.json()] == ["2025-01-12", "2025-01-15", "2025-01-18"]
+        too_long = await client.get(
+            f"/api/groups/{group.id}/best-windows", params={"length": 3, "from": "2025-01-01", "to": "2030-01-01"}
+        )
+        assert too_long.status_code == 400
+
+
+@pytest.mark.asyncio
+async def test_batch_create_availabilities(fake_group_repo, fake_availability_repo):
+    group_service = GroupService(fake_group_repo)
+    group, _ = await group_service.create_group(
+        group_name="Batch Trip",
+        actor_id=None,
+        display_name="Owner",
+        user_id=UUID(USER_ID),
+    )
+
+    transport = ASGITransport(app=app)
+    async with AsyncClient(transport=transport, base_url="http://test") as client:
+        payload = {
+            "ranges": [
+                {"startDate": "2025-05-01", "endDate": "2025-05-03"},
+                {"startDate": "2025-05-02", "endDate": "2025-05-06"},
+            ]
+        }
+        res = await client.post(f"/api/groups/{group.id}/availabilities/batch", json=payload)
+        assert res.status_code == 200
+        assert [item["startDate"] for item in res.json()] == ["2025-05-01", "2025-05-02"]
+
+        summary = await client.get(f"/api/groups/{group.id}/availability-summary")
+        assert summary.json() == [
+            {"from": "2025-05-01", "to": "2025-05-06", "availableCount": 1, "totalMembers": 1},
+        ]
+
+        invalid = {"ranges": [{"startDate": "2025-05-05", "endDate": "2025-05-01"}]}
+        bad = await client.post(f"/api/groups/{group.id}/availabilities/batch", json=invalid)
+        assert bad.status_code == 400
+        unbounded = {"ranges": [{"startDate": "0001-01-01", "endDate": "9999-12-31"}]}
+        far = await client.post(f"/api/groups/{group.id}/availabilities/batch", json=unbounded)
+        assert far.status_code == 400
+        assert len(await fake_availability_repo.list_for_group(group_id=group.id)) == 2
+
+
+@pytest.mark.asyncio
+async def test_member_intersection_endpoint(two_member_group):
+    group = two_member_group
+
+    transport = ASGITransport(app=app)
+    async with AsyncClient(transport=transport, base_url="http://test") as client:
+        res = await client.get(f"/api/groups/{group.id}/intersection")
+        assert res.status_code == 200
+        assert res.json() == {
+            "actorIds": sorted([USER_ID, str(OTHER_USER)]),
+            "commonDays": 5,
+            "ranges": [{"from": "2025-01-10", "to": "2025-01-14"}],
+        }
+
+        windowed = await client.get(
+            f"/api/groups/{group.id}/intersection",
+            params={"actorIds": [USER_ID], "from": "2025-01-18", "to": "2025-01-31"},
+        )
+        assert windowed.status_code == 200
+        assert windowed.json()["ranges"] == [{"from": "2025-01-18", "to": "2025-01-20"}]
+
+        unknown = await client.get(f"/api/groups/{group.id}/intersection", params={"actorIds": ["nobody"]})
+        assert unknown.status_code == 400
+
+
+@pytest.mark.asyncio
+async def test_quorum_windows_endpoint(two_member_group):
+    group = two_member_group
+
+    transport = ASGITransport(app=app)
+    async with AsyncClient(transport=transport, base_url="http://test") as client:
+        res = await client.get(f"/api/groups/{group.id}/quorum-windows", params={"minMembers": 2, "minDays": 3})
+        assert res.status_code == 200
+        assert res.json() == [
+            {
+                "from": "2025-01-10",
+                "to": "2025-01-14",
+                "days": 5,
+                "minAvailable": 2,
+                "averageAvailable": 2.0,
+                "totalMembers": 2,
+            }
+        ]
+
+        solo = await client.get(
+            f"/api/groups/{group.id}/quorum-windows",
+            params={"minMembers": 1, "minDays": 1, "from": "2025-01-12"},
+        )
+        assert [(w["from"], w["to"]) for w in solo.json()] == [("2025-01-12", "2025-01-20")]
+
+        invalid = await client.get(f"/api/groups/{group.id}/quorum-windows", params={"minMembers": 0})
+        assert invalid.status_code == 422
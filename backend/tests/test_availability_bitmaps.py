@@ -0,0 +1,106 @@
+"""Per-member day bitmap tests."""
+
+from datetime import date
+
+import pytest
+
+from app.user_core.availability_bitmaps import GroupBitmaps
+from app.user_core.repositories import InMemoryAvailabilityRepository, InMemoryGroupRepository
+from app.user_core.services import AvailabilityService, GroupService
+from app.user_core.services.group_cache import GroupVersions, VersionedLRUCache
+
+
+def test_intersection_and_runs():
+    bitmaps = GroupBitmaps.from_ranges(
+        {
+            "alice": [(date(2025, 8, 1), date(2025, 8, 10)), (date(2025, 8, 20), date(2025, 8, 31))],
+            "bob": [(date(2025, 8, 5), date(2025, 8, 25))],
+        }
+    )
+    # Ranges earlier than the current origin shift every bitmap.
+    bitmaps.add_ranges("carol", [(date(2025, 7, 1), date(2025, 9, 30))])
+
+    common = bitmaps.intersection(["alice", "bob", "carol"])
+    assert bitmaps.runs(common) == [
+        (date(2025, 8, 5), date(2025, 8, 10)),
+        (date(2025, 8, 20), date(2025, 8, 25)),
+    ]
+    assert common.bit_count() == 12
+
+    windowed = bitmaps.intersection(["alice", "bob"], from_date=date(2025, 8, 8), to_date=date(2025, 8, 21))
+    assert bitmaps.runs(windowed) == [
+        (date(2025, 8, 8), date(2025, 8, 10)),
+        (date(2025, 8, 20), date(2025, 8, 21)),
+    ]
+    assert bitmaps.intersection(["alice"], from_date=date(2026, 1, 1)) == 0
+
+
+@pytest.mark.asyncio
+async def test_bitmaps_are_carried_across_writes():
+    group_repo = InMemoryGroupRepository()
+    availability_repo = InMemoryAvailabilityRepository()
+    cache = VersionedLRUCache(maxsize=16)
+    versions = GroupVersions()
+    service = AvailabilityService(availability_repo, group_repo, cache=cache, versions=versions)
+    group_service = GroupService(group_repo, versions=versions)
+
+    group, owner = await group_service.create_group(
+        group_name="Trip", actor_id="owner-actor", display_name="Owner", invite_ttl_days=7
+    )
+    await group_service.join_group(group_id=group.id, actor_id="guest-actor", display_name="Guest")
+
+    await service.add_availability(
+        actor_id="owner-actor", user_id=None, group_id=group.id,
+        start_date=date(2025, 8, 1), end_date=date(2025, 8, 31),
+    )
+    first = await service.intersect_members(group_id=group.id, actor_id="owner-actor")
+    assert first["ranges"] == []
+
+    async def fail_list_for_group(**kwargs):  # pragma: no cover - must not be called
+        raise AssertionError("bitmaps must be updated in place")
+
+    availability_repo.list_for_group = fail_list_for_group
+    await service.add_availability(
+        actor_id="guest-actor", user_id=None, group_id=group.id,
+        start_date=date(2025, 8, 10), end_date=date(2025, 8, 12),
+    )
+    second = await service.intersect_members(group_id=group.id, actor_id="owner-actor")
+    assert second == {
+        "actorIds": ["guest-actor", "owner-actor"],
+        "commonDays": 3,
+        "ranges": [(date(2025, 8, 10), date(2025, 8, 12))],
+    }
+
+
+@pytest.mark.asyncio
+async def test_carried_bitmaps_expire_with_the_version_ttl():
+    group_repo = InMemoryGroupRepository()
+    availability_repo = InMemoryAvailabilityRepository()
+    now = [0.0]
+    # Two workers share the database but not their caches or version counters.
+    writer = AvailabilityService(availability_repo, group_repo, cache=VersionedLRUCache(maxsize=16),
+                                 versions=GroupVersions(ttl_seconds=10, clock=lambda: now[0]))
+    reader = AvailabilityService(availability_repo, group_repo, cache=VersionedLRUCache(maxsize=16),
+                                 versions=GroupVersions(ttl_seconds=10, clock=lambda: now[0]))
+    group_service = GroupService(group_repo, versions=GroupVersions())
+
+    group, owner = await group_service.create_group(
+        group_name="Trip", actor_id="owner-actor", display_name="Owner", invite_ttl_days=7
+    )
+    await group_service.join_group(group_id=group.id, actor_id="guest-actor", display_name="Guest")
+    assert (await reader.intersect_members(group_id=group.id, actor_id="owner-actor"))["ranges"] == []
+
+    now[0] = 1
+    await writer.add_availability(
+        actor_id="guest-actor", user_id=None, group_id=group.id,
+        start_date=date(2025, 8, 1), end_date=date(2025, 8, 31),
+    )
+    # The reader keeps writing, which keeps its version fresh; its bitmaps must still expire.
+    for step, day in ((4, 1), (8, 2), (12, 3)):
+        now[0] = step
+        await reader.add_availability(
+            actor_id="owner-actor", user_id=None, group_id=group.id,
+            start_date=date(2025, 8, day), end_date=date(2025, 8, day),
+        )
+    result = await reader.intersect_members(group_id=group.id, actor_id="owner-actor")
+    assert result["ranges"] == [(date(2025, 8, 1), date(2025, 8, 3))]
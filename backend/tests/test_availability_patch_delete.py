@@ -1,8 +1,10 @@
 """Availability API tests for create/list/delete (no patch)."""
 
+from datetime import date
+
 import pytest
 import pytest_asyncio
-from uuid import UUID
+from uuid import UUID, uuid4
 from httpx import AsyncClient, ASGITransport
 
 from app.api.deps import get_availability_service, get_group_service
@@ -81,3 +83,69 @@ async def test_delete(fake_group_repo):
         list_res = await client.get(f"/api/groups/{group.id}/availabilities")
         assert list_res.status_code == 200
         assert list_res.json() == []
+
+
+@pytest.mark.asyncio
+async def test_delete_foreign_or_unknown_availability(fake_group_repo, fake_av_repo):
+    group_service = GroupService(fake_group_repo)
+    group, _ = await group_service.create_group(
+        group_name="Trip",
+        actor_id=None,
+        display_name="User",
+        user_id=UUID(USER_ID),
+    )
+    foreign = await fake_av_repo.create_availability(
+        group_id=group.id,
+        actor_id="someone-else",
+        user_id=None,
+        start_date=date(2025, 5, 1),
+        end_date=date(2025, 5, 2),
+    )
+
+    transport = ASGITransport(app=app)
+    async with AsyncClient(transport=transport, base_url="http://test") as client:
+        forbidden = await client.delete(f"/api/availabilities/{foreign.id}")
+        assert forbidden.status_code == 403
+        assert await fake_av_repo.get_by_id(foreign.id) is not None
+
+        missing = await client.delete(f"/api/availabilities/{uuid4()}")
+        assert missing.status_code == 404
+
+
+@pytest.mark.asyncio
+async def test_replace_mine_applies_minimal_diff(fake_group_repo, fake_av_repo):
+    group_service = GroupService(fake_group_repo)
+    group, _ = await group_service.create_group(
+        group_name="Trip",
+        actor_id=None,
+        display_name="User",
+        user_id=UUID(USER_ID),
+    )
+
+    transport = ASGITransport(app=app)
+    async with AsyncClient(transport=transport, base_url="http://test") as client:
+        keep = {"startDate": "2025-06-01", "endDate": "2025-06-05"}
+        drop = {"startDate": "2025-07-01", "endDate": "2025-07-02"}
+        kept_res = await client.post(f"/api/groups/{group.id}/availabilities", json=keep)
+        await client.post(f"/api/groups/{group.id}/availabilities", json=drop)
+
+        added = {"startDate": "2025-08-10", "endDate": "2025-08-12"}
+        put_res = await client.put(f"/api/groups/{group.id}/availabilities/mine", json={"ranges": [added, keep]})
+        assert put_res.status_code == 200
+        items = put_res.json()
+        assert [(i["startDate"], i["endDate"]) for i in items] == [
+            ("2025-06-01", "2025-06-05"),
+            ("2025-08-10", "2025-08-12"),
+        ]
+        # The unchanged range keeps its identity.
+        assert items[0]["id"] == kept_res.json()["id"]
+
+        summary = await client.get(f"/api/groups/{group.id}/availability-summary")
+        assert [(i["from"], i["to"]) for i in summary.json()] == [
+            ("2025-06-01", "2025-06-05"),
+            ("2025-08-10", "2025-08-12"),
+        ]
+
+        cleared = await client.put(f"/api/groups/{group.id}/availabilities/mine", json={"ranges": []})
+        assert cleared.status_code == 200
+        assert cleared.json() == []
@@ -6,6 +6,15 @@ from fastapi import HTTPException
 
 from app.user_core.repositories import InMemoryAvailabilityRepository, InMemoryGroupRepository
 from app.user_core.services import AvailabilityService
+from app.user_core.availability_summary import (
+    coverage_delta,
+    merge_ranges,
+    quorum_windows,
+    range_events,
+    summarize_ranges,
+    sweep_summary,
+    window_events,
+)
 
 
 @pytest.mark.asyncio
@@ -134,3 +143,118 @@ async def test_calculate_group_availability_merges_adjacent_and_clamps():
         {"from": date(2025, 1, 2), "to": date(2025, 1, 3), "availableCount": 2, "totalMembers": 2},
         {"from": date(2025, 1, 4), "to": date(2025, 1, 4), "availableCount": 1, "totalMembers": 2},
     ]
+
+
+def test_coverage_delta_counts_overlapping_ranges_once():
+    existing = [(date(2025, 1, 1), date(2025, 1, 10))]
+
+    # Fully covered by an existing range of the same actor: nothing changes.
+    assert coverage_delta(existing, existing + [(date(2025, 1, 3), date(2025, 1, 5))]) == {}
+
+    # Extending the range only moves the end boundary.
+    assert coverage_delta(existing, existing + [(date(2025, 1, 8), date(2025, 1, 12))]) == {
+        date(2025, 1, 11): 1,
+        date(2025, 1, 13): -1,
+    }
+
+
+@pytest.mark.asyncio
+async def test_summary_tracks_deletes_without_rescanning_rows():
+    group_repo = InMemoryGroupRepository()
+    availability_repo = InMemoryAvailabilityRepository()
+    service = AvailabilityService(availability_repo, group_repo)
+
+    user_one = uuid4()
+    group, owner = await group_repo.create_group(
+        group_name="Trip",
+        actor_id=None,
+        display_name="Owner",
+        user_id=user_one,
+    )
+
+    first = await availability_repo.create_availability(
+        group_id=group.id,
+        actor_id=str(user_one),
+        user_id=user_one,
+        start_date=date(2025, 1, 1),
+        end_date=date(2025, 1, 5),
+    )
+    await availability_repo.create_availability(
+        group_id=group.id,
+        actor_id=str(user_one),
+        user_id=user_one,
+        start_date=date(2025, 1, 4),
+        end_date=date(2025, 1, 8),
+    )
+
+    await service.delete_availability(availability_id=first.id, actor_id=str(user_one), user_id=user_one)
+
+    async def fail_list_for_group(**kwargs):  # pragma: no cover - must not be called
+        raise AssertionError("summary must not rescan raw rows")
+
+    async def fail_get_group_members(group_id):  # pragma: no cover - must not be called
+        raise AssertionError("summary must count members, not load them")
+
+    availability_repo.list_for_group = fail_list_for_group
+    group_repo.get_group_members = fail_get_group_members
+    summary = await service.calculate_group_availability(group_id=group.id, actor_id=str(user_one))
+    assert summary == [
+        {"from": date(2025, 1, 4), "to": date(2025, 1, 8), "availableCount": 1, "totalMembers": 1},
+    ]
+
+
+@pytest.mark.asyncio
+async def test_in_memory_writes_keep_deltas_equal_to_a_full_recompute():
+    availability_repo = InMemoryAvailabilityRepository()
+    group_id = uuid4()
+    batches = [
+        [(date(2025, 1, 1), date(2025, 1, 5)), (date(2025, 2, 1), date(2025, 2, 3))],
+        [(date(2025, 1, 6), date(2025, 1, 9))],  # adjacent to an existing range
+        [(date(2025, 1, 3), date(2025, 1, 7)), (date(2025, 3, 1), date(2025, 3, 1))],
+    ]
+    for actor_id in ("a", "b"):
+        for ranges in batches:
+            await availability_repo.create_many(group_id=group_id, actor_id=actor_id, user_id=None, ranges=ranges)
+    first = (await availability_repo.list_for_actor_in_group(actor_id="a", group_id=group_id))[0]
+    await availability_repo.delete_owned(availability_id=first.id, actor_id="a")
+
+    remaining = await availability_repo.list_for_actor_in_group(actor_id="a", group_id=group_id)
+    expected = coverage_delta([], [(r.start_date, r.end_date) for r in remaining])
+    for day, delta in coverage_delta([], [range_ for ranges in batches for range_ in ranges]).items():
+        expected[day] = expected.get(day, 0) + delta
+    assert await availability_repo.list_day_deltas(group_id=group_id) == sorted(
+        (day, delta) for day, delta in expected.items() if delta
+    )
+
+
+def test_window_events_clip_to_bounds():
+    events = range_events(merge_ranges([(date(2025, 1, 1), date(2025, 1, 10))]))
+    start = date(2025, 1, 4).toordinal()
+    end = date(2025, 1, 6).toordinal()
+
+    assert sweep_summary(window_events(events, start, end), 5) == [
+        {"from": date(2025, 1, 4), "to": date(2025, 1, 6), "availableCount": 1, "totalMembers": 5},
+    ]
+    # A window outside every range yields nothing.
+    assert sweep_summary(window_events(events, end + 10, end + 20), 5) == []
+
+
+def test_quorum_windows_merge_adjacent_intervals_and_sort():
+    intervals = summarize_ranges(
+        {
+            "a": [(date(2025, 7, 1), date(2025, 7, 20))],
+            "b": [(date(2025, 7, 3), date(2025, 7, 12)), (date(2025, 7, 16), date(2025, 7, 19))],
+            "c": [(date(2025, 7, 5), date(2025, 7, 10)), (date(2025, 7, 15), date(2025, 7, 20))],
+        },
+        total_members=3,
+    )
+
+    windows = quorum_windows(intervals, min_members=2, min_days=3)
+    assert [(w["from"], w["to"], w["days"], w["minAvailable"]) for w in windows] == [
+        (date(2025, 7, 3), date(2025, 7, 12), 10, 2),
+        (date(2025, 7, 15), date(2025, 7, 20), 6, 2),
+    ]
+    assert windows[0]["averageAvailable"] == 2.6
+
+    assert quorum_windows(intervals, min_members=3, min_days=7) == []
+    assert [w["days"] for w in quorum_windows(intervals, min_members=3, min_days=1)] == [6, 4]
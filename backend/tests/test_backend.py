@@ -1,5 +1,7 @@
 """Unit-level tests for services using in-memory repositories (no DB)."""
 
+from uuid import uuid4
+
 import pytest
 
 from app.user_core.repositories import InMemoryGroupRepository, InMemoryIdentityRepository
@@ -64,4 +66,22 @@ async def test_auth_service_claims_memberships():
 
     assert result["updatedMemberships"] == 1
     members = await group_service.get_group_members(group.id)
-    assert members[0].user_id is not None
\ No newline at end of file
+    assert members[0].user_id is not None
+
+@pytest.mark.asyncio
+async def test_group_repo_find_membership_by_actor_or_user():
+    repo = InMemoryGroupRepository()
+    user_id = uuid4()
+    group, owner = await repo.create_group(group_name="Members", actor_id="actor-owner", display_name="Owner")
+    claimed = await repo.add_member_to_group(group.id, actor_id="actor-claimed", user_id=user_id, display_name="U")
+    other_group, _ = await repo.create_group(group_name="Other", actor_id="actor-other", display_name="Other")
+
+    assert await repo.find_membership(group.id, "actor-owner") is owner
+    assert await repo.find_membership(group.id, "unknown-actor", user_id) is claimed
+    assert await repo.find_membership(group.id, "actor-other") is None
+    assert await repo.find_membership(other_group.id, "actor-claimed", user_id) is None
+
+    # When the user's row and the caller's actor row differ, the caller's own row wins.
+    guest = await repo.add_member_to_group(group.id, actor_id="actor-guest", user_id=None, display_name="G")
+    assert await repo.find_membership(group.id, "actor-guest", user_id) is guest
+    assert await repo.find_membership(group.id, "actor-claimed", user_id) is claimed
@@ -0,0 +1,29 @@
+"""Smoke test for the availability benchmark harness (tiny scenario, one run)."""
+
+import pytest
+
+from benchmarks.availability import Scenario, compare, run_benchmarks
+
+
+@pytest.mark.asyncio
+async def test_benchmark_report_and_baseline_comparison():
+    scenario = Scenario("tiny", members=3, max_ranges=2, horizon_days=30)
+    report = await run_benchmarks([scenario], repeat=1)
+
+    results = report["scenarios"]["tiny"]["results"]
+    assert set(results) == {
+        "rows",
+        "service.calculate_group_availability",
+        "service.list_group_member_availabilities",
+        "GET availability-summary",
+        "GET member-availabilities",
+        "service.add_availability",
+        "service.delete_availability",
+    }
+    assert 3 <= results["rows"] <= 6
+
+    assert compare(report, report, tolerance=1.0) == []
+    faster = {"scenarios": {"tiny": {"results": {"GET availability-summary": {"medianMs": 0.0}}}}}
+    assert [message.split(":")[0] for message in compare(report, faster, tolerance=1.5)] == [
+        "tiny GET availability-summary"
+    ]
@@ -0,0 +1,52 @@
+"""Connection pool metering tests (sqlite connections, no Postgres needed)."""
+
+import sqlite3
+
+import pytest
+from httpx import ASGITransport, AsyncClient
+from sqlalchemy import exc
+from sqlalchemy.util import greenlet_spawn
+
+from app.core.config import get_settings
+from app.core.database import MeteredQueuePool, PoolMetrics
+from app.main import app
+
+
+@pytest.mark.asyncio
+async def test_checkouts_record_exhaustion_and_timeouts(monkeypatch):
+    metrics = PoolMetrics()
+    monkeypatch.setattr(MeteredQueuePool, "metrics", metrics)
+    pool = MeteredQueuePool(lambda: sqlite3.connect(":memory:"), pool_size=1, max_overflow=0, timeout=0.05)
+
+    def exercise():
+        first = pool.connect()
+        with pytest.raises(exc.TimeoutError):
+            pool.connect()
+        first.close()
+        pool.connect().close()
+
+    await greenlet_spawn(exercise)
+    pool.dispose()
+
+    stats = metrics.stats()
+    assert (stats["checkouts"], stats["exhausted"], stats["timeouts"]) == (3, 1, 1)
+    assert stats["waitSecondsMax"] >= 0.05
+
+
+@pytest.mark.asyncio
+async def test_pool_metrics_endpoint_requires_metrics_token(monkeypatch):
+    transport = ASGITransport(app=app)
+    async with AsyncClient(transport=transport, base_url="http://test") as client:
+        monkeypatch.setattr(get_settings(), "metrics_token", "")
+        assert (await client.get("/api/metrics/pool")).status_code == 404
+
+        monkeypatch.setattr(get_settings(), "metrics_token", "s3cret")
+        assert (await client.get("/api/metrics/pool")).status_code == 401
+        wrong = await client.get("/api/metrics/caches", headers={"Authorization": "Bearer nope"})
+        assert wrong.status_code == 401
+
+        res = await client.get("/api/metrics/pool", headers={"Authorization": "Bearer s3cret"})
+    assert res.status_code == 200
+    body = res.json()
+    assert body["size"] == get_settings().database_pool_size and body["checkedOut"] == 0
+    assert {"checkouts", "waitSecondsMax", "exhausted", "timeouts"} <= body.keys()
@@ -0,0 +1,252 @@
+"""Versioned group read cache tests (in-memory repos)."""
+
+from datetime import date
+from uuid import uuid4
+
+import pytest
+from fastapi import HTTPException
+from httpx import ASGITransport, AsyncClient
+
+from app.api.deps import get_availability_service
+from app.core.security import Identity, get_identity
+from app.main import app
+from app.user_core.repositories import InMemoryAvailabilityRepository, InMemoryGroupRepository
+from app.user_core.services import AvailabilityService, GroupService
+from app.user_core.services.group_cache import GroupVersions, MembershipCache, VersionedLRUCache
+
+
+def test_lru_cache_counts_hits_misses_and_evictions():
+    cache = VersionedLRUCache(maxsize=2)
+    cache.set("a", 1)
+    cache.set("b", 2)
+    assert cache.get("a") == (True, 1)
+    cache.set("c", 3)  # evicts "b", the least recently used entry
+
+    assert cache.get("b") == (False, None)
+    assert cache.stats() == {
+        "size": 2,
+        "maxSize": 2,
+        "hits": 1,
+        "misses": 1,
+        "evictions": 1,
+        "hitRate": 0.5,
+    }
+
+
+@pytest.mark.asyncio
+async def test_memberships_are_cached_until_ttl_and_denials_are_not():
+    group_repo = InMemoryGroupRepository()
+    now = [0.0]
+    memberships = MembershipCache(maxsize=16, ttl_seconds=30, clock=lambda: now[0])
+    service = AvailabilityService(InMemoryAvailabilityRepository(), group_repo, memberships=memberships)
+    group_service = GroupService(group_repo, memberships=memberships)
+    group, owner = await group_service.create_group(
+        group_name="Trip", actor_id="owner-actor", display_name="Owner", invite_ttl_days=7
+    )
+
+    lookups = []
+    find_membership = group_repo.find_membership
+
+    async def counting_find_membership(*args):
+        lookups.append(args)
+        return await find_membership(*args)
+
+    group_repo.find_membership = counting_find_membership
+
+    await service.ensure_member(group_id=group.id, actor_id=owner.actor_id)
+    await service.list_for_user(group_id=group.id, actor_id=owner.actor_id)
+    assert len(lookups) == 1
+
+    with pytest.raises(HTTPException) as denied:
+        await service.ensure_member(group_id=group.id, actor_id="guest-actor")
+    assert denied.value.status_code == 403
+    with pytest.raises(HTTPException):
+        await service.ensure_member(group_id=group.id, actor_id="guest-actor")
+    assert len(lookups) == 3  # denials are never cached
+
+    # A join that bypasses this process's cache (another worker) is seen on the next request.
+    await group_repo.add_member_to_group(group.id, actor_id="guest-actor", user_id=None, display_name="Guest")
+    assert (await service.ensure_member(group_id=group.id, actor_id="guest-actor")).actor_id == "guest-actor"
+    assert len(lookups) == 4
+    await service.ensure_member(group_id=group.id, actor_id="guest-actor")
+    assert len(lookups) == 4
+
+    now[0] = 31.0
+    await service.ensure_member(group_id=group.id, actor_id="guest-actor")
+    assert len(lookups) == 5
+    assert memberships.stats()["expirations"] == 1
+
+
+@pytest.mark.asyncio
+async def test_claiming_memberships_bumps_only_claimed_groups_after_commit():
+    group_repo = InMemoryGroupRepository()
+    versions = GroupVersions()
+    memberships = MembershipCache(maxsize=16, ttl_seconds=30)
+    group_service = GroupService(group_repo, versions=versions, memberships=memberships)
+    claimed, _ = await group_service.create_group(group_name="Claimed", actor_id="anon-actor", display_name="Anon")
+    other, _ = await group_service.create_group(group_name="Other", actor_id="other-actor", display_name="Other")
+    before = {claimed.id: versions.get(claimed.id), other.id: versions.get(other.id)}
+
+    seen_at_commit = []
+
+    async def recording_commit():
+        seen_at_commit.append(versions.get(claimed.id))
+
+    group_repo.commit = recording_commit
+    updated = await group_service.claim_memberships_for_user(actor_id="anon-actor", user_id=uuid4())
+
+    assert updated == 1
+    assert seen_at_commit == [before[claimed.id]]
+    assert versions.get(claimed.id) != before[claimed.id]
+    assert versions.get(other.id) == before[other.id]
+
+
+@pytest.mark.asyncio
+async def test_summary_is_cached_until_group_version_changes():
+    group_repo = InMemoryGroupRepository()
+    availability_repo = InMemoryAvailabilityRepository()
+    cache = VersionedLRUCache(maxsize=16)
+    versions = GroupVersions()
+    service = AvailabilityService(availability_repo, group_repo, cache=cache, versions=versions)
+    group_service = GroupService(group_repo, versions=versions)
+
+    owner_id = uuid4()
+    group, owner = await group_service.create_group(
+        group_name="Trip",
+        actor_id=None,
+        display_name="Owner",
+        user_id=owner_id,
+        invite_ttl_days=7,
+    )
+    await service.add_availability(
+        actor_id=owner.actor_id,
+        user_id=owner_id,
+        group_id=group.id,
+        start_date=date(2025, 6, 1),
+        end_date=date(2025, 6, 3),
+    )
+
+    first = await service.calculate_group_availability(group_id=group.id, actor_id=owner.actor_id)
+    second = await service.calculate_group_availability(group_id=group.id, actor_id=owner.actor_id)
+    assert second is first
+    assert (cache.hits, cache.misses) == (1, 1)
+
+    await group_service.join_group(group_id=group.id, actor_id="guest-actor", display_name="Guest")
+
+    third = await service.calculate_group_availability(group_id=group.id, actor_id=owner.actor_id)
+    assert third[0]["totalMembers"] == 2
+    assert cache.misses == 2
+
+
+@pytest.mark.asyncio
+async def test_writes_on_another_worker_show_up_after_version_ttl():
+    group_repo = InMemoryGroupRepository()
+    availability_repo = InMemoryAvailabilityRepository()
+    now = [0.0]
+    # Two workers: shared database (repos), separate in-process versions and caches.
+    reader_versions = GroupVersions(ttl_seconds=10, clock=lambda: now[0])
+    reader = AvailabilityService(
+        availability_repo, group_repo, cache=VersionedLRUCache(maxsize=16), versions=reader_versions
+    )
+    writer = AvailabilityService(
+        availability_repo, group_repo, cache=VersionedLRUCache(maxsize=16), versions=GroupVersions()
+    )
+    group, owner = await GroupService(group_repo, versions=GroupVersions()).create_group(
+        group_name="Trip", actor_id="owner-actor", display_name="Owner", invite_ttl_days=7
+    )
+
+    assert await reader.calculate_group_availability(group_id=group.id, actor_id=owner.actor_id) == []
+    etag = reader.read_etag("summary", group_id=group.id)
+    await writer.add_availability(
+        actor_id=owner.actor_id,
+        user_id=None,
+        group_id=group.id,
+        start_date=date(2025, 6, 1),
+        end_date=date(2025, 6, 3),
+    )
+
+    now[0] = 5.0
+    assert await reader.calculate_group_availability(group_id=group.id, actor_id=owner.actor_id) == []
+    assert reader.read_etag("summary", group_id=group.id) == etag
+
+    now[0] = 10.0
+    summary = await reader.calculate_group_availability(group_id=group.id, actor_id=owner.actor_id)
+    assert [(item["from"], item["to"]) for item in summary] == [(date(2025, 6, 1), date(2025, 6, 3))]
+    assert reader.read_etag("summary", group_id=group.id) != etag
+    assert reader_versions.stats()["groups"] == 0  # reads alone never store a version
+
+
+def test_versions_of_unwritten_groups_store_nothing_and_stay_monotonic():
+    now = [0.0]
+    versions = GroupVersions(ttl_seconds=10, clock=lambda: now[0])
+    for _ in range(500):
+        versions.get(uuid4())
+    assert versions.stats()["groups"] == 0
+
+    group_id = uuid4()
+    seen = [versions.get(group_id)]
+    for step in (3.0, 12.0, 15.0, 26.0, 60.0):
+        now[0] = step
+        seen.append(versions.get(group_id))
+        if step in (12.0, 15.0):
+            seen.append(versions.bump(group_id))
+    # Bumps continue from the current period; expired entries advance and never go backwards.
+    assert seen == [0, 0, 1, 2, 2, 3, 4, 6]
+    assert versions.stats()["groups"] == 0  # the expired entry was dropped again
+
+
+@pytest.mark.asyncio
+async def test_group_reads_answer_if_none_match_with_304():
+    group_repo = InMemoryGroupRepository()
+    availability_repo = InMemoryAvailabilityRepository()
+    versions = GroupVersions()
+    app.dependency_overrides[get_availability_service] = lambda: AvailabilityService(
+        availability_repo, group_repo, cache=VersionedLRUCache(maxsize=16), versions=versions
+    )
+    app.dependency_overrides[get_identity] = lambda: Identity(user_id=None)
+
+    group, owner = await GroupService(group_repo, versions=versions).create_group(
+        group_name="Trip", actor_id="owner-actor", display_name="Owner", invite_ttl_days=7
+    )
+    headers = {"X-Actor-Id": "owner-actor"}
+    try:
+        transport = ASGITransport(app=app)
+        async with AsyncClient(transport=transport, base_url="http://test") as client:
+            for path in ("availability-summary", "member-availabilities"):
+                url = f"/api/groups/{group.id}/{path}"
+                first = await client.get(url, headers=headers)
+                assert first.status_code == 200
+                etag = first.headers["etag"]
+
+                async def fail(**kwargs):  # pragma: no cover - must not be called
+                    raise AssertionError("304 must not read availabilities")
+
+                availability_repo.list_for_group, original_list = fail, availability_repo.list_for_group
+                availability_repo.summarize_group, original_summary = fail, availability_repo.summarize_group
+                cached = await client.get(url, headers={**headers, "If-None-Match": f'W/"x", {etag}'})
+                assert cached.status_code == 304
+                assert cached.headers["etag"] == etag
+                assert cached.content == b""
+                availability_repo.list_for_group = original_list
+                availability_repo.summarize_group = original_summary
+
+                outsider = await client.get(url, headers={"X-Actor-Id": "outsider", "If-None-Match": etag})
+                assert outsider.status_code == 403
+
+                windowed = await client.get(url, headers={**headers, "If-None-Match": etag}, params={"from": "2025-01-01"})
+                assert windowed.status_code == 200
+
+            summary_url = f"/api/groups/{group.id}/availability-summary"
+            etag = (await client.get(summary_url, headers=headers)).headers["etag"]
+            created = await client.post(
+                f"/api/groups/{group.id}/availabilities",
+                headers=headers,
+                json={"startDate": "2025-06-01", "endDate": "2025-06-03"},
+            )
+            assert created.status_code == 200
+            changed = await client.get(summary_url, headers={**headers, "If-None-Match": etag})
+            assert changed.status_code == 200
+            assert changed.headers["etag"] != etag
+            assert changed.json()[0]["availableCount"] == 1
+    finally:
+        app.dependency_overrides.clear()
@@ -0,0 +1,121 @@
+"""JWKS provider tests against a local stub server."""
+
+import asyncio
+import json
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pytest
+
+from app.core.jwks import JWKSFetchError, JWKSProvider
+
+
+class StubJWKS:
+    """Serves ``keys`` at the Supabase JWKS path; ``fail`` answers 503, ``delay`` slows responses."""
+
+    def __init__(self) -> None:
+        self.keys = [{"kid": "k1", "kty": "oct"}]
+        self.fail = False
+        self.delay = 0.0
+        self.requests = 0
+        stub = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def do_GET(self):  # noqa: N802 - http.server API
+                stub.requests += 1
+                time.sleep(stub.delay)
+                if stub.fail or self.path != "/auth/v1/keys":
+                    self.send_response(503)
+                    self.end_headers()
+                    return
+                body = json.dumps({"keys": stub.keys}).encode()
+                self.send_response(200)
+                self.send_header("Content-Type", "application/json")
+                self.send_header("Content-Length", str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+            def log_message(self, *args):
+                pass
+
+        self.server = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+        self.url = f"http://127.0.0.1:{self.server.server_address[1]}"
+        threading.Thread(target=self.server.serve_forever, daemon=True).start()
+
+    def close(self) -> None:
+        self.server.shutdown()
+        self.server.server_close()
+
+
+@pytest.fixture()
+def stub():
+    server = StubJWKS()
+    yield server
+    server.close()
+
+
+@pytest.mark.asyncio
+async def test_concurrent_cold_lookups_share_one_fetch(stub):
+    stub.delay = 0.1
+    provider = JWKSProvider(stub.url, "anon")
+    try:
+        keys = await asyncio.gather(*(provider.get_key("k1") for _ in range(10)))
+        assert all(key == {"kid": "k1", "kty": "oct"} for key in keys)
+        assert (stub.requests, provider.fetches) == (1, 1)
+    finally:
+        await provider.aclose()
+
+
+@pytest.mark.asyncio
+async def test_stale_keys_are_served_while_refresh_runs_and_fails(stub):
+    now = [0.0]
+    provider = JWKSProvider(stub.url, "anon", refresh_after=60, clock=lambda: now[0])
+    try:
+        assert await provider.get_key("k1")
+
+        now[0] = 61.0
+        stub.fail = True
+        assert await provider.get_key("k1")  # answered from cache, refresh runs in the background
+        with pytest.raises(JWKSFetchError):
+            await provider._inflight
+        assert provider.failures == 1
+        assert await provider.get_key("k1")
+
+        stub.fail = False
+        stub.keys = [{"kid": "k2", "kty": "oct"}]
+        now[0] = 200.0
+        assert await provider.get_key("k2")  # rotated kid triggers an awaited refetch
+        assert await provider.get_key("k1") is None
+    finally:
+        await provider.aclose()
+
+
+@pytest.mark.asyncio
+async def test_cold_fetch_failure_raises(stub):
+    stub.fail = True
+    provider = JWKSProvider(stub.url, "anon")
+    try:
+        with pytest.raises(JWKSFetchError):
+            await provider.get_key("k1")
+    finally:
+        await provider.aclose()
+
+
+@pytest.mark.asyncio
+async def test_empty_or_malformed_key_sets_keep_the_cached_keys(stub):
+    now = [0.0]
+    provider = JWKSProvider(stub.url, "anon", refresh_after=60, min_refetch_interval=0, clock=lambda: now[0])
+    try:
+        assert await provider.get_key("k1")
+
+        for keys in ([], None, "not-a-list", ["not-a-key"]):
+            stub.keys = keys
+            now[0] += 61.0
+            await provider._refresh()
+            assert list(provider._keys) == ["k1"]
+        assert provider.failures == 4
+        assert await provider.get_key("k1")
+    finally:
+        await provider.aclose()
+
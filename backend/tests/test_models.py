@@ -1,8 +1,12 @@
 """Tests für die aktuellen Models."""
 
+from datetime import date
 from uuid import UUID
 
-from app.user_core.models import Group, GroupMember
+from sqlalchemy.dialects import postgresql
+from sqlalchemy.schema import CreateIndex, CreateTable
+
+from app.user_core.models import Availability, Group, GroupMember
 
 
 def test_group_model():
@@ -23,4 +27,21 @@ def test_group_member_model():
     )
     assert member.actor_id == "actor-1"
     assert member.display_name == "Tester"
-    assert member.role == "owner"
\ No newline at end of file
+    assert member.role == "owner"
+
+
+def test_availability_span_is_part_of_the_model_schema():
+    """create_all must build the generated span column and its GiST index, as migration 0009 does."""
+    dialect = postgresql.dialect()
+    ddl = str(CreateTable(Availability.__table__).compile(dialect=dialect))
+    assert "span DATERANGE GENERATED ALWAYS AS (daterange(start_date, end_date, '[]')) STORED" in ddl
+    indexes = [str(CreateIndex(index).compile(dialect=dialect)) for index in Availability.__table__.indexes]
+    assert "CREATE INDEX idx_availabilities_group_span ON availabilities USING gist (group_id, span)" in indexes
+
+    record = Availability(
+        group_id=UUID("00000000-0000-0000-0000-000000000000"),
+        actor_id="actor-1",
+        start_date=date(2025, 1, 1),
+        end_date=date(2025, 1, 2),
+    )
+    assert "span" not in record.model_dump()  # generated columns cannot be inserted